@@ -8,6 +8,7 @@ from pathlib import Path
 from datetime import timedelta
 import os
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 # Load environment variables
 load_dotenv()
@@ -72,6 +73,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'matching.events.ActorMiddleware',   # 상태 이력의 actorId
 ]
 
 # --- CORS & CSRF ---
@@ -89,6 +91,7 @@ for origin in cors_origins.split(','):
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOWED_ORIGIN_REGEXES = [r"^https://.*\.vercel\.app$"]
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
 
 # CSRF 설정
 CSRF_TRUSTED_ORIGINS = [
@@ -141,6 +144,20 @@ if os.getenv('DATABASE_URL'):
     except ImportError:
         pass
 
+# --- Cache ---
+# 여러 워커가 throttle 카운터 등을 공유하려면 REDIS_URL 설정 (redis 패키지 필요)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+if os.getenv('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+    }
+
 # --- Password Validation ---
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -149,6 +166,16 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# 기본 PBKDF2 대신 반복 횟수를 LOGIN['PBKDF2_ITERATIONS'] 로 조절하는 hasher (같은 알고리즘 이름이므로
+# 기본 PBKDF2PasswordHasher 는 목록에서 빼야 함, 반복 횟수가 다른 기존 해시는 로그인 때 재해싱)
+PASSWORD_HASHERS = [
+    'matching.login.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # --- i18n ---
 LANGUAGE_CODE = 'ko-kr'
 TIME_ZONE = 'Asia/Seoul'
@@ -174,6 +201,119 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'matching.throttling.TokenBucketThrottle',
+    ),
+}
+
+# --- Throttling (token bucket) ---
+# RATES: URL name(matching/urls.py) → 역할(anon/senior/helper/staff)별 '횟수/기간'
+# '*' 는 기본값, None 은 제한 없음
+TOKEN_BUCKET_THROTTLE = {
+    'CACHE_ALIAS': 'default',
+    'RATES': {
+        '*': {'anon': '60/min', 'senior': '120/min', 'helper': '120/min', 'staff': None},
+        'login': {'anon': '20/min', 'senior': '20/min', 'helper': '20/min', 'staff': '20/min'},
+        'signup': {'anon': '10/min'},
+        'help_request_list': {'helper': '30/min'},
+    },
+    # 같은 전화번호로의 로그인 시도 한도 (IP 와 무관)
+    'LOGIN_PHONE_RATE': '5/5m',
+}
+
+# --- Idempotency-Key ---
+# 재시도된 POST 에 첫 응답을 재생하는 기간
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+# --- Delta sync ---
+# ?since 토큰 시각보다 이만큼 앞에서부터 조회 (커밋 지연으로 인한 누락 방지)
+DELTA_SYNC_OVERLAP = timedelta(seconds=2)
+# 빠진 id 가 이보다 많으면 델타 대신 전체 목록으로 재동기화 (reset=true)
+DELTA_SYNC_MAX_REMOVED = 1000
+
+# --- Batch API ---
+BATCH_MAX_SUBREQUESTS = 10
+
+# --- Export ---
+# 내보내기 시 DB 커서에서 한 번에 가져오는 행 수
+EXPORT_CHUNK_SIZE = 2000
+
+# --- Helper recommendations ---
+RECOMMENDATIONS = {
+    # 점수 가중치 (matching.recommendations.DEFAULT_WEIGHTS 덮어쓰기)
+    'WEIGHTS': {},
+    # 헬퍼별 특성/추천 목록 캐시 시간(초)
+    'FEATURE_TTL': 600,
+    # 열린 요청 스냅샷 전체 재생성 주기(초)
+    'MAX_SNAPSHOT_AGE': 300,
+    'CACHED_TOP_N': 50,
+}
+
+# --- Auto matching (python manage.py auto_match) ---
+AUTO_MATCH = {
+    # 비용 가중치 (matching.automatch.DEFAULT_WEIGHTS 덮어쓰기)
+    'WEIGHTS': {},
+    # 요청마다 배정 후보로 남길 헬퍼 수
+    'CANDIDATES_PER_REQUEST': 10,
+}
+
+# --- Proposal comparison ranking (matching.comparison.DEFAULT_WEIGHTS 덮어쓰기) ---
+PROPOSAL_RANKING_WEIGHTS = {}
+
+# --- Bulk transitions: 한 번에 처리할 수 있는 최대 id 수 ---
+BULK_MAX_IDS = 500
+
+# --- Request expiry: expire_requests 명령이 UPDATE 한 번에 처리하는 요청 수 ---
+EXPIRY_CHUNK_SIZE = 1000
+
+# --- Archive: 끝난 지 AFTER 가 지난 요청/제안을 archive 테이블로 이동 (archive_history 명령) ---
+ARCHIVE = {
+    'AFTER': timedelta(days=180),
+    'CHUNK_SIZE': 500,
+}
+
+# --- Outbox: run_outbox_worker 가 OutboxEvent 를 전달할 sink 와 워커 설정 ---
+OUTBOX = {
+    'SINKS': ['matching.outbox.LogSink', 'matching.outbox.DerivedDataSink'],
+    'WORKERS': 4,
+    'BATCH_SIZE': 100,
+    'POLL_INTERVAL': 1.0,
+    'LEASE': timedelta(seconds=60),
+    'MAX_ATTEMPTS': 5,
+}
+
+# --- Funnel rollups: update_funnel_rollups 가 트랜잭션 하나에 반영하는 상태 이력 수 ---
+FUNNEL_BATCH_SIZE = 10000
+# 건너뛴 이벤트 id 를 늦은 커밋으로 보고 기다리는 시간 (지나면 롤백된 것으로 보고 버림)
+FUNNEL_GAP_TIMEOUT = timedelta(hours=1)
+
+# --- Leaderboard: 캐시해 두는 상위 헬퍼 수와 캐시 유지 시간(초, 마일리지 변경 시 즉시 무효화) ---
+LEADERBOARD = {
+    'CACHED_TOP_N': 100,
+    'TTL': 300,
+}
+
+# --- Schedule: 월간 경기 일정 캐시 유지 시간(초, 경기/팀 변경 시 버전을 올려 즉시 무효화) ---
+SCHEDULE = {
+    'TTL': 3600,
+}
+
+# --- Login: 비밀번호 해싱 스레드 수 / 대기열 길이 (넘치면 503 + Retry-After 초), PBKDF2 반복 횟수 ---
+LOGIN = {
+    'HASH_WORKERS': int(os.getenv('LOGIN_HASH_WORKERS', '4')),
+    'HASH_QUEUE': int(os.getenv('LOGIN_HASH_QUEUE', '16')),
+    'HASH_TIMEOUT': 5,
+    'RETRY_AFTER': 2,
+    'PBKDF2_ITERATIONS': int(os.getenv('PBKDF2_ITERATIONS', '1000000')),
+}
+
+# --- Revocation: 폐기된 refresh 토큰 Bloom filter 크기(비트 / 해시 수), 다른 프로세스의 폐기 반영 주기(초) ---
+REVOCATION = {
+    'BLOOM_BITS': 1 << 23,  # 1MB, 폐기 토큰 50만 개에서 오탐률 약 0.05%, 100만 개에서 약 2%
+    'BLOOM_HASHES': 7,
+    'SYNC_INTERVAL': 5,
+    'REBUILD_INTERVAL': 3600,
+    'PURGE_BATCH_SIZE': 1000,
 }
 
 REST_AUTH = {
@@ -187,6 +327,7 @@ REST_AUTH = {
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_LIFETIME', '60'))),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=int(os.getenv('JWT_REFRESH_TOKEN_LIFETIME', '7'))),
+    # 회전/폐기는 token_blacklist 앱 대신 matching.revocation 이 처리 (auth/token/refresh/)
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'ALGORITHM': 'HS256',
@@ -1,16 +1,64 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from .models import User, Profile, Team, Game, Request, Proposal
+from . import games
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    큰 테이블용 changelist 페이지네이터
+    - 필터 없는 목록은 Postgres 통계(pg_class.reltuples)의 추정 행 수를 사용
+    - 그 외에는 EXACT_LIMIT 건까지만 세므로 (LIMIT 을 건 서브쿼리 COUNT) 전체 스캔이 없음
+    """
+    EXACT_LIMIT = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+            # ANALYZE 전에는 -1 이므로 작은 값이면 아래에서 직접 셈
+            if row and row[0] > self.EXACT_LIMIT:
+                return int(row[0])
+        return queryset[:self.EXACT_LIMIT + 1].count()
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    행이 많은 모델의 관리자 공통 설정
+    - 추정 카운트 페이지네이터, 필터 적용 시 전체 건수 COUNT 생략
+    - 숫자만 입력하면 기본키 일치도 함께 찾음 (전화번호 접두어 검색은 그대로 동작)
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    MAX_PK_DIGITS = 18  # bigint 범위를 넘는 숫자는 기본키로 보지 않음
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        term = search_term.strip()
+        if term.isdigit() and len(term) <= self.MAX_PK_DIGITS:
+            results = results | queryset.filter(pk=int(term))
+        return results, may_have_duplicates
+
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(LargeTableAdmin):
     list_display = ('id', 'phone', 'name', 'role', 'mileagePoints', 'is_staff')
     list_filter = ('role', 'is_staff')
-    search_fields = ('phone', 'name')
+    # 접두어 검색 (user_phone_prefix_idx / user_name_prefix_idx 사용)
+    search_fields = ('phone__startswith', 'name__startswith')
 
 @admin.register(Profile)
-class ProfileAdmin(admin.ModelAdmin):
+class ProfileAdmin(LargeTableAdmin):
     list_display = ('user', 'nickname', 'favorite_team')
-    search_fields = ('user__name', 'nickname')
+    list_select_related = ('user', 'favorite_team')
+    search_fields = ('user__name__startswith', 'nickname__startswith')
+    autocomplete_fields = ('user', 'favorite_team')
 
 @admin.register(Team)
 class TeamAdmin(admin.ModelAdmin):
@@ -19,17 +67,40 @@ class TeamAdmin(admin.ModelAdmin):
 
 @admin.register(Game)
 class GameAdmin(admin.ModelAdmin):
-    list_display = ('gameId', 'date', 'time', 'homeTeam', 'awayTeam', 'stadium')
-    list_filter = ('date', 'homeTeam', 'awayTeam')
+    list_display = ('gameId', 'date', 'time', 'homeTeam', 'awayTeam', 'stadium', 'status', 'rescheduledTo')
+    list_filter = ('status', 'date', 'homeTeam', 'awayTeam')
     search_fields = ('homeTeam__name', 'awayTeam__name', 'stadium')
+    autocomplete_fields = ('homeTeam', 'awayTeam', 'rescheduledTo')
+    actions = ['cancel_games']
+
+    def get_queryset(self, request):
+        # 목록과 다른 화면의 자동완성 결과 모두 __str__ 에서 두 팀 이름을 읽음
+        return super().get_queryset(request).select_related('homeTeam', 'awayTeam')
+
+    @admin.action(description='선택한 경기 취소 (요청/제안 일괄 취소)')
+    def cancel_games(self, request, queryset):
+        # 재편성(다른 경기로 이동)은 대상 경기를 지정해야 하므로 cancel_game 명령 사용
+        for game in queryset:
+            try:
+                result = games.cancel_game(game, reason='admin')
+            except ValueError as e:
+                self.message_user(request, f'{game}: {e}', messages.WARNING)
+                continue
+            self.message_user(request, f"{game}: 요청 {result['requests']}건, 제안 {result['proposals']}건 취소")
 
 @admin.register(Request)
-class RequestAdmin(admin.ModelAdmin):
+class RequestAdmin(LargeTableAdmin):
     list_display = ('requestId', 'userId', 'get_game_info', 'status', 'numberOfTickets', 'createdAt')
-    list_filter = ('status', 'game__date')
-    search_fields = ('userId__name', 'game__homeTeam__name', 'game__awayTeam__name')
+    # 팀 검색은 LIKE 조인 대신 필터로 (팀 목록은 작음)
+    list_filter = ('status', 'game__date', 'game__homeTeam')
+    search_fields = ('userId__name__startswith', 'userId__phone__startswith')
     readonly_fields = ('createdAt', 'updatedAt')
-    
+    autocomplete_fields = ('userId', 'game')
+
+    def get_queryset(self, request):
+        # 목록의 사용자/경기 정보와 제안 화면 자동완성의 __str__ 이 같은 조인을 사용
+        return super().get_queryset(request).select_related('userId', 'game__homeTeam', 'game__awayTeam')
+
     @admin.display(description='Game Info')
     def get_game_info(self, obj):
         if obj.game:
@@ -37,8 +108,11 @@ class RequestAdmin(admin.ModelAdmin):
         return "N/A"
 
 @admin.register(Proposal)
-class ProposalAdmin(admin.ModelAdmin):
+class ProposalAdmin(LargeTableAdmin):
     list_display = ('proposalId', 'requestId', 'helperId', 'status', 'createdAt')
     list_filter = ('status',)
-    search_fields = ('requestId__userId__name', 'helperId__name')
+    list_select_related = ('helperId', 'requestId__userId', 'requestId__game__homeTeam', 'requestId__game__awayTeam')
+    # 요청자 이름은 요청 관리자에서 찾고, 여기서는 제안 번호(숫자) 또는 헬퍼 이름/전화번호 접두어로
+    search_fields = ('helperId__name__startswith', 'helperId__phone__startswith')
+    autocomplete_fields = ('requestId', 'helperId')
 
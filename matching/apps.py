@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MatchingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'matching'
+
+    def ready(self):
+        # 요청 변경 / 상태 이력 / 마일리지 변경 / 경기별 수요 / 경기 일정 캐시 / 검색 색인 시그널 등록
+        from . import recommendations, events, leaderboard, demand, schedule, search  # noqa: F401
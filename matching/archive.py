@@ -0,0 +1,120 @@
+# matching/archive.py
+"""
+끝난 요청/제안의 hot → cold(archive 테이블) 이동
+
+피드/매칭 쿼리가 도는 Request, Proposal 테이블에는 진행 중이거나 최근에 끝난 행만 남기고,
+끝난 지 ARCHIVE['AFTER'] 가 지난 요청은 제안과 함께 ArchivedRequest/ArchivedProposal 로 옮긴다.
+'내 요청', '내 제안' 목록은 ArchiveUnionListMixin 으로 두 테이블을 합쳐서 보여준다.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, Value
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .models import Request, Proposal, ArchivedRequest, ArchivedProposal
+from .bulk import FINISHED_REQUEST_STATUSES
+from . import search
+
+
+def _settings():
+    return getattr(settings, 'ARCHIVE', {})
+
+
+def _copied_columns(archive_model):
+    """archive 모델과 원본 모델이 공유하는 컬럼 (attname 기준, archivedAt 제외)"""
+    return [field.attname for field in archive_model._meta.concrete_fields if field.name != 'archivedAt']
+
+
+REQUEST_COLUMNS = _copied_columns(ArchivedRequest)
+PROPOSAL_COLUMNS = _copied_columns(ArchivedProposal)
+
+
+def archivable_requests(now=None):
+    cutoff = (now or timezone.now()) - _settings().get('AFTER', timedelta(days=180))
+    return Request.objects.filter(status__in=FINISHED_REQUEST_STATUSES, updatedAt__lt=cutoff)
+
+
+def archive_finished(now=None, chunk_size=None, dry_run=False):
+    """
+    끝난 지 오래된 요청과 그 제안을 chunk 단위로 archive 테이블로 이동
+    - chunk 마다 복사 + 삭제를 한 트랜잭션으로 처리 (중간에 멈춰도 행이 사라지거나 두 번 생기지 않음)
+    - 반환값: {'requests': 옮긴 요청 수, 'proposals': 옮긴 제안 수}
+    """
+    chunk_size = chunk_size or _settings().get('CHUNK_SIZE', 500)
+    candidates = archivable_requests(now)
+    if dry_run:
+        return {
+            'requests': candidates.count(),
+            'proposals': Proposal.objects.filter(requestId__in=candidates).count(),
+        }
+
+    moved_requests = moved_proposals = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                candidates.select_for_update(skip_locked=True, of=('self',))
+                .order_by('pk').values_list('pk', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            requests = [ArchivedRequest(**row) for row in Request.objects.filter(pk__in=ids).values(*REQUEST_COLUMNS)]
+            proposals = [ArchivedProposal(**row) for row in Proposal.objects.filter(requestId__in=ids).values(*PROPOSAL_COLUMNS)]
+            # 이전 실행이 복사 후 삭제 전에 실패했더라도 다시 돌릴 수 있도록 충돌은 무시
+            ArchivedRequest.objects.bulk_create(requests, ignore_conflicts=True)
+            ArchivedProposal.objects.bulk_create(proposals, batch_size=1000, ignore_conflicts=True)
+            # 검색 색인은 post_delete 에서 행마다 지우지 않고 모델마다 한 번에
+            with search.deferred_unindex():
+                Proposal.objects.filter(requestId__in=ids).delete()
+                Request.objects.filter(pk__in=ids).delete()
+            search.unindex(Proposal, [proposal.proposalId for proposal in proposals])
+            search.unindex(Request, ids)
+        moved_requests += len(requests)
+        moved_proposals += len(proposals)
+        if len(ids) < chunk_size:
+            break
+    return {'requests': moved_requests, 'proposals': moved_proposals}
+
+
+class ArchiveUnionListMixin:
+    """
+    hot 테이블과 archive 테이블의 행을 최신순으로 합쳐 내려주는 목록 뷰
+    - 하위 클래스는 get_queryset()(hot), get_archived_queryset(), archived_serializer_class 를 지정
+    - 두 테이블의 (pk, createdAt) 만 UNION ALL 로 정렬/페이지네이션하고, 해당 페이지 행만 각 테이블에서 읽음
+    """
+    archived_serializer_class = None
+
+    def get_archived_queryset(self):
+        raise NotImplementedError
+
+    def _keys(self, queryset, archived):
+        return (
+            queryset.order_by()
+            .annotate(archived=Value(archived, output_field=BooleanField()))
+            .values_list('pk', 'createdAt', 'archived')
+        )
+
+    def list(self, request, *args, **kwargs):
+        hot = self.get_queryset()
+        cold = self.get_archived_queryset()
+        keys = self._keys(hot, False).union(self._keys(cold, True), all=True).order_by('-createdAt')
+        page = self.paginate_queryset(keys)
+        rows = list(page if page is not None else keys)
+
+        hot_rows = hot.in_bulk([pk for pk, _, archived in rows if not archived])
+        cold_rows = cold.in_bulk([pk for pk, _, archived in rows if archived])
+        data = []
+        for pk, _, archived in rows:
+            # 키 조회와 in_bulk 사이에 보관/삭제된 행은 건너뜀
+            obj = (cold_rows if archived else hot_rows).get(pk)
+            if obj is None:
+                continue
+            if archived:
+                data.append(self.archived_serializer_class(obj, context=self.get_serializer_context()).data)
+            else:
+                data.append(self.get_serializer(obj).data)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
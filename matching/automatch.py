@@ -0,0 +1,271 @@
+# matching/automatch.py
+"""
+대기 중인 요청과 헬퍼의 일괄 자동 매칭
+
+경기일별로 요청 x 헬퍼 비용 행렬을 만들고 최소 비용 배정(헝가리안)을 풀어
+결과를 'suggested' 상태의 Proposal 로 한 번에 저장한다.
+같은 날 한 헬퍼에게는 요청 하나만 배정한다.
+추천받은 헬퍼는 추천을 수락(가격/좌석 입력 → pending 제안)하거나 거절(cancelled)할 수 있고,
+거절한 헬퍼에게는 같은 요청을 다시 추천하지 않는다.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+
+from .models import User, Profile, Request, Proposal
+from .bulk import FINISHED_REQUEST_STATUSES
+from . import events, search
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy 가 없으면 NumPy 구현 사용
+    linear_sum_assignment = None
+
+DEFAULT_WEIGHTS = {
+    'affinity': 1.0,
+    'load': 0.6,
+    'tickets': 0.3,
+}
+
+SUGGESTION_MESSAGE = '자동 매칭으로 추천된 요청입니다.'
+
+
+def _weights():
+    return {**DEFAULT_WEIGHTS, **getattr(settings, 'AUTO_MATCH', {}).get('WEIGHTS', {})}
+
+
+def _candidates_per_request():
+    return getattr(settings, 'AUTO_MATCH', {}).get('CANDIDATES_PER_REQUEST', 10)
+
+
+# -------------------- 배정 문제 풀이 --------------------
+
+def _hungarian(cost):
+    """
+    행 수 <= 열 수인 비용 행렬의 최소 비용 배정 (potential 기반 O(n^2 m))
+    - 열 방향 갱신을 NumPy 로 벡터화
+    - 반환값: 각 행에 배정된 열 index 배열
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)      # p[j]: 열 j 에 배정된 행 (1부터, 0 은 없음)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            current = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (current < minv[1:])
+            minv[1:][better] = current[better]
+            way[1:][better] = j0
+
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+
+            used_cols = np.flatnonzero(used)
+            u[p[used_cols]] += delta
+            v[used_cols] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    assignment = np.empty(n, dtype=np.int64)
+    cols = np.flatnonzero(p[1:])
+    assignment[p[cols + 1] - 1] = cols
+    return assignment
+
+
+def solve_assignment(cost):
+    """
+    직사각 비용 행렬의 최소 비용 배정
+    - 반환값: (행 index 배열, 열 index 배열)
+    """
+    n, m = cost.shape
+    if n == 0 or m == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(cost)
+    if n <= m:
+        return np.arange(n), _hungarian(cost)
+    cols = np.arange(m)
+    rows = _hungarian(cost.T)
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def assign(cost, candidates=None):
+    """
+    요청마다 비용이 낮은 후보 헬퍼 candidates 명만 남긴 뒤 배정
+    - 헬퍼가 수만 명이어도 실제로 푸는 행렬은 (요청 수) x (후보 합집합) 크기
+    - 반환값: [(요청 index, 헬퍼 index)]
+    """
+    n, m = cost.shape
+    candidates = candidates or _candidates_per_request()
+    # 비용이 같은 헬퍼가 많으면 후보가 한쪽으로 몰리고 헝가리안 탐색도 길어지므로
+    # 아주 작은 고정 난수로 동점을 깸 (결과 비용에는 영향 없음)
+    cost = cost + 1e-6 * np.random.default_rng(0).random(cost.shape)
+    if m > candidates:
+        nearest = np.argpartition(cost, candidates - 1, axis=1)[:, :candidates]
+        columns = np.unique(nearest)
+    else:
+        columns = np.arange(m)
+    rows, cols = solve_assignment(cost[:, columns])
+    return list(zip(rows.tolist(), columns[cols].tolist()))
+
+
+# -------------------- 비용 계산 --------------------
+
+def build_costs(request_home, request_away, request_tickets, helper_favorite, helper_load, helper_history):
+    """
+    요청 x 헬퍼 비용 행렬
+    - 팀 친화도: 관심 구단이 경기 팀이면 1, 아니면 해당 팀 수락 이력 비율
+    - 부하: 진행 중인 제안 수가 많을수록 비용 증가, 티켓 수가 많은 요청일수록 더 크게
+    - helper_history: (헬퍼 수 x 팀 index 수) 수락 횟수 행렬, 팀 index 는 request_home/away 와 같은 체계
+    """
+    w = _weights()
+    favorite = (
+        (helper_favorite[None, :] == request_home[:, None])
+        | (helper_favorite[None, :] == request_away[:, None])
+    )
+    history = helper_history[:, request_home] + helper_history[:, request_away]   # (헬퍼, 요청)
+    totals = np.maximum(helper_history.sum(axis=1), 1)[:, None]
+    affinity = np.maximum(favorite, (history / totals).T)
+
+    load = helper_load / (1.0 + helper_load)
+    tickets = (request_tickets - 1) / 3.0
+    return (
+        w['affinity'] * (1.0 - affinity)
+        + w['load'] * load[None, :]
+        + w['tickets'] * tickets[:, None] * load[None, :]
+    )
+
+
+# -------------------- DB 연동 --------------------
+
+def _team_index(team_ids):
+    """팀 id → 0부터 시작하는 조밀한 index"""
+    return {team_id: i for i, team_id in enumerate(sorted(team_ids))}
+
+
+def load_helpers(team_index):
+    """
+    배정 가능한 헬퍼와 특성 배열
+    - 관심 구단, 진행 중인 제안 수, 팀별 수락 이력을 그룹 쿼리 몇 번으로 가져옴
+    """
+    helper_ids = list(User.objects.filter(role='helper', is_active=True).order_by('pk').values_list('pk', flat=True))
+    position = {helper_id: i for i, helper_id in enumerate(helper_ids)}
+    m = len(helper_ids)
+
+    favorite = np.full(m, -1, dtype=np.int64)
+    for user_id, team_id in Profile.objects.filter(user_id__in=position, favorite_team__isnull=False).values_list('user_id', 'favorite_team'):
+        favorite[position[user_id]] = team_index.get(team_id, -1)
+
+    load = np.zeros(m, dtype=np.float64)
+    active = Proposal.objects.filter(status__in=('pending', 'accepted', 'suggested')).exclude(
+        requestId__status__in=FINISHED_REQUEST_STATUSES
+    )
+    for helper_id, count in active.values('helperId').annotate(n=Count('pk')).values_list('helperId', 'n'):
+        if helper_id in position:
+            load[position[helper_id]] = count
+
+    history = np.zeros((m, max(len(team_index), 1)), dtype=np.float64)
+    accepted = Proposal.objects.filter(status='accepted')
+    for field in ('requestId__game__homeTeam', 'requestId__game__awayTeam'):
+        for helper_id, team_id, count in accepted.values('helperId', field).annotate(n=Count('pk')).values_list('helperId', field, 'n'):
+            if helper_id in position and team_id in team_index:
+                history[position[helper_id], team_index[team_id]] += count
+
+    return np.array(helper_ids, dtype=np.int64), favorite, load, history
+
+
+def waiting_requests(days):
+    """앞으로 days 일 이내 경기의, 아직 제안이 하나도 없는 대기 요청 (거절된 추천은 제안으로 치지 않음)"""
+    today = timezone.localdate()
+    has_proposal = Proposal.objects.filter(requestId=OuterRef('pk')).exclude(status='cancelled')
+    return list(
+        Request.objects.filter(
+            status='WAITING_FOR_HELPER',
+            game__date__gte=today,
+            game__date__lte=today + timedelta(days=days),
+        ).exclude(Exists(has_proposal)).values_list(
+            'requestId', 'game__date', 'game__homeTeam', 'game__awayTeam', 'numberOfTickets'
+        )
+    )
+
+
+def run(days=3, dry_run=False):
+    """
+    자동 매칭 실행
+    - 반환값: 경기일별 {'date', 'requests', 'assigned'} 목록
+    """
+    rows = waiting_requests(days)
+    if not rows:
+        return []
+    team_index = _team_index({row[2] for row in rows} | {row[3] for row in rows})
+    helper_ids, favorite, load, history = load_helpers(team_index)
+
+    by_date = defaultdict(list)
+    for row in rows:
+        by_date[row[1]].append(row)
+    # 헬퍼가 거절한 추천은 다시 만들지 않음
+    declined = set(
+        Proposal.objects.filter(requestId__in=[row[0] for row in rows], status='cancelled')
+        .values_list('requestId', 'helperId')
+    )
+
+    summary = []
+    suggestions = []
+    for game_date, day_rows in sorted(by_date.items()):
+        request_ids = np.array([row[0] for row in day_rows], dtype=np.int64)
+        home = np.array([team_index[row[2]] for row in day_rows], dtype=np.int64)
+        away = np.array([team_index[row[3]] for row in day_rows], dtype=np.int64)
+        tickets = np.array([row[4] for row in day_rows], dtype=np.float64)
+        pairs = assign(build_costs(home, away, tickets, favorite, load, history)) if len(helper_ids) else []
+        pairs = [
+            (request_i, helper_i) for request_i, helper_i in pairs
+            if (int(request_ids[request_i]), int(helper_ids[helper_i])) not in declined
+        ]
+        for request_i, helper_i in pairs:
+            suggestions.append(Proposal(
+                requestId_id=int(request_ids[request_i]),
+                helperId_id=int(helper_ids[helper_i]),
+                status='suggested',
+                message=SUGGESTION_MESSAGE,
+            ))
+        summary.append({'date': game_date, 'requests': len(day_rows), 'assigned': len(pairs)})
+
+    if not dry_run and suggestions:
+        with transaction.atomic():
+            Proposal.objects.bulk_create(suggestions, batch_size=1000)
+            events.record_created(suggestions)
+            search.index(suggestions, created=True)
+    return summary
+
+
+def synthetic_problem(n_requests, n_helpers, n_teams=10, seed=0):
+    """벤치마크용 무작위 입력 (DB 없이 build_costs 인자 생성)"""
+    rng = np.random.default_rng(seed)
+    home = rng.integers(0, n_teams, n_requests)
+    away = (home + rng.integers(1, n_teams, n_requests)) % n_teams
+    tickets = rng.integers(1, 5, n_requests).astype(np.float64)
+    favorite = np.where(rng.random(n_helpers) < 0.8, rng.integers(0, n_teams, n_helpers), -1)
+    load = rng.poisson(1.0, n_helpers).astype(np.float64)
+    history = rng.poisson(0.5, (n_helpers, n_teams)).astype(np.float64)
+    return home, away, tickets, favorite, load, history
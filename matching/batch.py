@@ -0,0 +1,53 @@
+# matching/batch.py
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+API_PREFIX = '/api/'
+
+# 하위 요청에 넘기지 않는 META (본문 관련 값은 GET 에 의미가 없음)
+_DROPPED_META = ('CONTENT_LENGTH', 'CONTENT_TYPE', 'wsgi.input')
+
+
+def max_subrequests():
+    return getattr(settings, 'BATCH_MAX_SUBREQUESTS', 10)
+
+
+def _build_subrequest(request, path, query, match):
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {key: value for key, value in request.META.items() if key not in _DROPPED_META}
+    sub.META['REQUEST_METHOD'] = 'GET'
+    sub.META['QUERY_STRING'] = query
+    sub.META['PATH_INFO'] = path
+    sub.GET = QueryDict(query)
+    sub.resolver_match = match
+    return sub
+
+
+def dispatch(request, user, auth, url):
+    """
+    배치 안의 GET 하위 요청 하나를 URL resolver 로 찾아 같은 프로세스에서 실행
+    - 바깥 요청에서 이미 인증된 user/auth 를 강제 인증으로 넘겨 JWT 검증을 반복하지 않음
+    - 권한/Throttle 은 각 뷰의 설정대로 그대로 적용됨
+    """
+    parts = urlsplit(url)
+    path = parts.path
+    if not path.startswith(API_PREFIX):
+        return {'path': url, 'status': 400, 'body': {'detail': f'{API_PREFIX} 하위 경로만 요청할 수 있습니다.'}}
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return {'path': url, 'status': 404, 'body': {'detail': '찾을 수 없는 경로입니다.'}}
+    if match.url_name == 'batch':
+        return {'path': url, 'status': 400, 'body': {'detail': '배치 요청은 중첩할 수 없습니다.'}}
+
+    sub = _build_subrequest(request, path, parts.query, match)
+    # DRF Request 가 이 값을 보고 ForcedAuthentication 을 사용
+    sub._force_auth_user = user
+    sub._force_auth_token = auth
+    response = match.func(sub, *match.args, **match.kwargs)
+    return {'path': url, 'status': response.status_code, 'body': getattr(response, 'data', None)}
@@ -0,0 +1,117 @@
+# matching/bulk.py
+"""
+여러 건의 제안/요청 상태 변경을 한 번에 처리
+
+소유권과 현재 상태는 잠금을 건 한 번의 조회로 확인하고,
+테이블마다 UPDATE 한 번으로 반영한 뒤 id 별 결과를 돌려준다.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Request, Proposal
+from . import recommendations, events
+
+OPEN_PROPOSAL_STATUSES = ('pending', 'suggested')
+FINISHED_REQUEST_STATUSES = ('COMPLETED', 'CANCELLED', 'EXPIRED')
+
+
+def max_ids():
+    return getattr(settings, 'BULK_MAX_IDS', 500)
+
+
+def _results(ids, outcomes):
+    return [{'id': pk, 'result': outcomes.get(pk, 'not_found')} for pk in ids]
+
+
+def reject_proposals(user, proposal_ids):
+    """요청 소유자(또는 staff)가 대기 중인 제안들을 거절"""
+    outcomes = {}
+    with transaction.atomic():
+        rows = (
+            Proposal.objects.select_for_update()
+            .filter(pk__in=proposal_ids)
+            .values_list('proposalId', 'requestId__userId', 'status')
+        )
+        ok = []
+        for proposal_id, owner_id, current in rows:
+            if not user.is_staff and owner_id != user.pk:
+                outcomes[proposal_id] = 'forbidden'
+            elif current not in OPEN_PROPOSAL_STATUSES:
+                outcomes[proposal_id] = 'invalid_status'
+            else:
+                outcomes[proposal_id] = 'rejected'
+                ok.append(proposal_id)
+        if ok:
+            events.transition(Proposal.objects.filter(pk__in=ok), 'rejected', updatedAt=timezone.now())
+    return _results(proposal_ids, outcomes)
+
+
+def accept_proposals(user, proposal_ids):
+    """
+    요청 소유자(또는 staff)가 요청마다 제안 하나씩 수락
+    - 수락한 제안 → accepted, 요청 → HELPER_MATCHED, 같은 요청의 나머지 제안 → rejected
+    """
+    outcomes = {}
+    with transaction.atomic():
+        rows = (
+            Proposal.objects.select_for_update()
+            .filter(pk__in=proposal_ids)
+            .values_list('proposalId', 'requestId', 'requestId__userId', 'requestId__status')
+        )
+        accepted, request_ids = [], set()
+        for proposal_id, request_id, owner_id, request_status in rows:
+            if not user.is_staff and owner_id != user.pk:
+                outcomes[proposal_id] = 'forbidden'
+            elif request_status != 'TICKET_PROPOSED':
+                outcomes[proposal_id] = 'invalid_status'
+            elif request_id in request_ids:
+                outcomes[proposal_id] = 'duplicate_request'
+            else:
+                outcomes[proposal_id] = 'accepted'
+                accepted.append(proposal_id)
+                request_ids.add(request_id)
+        if accepted:
+            now = timezone.now()
+            events.transition(Proposal.objects.filter(pk__in=accepted), 'accepted', updatedAt=now)
+            events.transition(Request.objects.filter(pk__in=request_ids), 'HELPER_MATCHED', updatedAt=now)
+            events.transition(
+                Proposal.objects.filter(requestId__in=request_ids, status__in=OPEN_PROPOSAL_STATUSES).exclude(pk__in=accepted),
+                'rejected', updatedAt=now,
+            )
+    if accepted:
+        recommendations.mark_changed()
+    return _results(proposal_ids, outcomes)
+
+
+def cancel_requests(user, request_ids=None, game_id=None, owner_id=None):
+    """
+    요청들을 취소하고 열린 제안은 거절 처리
+    - request_ids 또는 game_id(해당 경기의 내 요청 전부) 로 대상 지정
+    - staff 는 owner_id 로 다른 사용자의 요청도 지정 가능
+    """
+    outcomes = {}
+    with transaction.atomic():
+        queryset = Request.objects.select_for_update()
+        if request_ids is not None:
+            queryset = queryset.filter(pk__in=request_ids)
+        else:
+            queryset = queryset.filter(game_id=game_id, userId_id=owner_id if user.is_staff and owner_id else user.pk)
+        rows = list(queryset.values_list('requestId', 'userId', 'status'))
+        ok = []
+        for request_id, request_owner, current in rows:
+            if not user.is_staff and request_owner != user.pk:
+                outcomes[request_id] = 'forbidden'
+            elif current in FINISHED_REQUEST_STATUSES:
+                outcomes[request_id] = 'invalid_status'
+            else:
+                outcomes[request_id] = 'cancelled'
+                ok.append(request_id)
+        if ok:
+            now = timezone.now()
+            events.transition(Request.objects.filter(pk__in=ok), 'CANCELLED', updatedAt=now)
+            events.transition(Proposal.objects.filter(requestId__in=ok, status__in=OPEN_PROPOSAL_STATUSES), 'rejected', updatedAt=now)
+    if ok:
+        recommendations.mark_changed()
+    ids = request_ids if request_ids is not None else [row[0] for row in rows]
+    return _results(ids, outcomes)
@@ -0,0 +1,95 @@
+# matching/comparison.py
+import math
+
+from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Proposal, ArchivedProposal
+
+DEFAULT_WEIGHTS = {
+    'price': 0.5,
+    'experience': 0.25,
+    'mileage': 0.15,
+    'freshness': 0.1,
+}
+
+FIELDS = (
+    'proposalId', 'helperId', 'helperId__name', 'helperId__mileagePoints',
+    'priceKrw', 'pricePerTicket', 'seatSection', 'seatZone', 'seatType', 'totalPrice',
+    'createdAt', 'helperCompletedSessions',
+)
+
+
+def _weights():
+    return {**DEFAULT_WEIGHTS, **getattr(settings, 'PROPOSAL_RANKING_WEIGHTS', {})}
+
+
+def _completed_subquery(model):
+    """헬퍼별 완료 횟수 상관 서브쿼리"""
+    return Coalesce(Subquery(
+        model.objects.filter(helperId=OuterRef('helperId'), status='accepted', requestId__status='COMPLETED')
+        .order_by()
+        .values('helperId')
+        .annotate(n=Count('pk'))
+        .values('n'),
+        output_field=IntegerField(),
+    ), 0)
+
+
+def pending_proposal_rows(request_id):
+    """
+    요청의 대기 중인 제안 + 헬퍼 완료 횟수/마일리지를 한 번의 쿼리로 조회
+    - 완료 횟수는 헬퍼별 상관 서브쿼리로 계산 (제안마다 추가 쿼리 없음)
+    - 보관된 제안도 포함해 leaderboard.completed_sessions / my_stats 와 같은 값
+    """
+    return list(
+        Proposal.objects.filter(requestId_id=request_id, status='pending')
+        .annotate(helperCompletedSessions=_completed_subquery(Proposal) + _completed_subquery(ArchivedProposal))
+        .values(*FIELDS)
+    )
+
+
+def _scaled(values, higher_is_better=True):
+    """0~1 로 정규화 (값이 없으면 0, 모두 같으면 1)"""
+    known = [v for v in values if v is not None]
+    if not known:
+        return [0.0] * len(values)
+    low, high = min(known), max(known)
+    result = []
+    for v in values:
+        if v is None:
+            result.append(0.0)
+        elif high == low:
+            result.append(1.0)
+        else:
+            ratio = (v - low) / (high - low)
+            result.append(ratio if higher_is_better else 1.0 - ratio)
+    return result
+
+
+def rank(rows, now=None):
+    """
+    가격(장당, 낮을수록), 헬퍼 완료 횟수, 마일리지, 제안 최신성으로 점수를 매겨 정렬
+    - 각 행에 rank, score 를 채워서 반환
+    """
+    if not rows:
+        return rows
+    now = now or timezone.now()
+    w = _weights()
+    price = _scaled([row['pricePerTicket'] for row in rows], higher_is_better=False)
+    experience = _scaled([math.log1p(row['helperCompletedSessions']) for row in rows])
+    mileage = _scaled([row['helperId__mileagePoints'] for row in rows])
+    freshness = _scaled([-(now - row['createdAt']).total_seconds() for row in rows])
+
+    for i, row in enumerate(rows):
+        row['score'] = round(
+            w['price'] * price[i] + w['experience'] * experience[i]
+            + w['mileage'] * mileage[i] + w['freshness'] * freshness[i],
+            4,
+        )
+    rows.sort(key=lambda row: (-row['score'], row['proposalId']))
+    for position, row in enumerate(rows, start=1):
+        row['rank'] = position
+    return rows
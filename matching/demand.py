@@ -0,0 +1,129 @@
+# matching/demand.py
+"""
+경기별 미충족 수요 카운터 (GameDemand)
+
+상태 변경 시그널(events.status_changed)의 (이전 상태, 새 상태) 로 카운터 증감분을 계산해
+경기마다 F() UPDATE 한 번으로 반영한다. 시그널을 거치지 않는 변경(삭제 제외)이나 누락분은
+reconcile_game_demand 명령이 주기적으로 원본 테이블에서 다시 세어 맞춘다.
+"""
+from collections import defaultdict
+
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Game, GameDemand, Request, Proposal
+from .events import status_changed
+
+COUNTERS = ('waitingRequests', 'waitingTickets', 'proposedRequests', 'proposedTickets', 'openProposals')
+OPEN_PROPOSAL_STATUSES = ('pending', 'suggested')
+
+
+def _request_counters(status, tickets):
+    if status == 'WAITING_FOR_HELPER':
+        return {'waitingRequests': 1, 'waitingTickets': tickets or 0}
+    if status == 'TICKET_PROPOSED':
+        return {'proposedRequests': 1, 'proposedTickets': tickets or 0}
+    return {}
+
+
+def _proposal_counters(status, tickets=None):
+    return {'openProposals': 1} if status in OPEN_PROPOSAL_STATUSES else {}
+
+
+def apply(deltas):
+    """{경기 id: {카운터: 증감}} 반영 (0 인 항목은 생략, 없는 행은 생성)"""
+    for game_id, counts in deltas.items():
+        counts = {field: value for field, value in counts.items() if value}
+        if not counts:
+            continue
+        updates = {field: F(field) + value for field, value in counts.items()}
+        if not GameDemand.objects.filter(game_id=game_id).update(updatedAt=timezone.now(), **updates):
+            GameDemand.objects.get_or_create(game_id=game_id)
+            GameDemand.objects.filter(game_id=game_id).update(updatedAt=timezone.now(), **updates)
+
+
+@receiver(status_changed, sender=Request)
+@receiver(status_changed, sender=Proposal)
+def _status_changed(sender, changes, **kwargs):
+    counters = _request_counters if sender is Request else _proposal_counters
+    missing = {change.request_id for change in changes if change.game_id is None}
+    games = dict(Request.objects.filter(pk__in=missing).values_list('pk', 'game_id')) if missing else {}
+
+    deltas = defaultdict(lambda: defaultdict(int))
+    for change in changes:
+        old_game = change.game_id or games.get(change.request_id)
+        new_game = change.new_game_id or old_game
+        if old_game is None:
+            continue
+        if change.old is not None:
+            for field, value in counters(change.old, change.tickets).items():
+                deltas[old_game][field] -= value
+        for field, value in counters(change.new, change.tickets).items():
+            deltas[new_game][field] += value
+    apply(deltas)
+
+
+@receiver(post_delete, sender=Request)
+def _request_deleted(sender, instance, **kwargs):
+    apply({instance.game_id: {field: -value for field, value in _request_counters(instance.status, instance.numberOfTickets).items()}})
+
+
+@receiver(post_delete, sender=Proposal)
+def _proposal_deleted(sender, instance, **kwargs):
+    if instance.status not in OPEN_PROPOSAL_STATUSES:
+        return
+    game_id = Request.objects.filter(pk=instance.requestId_id).values_list('game_id', flat=True).first()
+    if game_id is not None:
+        apply({game_id: {'openProposals': -1}})
+
+
+@receiver(post_save, sender=Game)
+def _game_created(sender, instance, created, **kwargs):
+    if created:
+        GameDemand.objects.get_or_create(game=instance)
+
+
+def reconcile(from_date=None):
+    """
+    from_date 이후 경기의 카운터를 원본 테이블에서 다시 세어 덮어씀 (그룹 쿼리 2번)
+    - 반환값: 값이 달라서 고친 경기 수
+    """
+    from_date = from_date or timezone.localdate()
+    game_ids = list(Game.objects.filter(date__gte=from_date).values_list('pk', flat=True))
+    actual = {game_id: dict.fromkeys(COUNTERS, 0) for game_id in game_ids}
+
+    request_rows = (
+        Request.objects.filter(game_id__in=game_ids, status__in=('WAITING_FOR_HELPER', 'TICKET_PROPOSED'))
+        .values('game_id', 'status').annotate(n=Count('pk'), tickets=Sum('numberOfTickets')).order_by()
+    )
+    for row in request_rows:
+        prefix = 'waiting' if row['status'] == 'WAITING_FOR_HELPER' else 'proposed'
+        actual[row['game_id']][f'{prefix}Requests'] = row['n']
+        actual[row['game_id']][f'{prefix}Tickets'] = row['tickets'] or 0
+    proposal_rows = (
+        Proposal.objects.filter(requestId__game_id__in=game_ids, status__in=OPEN_PROPOSAL_STATUSES)
+        .values('requestId__game_id').annotate(n=Count('pk')).order_by()
+    )
+    for row in proposal_rows:
+        actual[row['requestId__game_id']]['openProposals'] = row['n']
+
+    existing = GameDemand.objects.in_bulk(game_ids)
+    changed = []
+    for game_id, counts in actual.items():
+        row = existing.get(game_id) or GameDemand(game_id=game_id)
+        if game_id in existing and all(getattr(row, field) == value for field, value in counts.items()):
+            continue
+        for field, value in counts.items():
+            setattr(row, field, value)
+        row.updatedAt = timezone.now()
+        changed.append(row)
+    GameDemand.objects.bulk_create(
+        [row for row in changed if row.game_id not in existing], batch_size=1000,
+    )
+    GameDemand.objects.bulk_update(
+        [row for row in changed if row.game_id in existing], list(COUNTERS) + ['updatedAt'], batch_size=1000,
+    )
+    return len(changed)
+
@@ -0,0 +1,240 @@
+# matching/events.py
+"""
+요청/제안 상태 변경 이력 (append-only)
+
+상태가 바뀔 때마다 StatusEvent 한 행을 추가한다. 상태는 정수 코드로 저장해 행을 작게 유지한다.
+- save() 로 바뀌는 경우: post_save 시그널이 기록 (로드 시점 상태와 비교하므로 추가 조회 없음)
+- QuerySet.update()/bulk_create() 로 바뀌는 경우: transition()/record_created() 를 통해 기록
+- 기록한 사용자(actorId)는 ActorMiddleware 가 잡아둔 현재 요청의 사용자 (명령/워커에서는 None)
+- 기록과 함께 status_changed 시그널로 (이전 상태, 새 상태) 를 알려 경기별 수요 카운터 등이 증분 갱신하게 함
+"""
+import contextvars
+import statistics
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models import Min, Q
+from django.db.models.signals import post_init, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .models import Request, Proposal, StatusEvent
+
+KIND_REQUEST = 1
+KIND_PROPOSAL = 2
+KINDS = {Request: KIND_REQUEST, Proposal: KIND_PROPOSAL}
+
+# 코드는 저장된 이력의 의미가 바뀌지 않도록 추가만 하고 재사용하지 않음
+STATUS_CODES = {
+    KIND_REQUEST: {
+        'WAITING_FOR_HELPER': 1,
+        'HELPER_MATCHED': 2,
+        'TICKET_PROPOSED': 3,
+        'SEAT_CONFIRMED': 4,
+        'COMPLETED': 5,
+        'CANCELLED': 6,
+        'EXPIRED': 7,
+    },
+    KIND_PROPOSAL: {
+        'pending': 1,
+        'accepted': 2,
+        'rejected': 3,
+        'suggested': 4,
+        'cancelled': 5,
+    },
+}
+STATUS_NAMES = {kind: {code: name for name, code in codes.items()} for kind, codes in STATUS_CODES.items()}
+
+# sender: 모델 클래스, changes: [StatusChange, ...]
+status_changed = Signal()
+# game_id: 변경 전 경기, new_game_id: 변경 후 경기 (재편성 때만 다름). 제안의 game_id 는 모르면 None
+StatusChange = namedtuple('StatusChange', 'object_id request_id game_id tickets old new new_game_id')
+
+
+_current_request = contextvars.ContextVar('status_event_request', default=None)
+
+
+class ActorMiddleware:
+    """
+    현재 요청을 기억해 두었다가 이력 기록 시점에 request.user 를 actor 로 사용
+    - DRF 가 JWT 인증 후 원래 HttpRequest 의 user 도 바꿔주므로 뷰 안에서는 인증된 사용자가 보임
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_request.reset(token)
+
+
+def current_actor_id():
+    user = getattr(_current_request.get(), 'user', None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def _request_id(kind, obj_id, request_id):
+    return obj_id if kind == KIND_REQUEST else request_id
+
+
+def _event(kind, obj_id, request_id, status, at, actor_id):
+    return StatusEvent(
+        kind=kind,
+        objectId=obj_id,
+        requestId=_request_id(kind, obj_id, request_id),
+        toStatus=STATUS_CODES[kind][status],
+        actorId=actor_id,
+        at=at,
+    )
+
+
+def transition(queryset, status, **fields):
+    """
+    queryset 의 행들을 status 로 바꾸고 바뀐 행마다 이력 기록 (잠금 조회 1번 + UPDATE 1번 + INSERT 1번)
+    - fields 는 함께 바꿀 다른 컬럼 (updatedAt 등)
+    - 이미 status 인 행은 (updatedAt 외에 바꿀 컬럼이 없으면) 건너뜀
+    - 읽은 행을 잠근 뒤 그 행만 UPDATE 하므로, 이력/수요 카운터에 넘기는 이전 상태가 실제로 바뀐 행과 일치
+    - 반환값: 바뀐 행 수
+    """
+    kind = KINDS[queryset.model]
+    if kind == KIND_REQUEST:
+        columns = ('pk', 'pk', 'game', 'numberOfTickets', 'status')
+    else:
+        columns = ('pk', 'requestId', 'requestId__game', 'requestId__numberOfTickets', 'status')
+    if set(fields) <= {'updatedAt'}:
+        queryset = queryset.exclude(status=status)
+    # 바깥 트랜잭션 안에서 불리는 경우가 대부분이므로 savepoint 는 만들지 않음
+    with transaction.atomic(savepoint=False):
+        rows = list(queryset.select_for_update(of=('self',)).values_list(*columns))
+        if not rows:
+            return 0
+        updated = queryset.model.objects.filter(pk__in=[row[0] for row in rows]).update(status=status, **fields)
+        at = fields.get('updatedAt') or timezone.now()
+        actor_id = current_actor_id()
+        StatusEvent.objects.bulk_create(
+            [_event(kind, row[0], row[1], status, at, actor_id) for row in rows],
+            batch_size=1000,
+        )
+        new_game = fields.get('game')
+        status_changed.send(sender=queryset.model, changes=[
+            StatusChange(pk, request_id, game_id, tickets, old, status, new_game.pk if new_game else game_id)
+            for pk, request_id, game_id, tickets, old in rows
+        ])
+    return updated
+
+
+def record_created(objs):
+    """bulk_create 로 만든 행들의 첫 상태 기록 (pk 가 채워진 뒤에 호출)"""
+    actor_id = current_actor_id()
+    StatusEvent.objects.bulk_create(
+        [
+            _event(KINDS[type(obj)], obj.pk, getattr(obj, 'requestId_id', None), obj.status,
+                   obj.createdAt or timezone.now(), actor_id)
+            for obj in objs
+        ],
+        batch_size=1000,
+    )
+    for model in {type(obj) for obj in objs}:
+        status_changed.send(sender=model, changes=[_created_change(obj) for obj in objs if type(obj) is model])
+
+
+def _game_of(instance):
+    """추가 쿼리 없이 알 수 있는 (경기 id, 티켓 수). 제안의 요청이 로드되지 않았으면 (None, None)"""
+    if isinstance(instance, Request):
+        return instance.game_id, instance.numberOfTickets
+    if Proposal._meta.get_field('requestId').is_cached(instance):
+        return instance.requestId.game_id, instance.requestId.numberOfTickets
+    return None, None
+
+
+def _created_change(obj):
+    game_id, tickets = _game_of(obj)
+    return StatusChange(obj.pk, getattr(obj, 'requestId_id', obj.pk), game_id, tickets, None, obj.status, game_id)
+
+
+@receiver(post_init, sender=Request)
+@receiver(post_init, sender=Proposal)
+def _remember_status(sender, instance, **kwargs):
+    # only()/defer() 로 status 를 빼고 읽은 경우 추가 쿼리가 나지 않도록 __dict__ 에서 확인
+    instance._loaded_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=Request)
+@receiver(post_save, sender=Proposal)
+def _record_saved_status(sender, instance, created, update_fields=None, **kwargs):
+    current = instance.__dict__.get('status')
+    if current is None or (not created and current == instance._loaded_status):
+        return
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    _event(
+        KINDS[sender], instance.pk, getattr(instance, 'requestId_id', None), current,
+        instance.updatedAt or timezone.now(), current_actor_id(),
+    ).save(force_insert=True)
+    game_id, tickets = _game_of(instance)
+    old = None if created else instance._loaded_status
+    status_changed.send(sender=sender, changes=[
+        StatusChange(instance.pk, getattr(instance, 'requestId_id', instance.pk), game_id, tickets, old, current, game_id)
+    ])
+    instance._loaded_status = current
+
+
+# -------------------- 집계 --------------------
+
+def request_timings(date_from=None, date_to=None):
+    """
+    요청별 (생성, 첫 제안, 매칭) 시각을 이력 테이블 GROUP BY 한 번으로 계산
+    - (requestId, kind, toStatus, at) 인덱스만 읽음
+    - 반환값: [(requestId, created_at, first_proposal_at, matched_at)]
+    """
+    request_codes = STATUS_CODES[KIND_REQUEST]
+    proposal_codes = STATUS_CODES[KIND_PROPOSAL]
+    created_q = Q(kind=KIND_REQUEST, toStatus=request_codes['WAITING_FOR_HELPER'])
+    queryset = StatusEvent.objects.all()
+    if date_from or date_to:
+        # 해당 기간에 생성된 요청만 (생성 이력 기준)
+        created = StatusEvent.objects.filter(created_q)
+        if date_from:
+            created = created.filter(at__date__gte=date_from)
+        if date_to:
+            created = created.filter(at__date__lte=date_to)
+        queryset = queryset.filter(requestId__in=created.values('requestId'))
+    return list(
+        queryset.values('requestId').annotate(
+            created_at=Min('at', filter=created_q),
+            # 자동 매칭 추천(suggested)은 헬퍼가 수락해 pending 이 된 시점을 첫 제안으로 봄
+            first_proposal_at=Min('at', filter=Q(kind=KIND_PROPOSAL, toStatus=proposal_codes['pending'])),
+            matched_at=Min('at', filter=Q(kind=KIND_REQUEST, toStatus=request_codes['HELPER_MATCHED'])),
+        ).filter(created_at__isnull=False).order_by().values_list('requestId', 'created_at', 'first_proposal_at', 'matched_at')
+    )
+
+
+def _describe(seconds):
+    if not seconds:
+        return {'count': 0, 'mean': None, 'median': None, 'p90': None}
+    seconds.sort()
+    return {
+        'count': len(seconds),
+        'mean': round(statistics.fmean(seconds), 1),
+        'median': round(statistics.median(seconds), 1),
+        'p90': round(seconds[min(len(seconds) - 1, int(len(seconds) * 0.9))], 1),
+    }
+
+
+def timing_summary(date_from=None, date_to=None):
+    """첫 제안까지 / 매칭까지 걸린 시간(초) 통계"""
+    to_first_proposal, to_match = [], []
+    requests = 0
+    for _, created_at, first_proposal_at, matched_at in request_timings(date_from, date_to):
+        requests += 1
+        if first_proposal_at is not None:
+            to_first_proposal.append((first_proposal_at - created_at).total_seconds())
+        if matched_at is not None:
+            to_match.append((matched_at - created_at).total_seconds())
+    return {
+        'requests': requests,
+        'timeToFirstProposal': _describe(to_first_proposal),
+        'timeToMatch': _describe(to_match),
+    }
@@ -0,0 +1,71 @@
+# matching/expiry.py
+"""
+경기 시작 시각이 지난 열린 요청 만료 처리
+
+경기(date, time) 인덱스로 지난 경기를 찾고, 요청 id 를 chunk 단위로 잘라
+UPDATE 한 번씩으로 EXPIRED 처리한다. UPDATE 의 WHERE 에 현재 상태 조건을 다시 걸고
+(Postgres 에서는) 이미 다른 실행이 잡은 행을 건너뛰므로 동시에 여러 번 돌려도 안전하다.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Request, Proposal
+from . import recommendations, events
+
+EXPIRABLE_STATUSES = ('WAITING_FOR_HELPER', 'TICKET_PROPOSED')
+OPEN_PROPOSAL_STATUSES = ('pending', 'suggested')
+
+
+def _local(now):
+    now = timezone.localtime(now or timezone.now())
+    return now.date(), now.time()
+
+
+def started_games_q(now=None, prefix='game__'):
+    """경기 시작 시각이 now 이전인 경기 조건"""
+    today, current = _local(now)
+    return Q(**{f'{prefix}date__lt': today}) | Q(**{f'{prefix}date': today, f'{prefix}time__lte': current})
+
+
+def attendable(queryset, now=None):
+    """아직 관람 가능한(시작 전) 경기의 요청만"""
+    return queryset.exclude(started_games_q(now))
+
+
+def stale_requests(now=None):
+    return Request.objects.filter(started_games_q(now), status__in=EXPIRABLE_STATUSES)
+
+
+def expire_stale(now=None, chunk_size=None, dry_run=False):
+    """
+    지난 경기의 열린 요청을 EXPIRED 로, 그 요청의 열린 제안을 cancelled 로 변경
+    - 반환값: {'requests': 만료한 요청 수, 'proposals': 취소한 제안 수}
+    """
+    chunk_size = chunk_size or getattr(settings, 'EXPIRY_CHUNK_SIZE', 1000)
+    now = now or timezone.now()
+    if dry_run:
+        return {'requests': stale_requests(now).count(), 'proposals': 0}
+
+    expired = cancelled = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                stale_requests(now).select_for_update(skip_locked=True, of=('self',))
+                .order_by('pk').values_list('pk', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            updated_at = timezone.now()
+            expired += events.transition(
+                Request.objects.filter(pk__in=ids, status__in=EXPIRABLE_STATUSES), 'EXPIRED', updatedAt=updated_at
+            )
+            cancelled += events.transition(
+                Proposal.objects.filter(requestId__in=ids, status__in=OPEN_PROPOSAL_STATUSES), 'cancelled', updatedAt=updated_at
+            )
+        if len(ids) < chunk_size:
+            break
+    if expired:
+        recommendations.mark_changed()
+    return {'requests': expired, 'proposals': cancelled}
@@ -0,0 +1,116 @@
+# matching/exports.py
+import csv
+import zlib
+from datetime import date
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import User, Request, Proposal, ArchivedRequest, ArchivedProposal, StatusEvent
+
+FORMATS = ('csv', 'ndjson')
+
+# 내보내기 이름 → (모델, 컬럼(values_list 경로), 날짜 필터 기준 필드)
+# values_list 로 필요한 조인 컬럼만 한 번에 읽어 모델 인스턴스 생성을 피함
+EXPORTS = {
+    'requests': (Request, [
+        'requestId', 'userId_id', 'userId__name', 'game_id', 'game__date',
+        'game__homeTeam__name', 'game__awayTeam__name', 'accompanyType',
+        'status', 'numberOfTickets', 'createdAt', 'updatedAt',
+    ], 'createdAt'),
+    'proposals': (Proposal, [
+        'proposalId', 'requestId_id', 'helperId_id', 'helperId__name',
+        'requestId__game__date', 'seatType', 'totalPrice', 'status',
+        'createdAt', 'updatedAt',
+    ], 'createdAt'),
+    'mileage': (User, [
+        'id', 'name', 'role', 'mileagePoints', 'date_joined',
+    ], 'date_joined'),
+    # 상태 코드는 matching.events.STATUS_CODES 참고
+    'status-events': (StatusEvent, [
+        'id', 'kind', 'objectId', 'requestId', 'toStatus', 'actorId', 'at',
+    ], 'at'),
+}
+
+# archive_history 로 옮겨진 행도 같은 컬럼으로 합쳐서 내보냄 (archive 모델은 같은 필드 이름을 가짐)
+ARCHIVED = {
+    'requests': ArchivedRequest,
+    'proposals': ArchivedProposal,
+}
+
+
+def date_range(params):
+    """{'from', 'to'} (YYYY-MM-DD) → (date|None, date|None), 형식이 틀리면 ValueError"""
+    return tuple(date.fromisoformat(params[key]) if params.get(key) else None for key in ('from', 'to'))
+
+
+def chunk_size():
+    return getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+
+def export_rows(name, date_from=None, date_to=None, status=None):
+    """
+    (헤더, 행 iterator) 반환
+    - .iterator(chunk_size) 로 서버 측 커서를 사용해 메모리 사용량이 행 수와 무관
+    - 요청/제안은 보관된 행을 UNION ALL 로 합침
+    """
+    model, columns, date_field = EXPORTS[name]
+
+    def filtered(model):
+        queryset = model.objects.all()
+        if date_from:
+            queryset = queryset.filter(**{f'{date_field}__date__gte': date_from})
+        if date_to:
+            queryset = queryset.filter(**{f'{date_field}__date__lte': date_to})
+        if status and name in ARCHIVED:
+            queryset = queryset.filter(status=status)
+        return queryset.order_by().values_list(*columns)
+
+    queryset = filtered(model)
+    if name in ARCHIVED:
+        queryset = queryset.union(filtered(ARCHIVED[name]), all=True)
+    rows = queryset.order_by(columns[0]).iterator(chunk_size=chunk_size())
+    return columns, rows
+
+
+class _Echo:
+    """csv.writer 가 쓴 한 줄을 그대로 돌려주는 가짜 버퍼"""
+    def write(self, value):
+        return value
+
+
+def encode(columns, rows, fmt):
+    """행 iterator 를 CSV/NDJSON 텍스트 조각 iterator 로 변환"""
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        for row in rows:
+            yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def gzip_stream(chunks, flush_bytes=64 * 1024):
+    """텍스트 조각을 받아 gzip 바이트를 흘려보냄 (전체를 메모리에 모으지 않음)"""
+    compressor = zlib.compressobj(wbits=31)
+    pending = 0
+    for chunk in chunks:
+        data = chunk.encode()
+        pending += len(data)
+        out = compressor.compress(data)
+        if pending >= flush_bytes:
+            out += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def stream(name, fmt='csv', compress=False, **filters):
+    columns, rows = export_rows(name, **filters)
+    chunks = encode(columns, rows, fmt)
+    if compress:
+        return gzip_stream(chunks)
+    return (chunk.encode() for chunk in chunks)
@@ -0,0 +1,234 @@
+# matching/funnel.py
+"""
+운영 대시보드용 퍼널 집계 (일별 / 경기별)
+
+StatusEvent 를 워터마크(마지막으로 반영한 이벤트 id) 이후부터만 읽어 DailyFunnel/GameFunnel 의
+카운터에 더한다. id 는 커밋 순서가 아니라 INSERT 순서이므로, 워터마크 아래에서 건너뛴 id 구간은
+FUNNEL_GAP_TIMEOUT 동안 기억해 두었다가 늦게 커밋된 이벤트가 보이면 그때 반영한다. 매칭까지 걸린 시간 중앙값은 더할 수 없는 값이므로 이번 배치에서 매칭이 생긴
+날짜/경기만 다시 계산한다. 대시보드 API 는 집계 테이블만 읽는다.
+"""
+import statistics
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import Request, ArchivedRequest, StatusEvent, DailyFunnel, GameFunnel, RollupWatermark
+from .events import KIND_REQUEST, KIND_PROPOSAL, STATUS_CODES
+
+WATERMARK = 'funnel'
+COUNTERS = ('requestsCreated', 'proposalsMade', 'matches', 'completions', 'cancellations', 'expirations')
+
+_R = STATUS_CODES[KIND_REQUEST]
+_P = STATUS_CODES[KIND_PROPOSAL]
+_REQUEST_COUNTERS = {
+    _R['HELPER_MATCHED']: 'matches',
+    _R['COMPLETED']: 'completions',
+    _R['CANCELLED']: 'cancellations',
+    _R['EXPIRED']: 'expirations',
+}
+# 자동 매칭 추천(suggested)은 헬퍼가 수락해 pending 이 될 때 제안으로 셈
+_PROPOSAL_CREATED = (_P['pending'],)
+
+
+def _batch_size():
+    return getattr(settings, 'FUNNEL_BATCH_SIZE', 10000)
+
+
+def _gap_timeout():
+    return getattr(settings, 'FUNNEL_GAP_TIMEOUT', timedelta(hours=1))
+
+
+def _counter(kind, code, first_waiting):
+    if kind == KIND_REQUEST:
+        if code == _R['WAITING_FOR_HELPER']:
+            # 재편성으로 다시 WAITING_FOR_HELPER 가 된 경우는 생성으로 세지 않음
+            return 'requestsCreated' if first_waiting else None
+        return _REQUEST_COUNTERS.get(code)
+    return 'proposalsMade' if code in _PROPOSAL_CREATED else None
+
+
+def _request_games(request_ids):
+    """요청 id → 경기 id (보관된 요청 포함)"""
+    games = dict(ArchivedRequest.objects.filter(pk__in=request_ids).values_list('pk', 'game_id'))
+    games.update(Request.objects.filter(pk__in=request_ids).values_list('pk', 'game_id'))
+    return games
+
+
+def _median_time_to_match(request_ids, matched_from=None, matched_to=None):
+    rows = (
+        StatusEvent.objects.filter(kind=KIND_REQUEST, requestId__in=request_ids)
+        .values('requestId')
+        .annotate(
+            created=Min('at', filter=Q(toStatus=_R['WAITING_FOR_HELPER'])),
+            matched=Min('at', filter=Q(toStatus=_R['HELPER_MATCHED'])),
+        )
+        .order_by()
+        .values_list('created', 'matched')
+    )
+    waits = [
+        (matched - created).total_seconds()
+        for created, matched in rows
+        if created is not None and matched is not None
+        and (matched_from is None or matched_from <= matched < matched_to)
+    ]
+    return round(statistics.median(waits), 1) if waits else None
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _day_median(day):
+    start, end = _day_bounds(day)
+    matched_ids = StatusEvent.objects.filter(
+        kind=KIND_REQUEST, toStatus=_R['HELPER_MATCHED'], at__gte=start, at__lt=end
+    ).values('requestId')
+    return _median_time_to_match(matched_ids, start, end)
+
+
+def _game_median(game_id):
+    request_ids = list(Request.objects.filter(game_id=game_id).values_list('pk', flat=True))
+    request_ids += ArchivedRequest.objects.filter(game_id=game_id).values_list('pk', flat=True)
+    return _median_time_to_match(request_ids)
+
+
+def _apply(model, key_field, deltas, medians):
+    """집계 행에 카운터를 더하고 중앙값을 갱신 (없는 행은 생성)"""
+    keys = set(deltas) | set(medians)
+    if not keys:
+        return
+    existing = model.objects.select_for_update().in_bulk(list(keys))
+    missing = [model(**{key_field: key}) for key in keys if key not in existing]
+    model.objects.bulk_create(missing)
+    rows = {**existing, **{getattr(row, key_field): row for row in missing}}
+    for key, counts in deltas.items():
+        row = rows[key]
+        for field, value in counts.items():
+            setattr(row, field, getattr(row, field) + value)
+    for key, median in medians.items():
+        rows[key].medianTimeToMatch = median
+    model.objects.bulk_update(list(rows.values()), list(COUNTERS) + ['medianTimeToMatch'], batch_size=1000)
+
+
+_COLUMNS = ('id', 'kind', 'requestId', 'toStatus', 'at')
+
+
+def _gap_filter(gaps):
+    condition = Q()
+    for first, last, _ in gaps:
+        condition |= Q(id__range=(first, last))
+    return condition
+
+
+def _remaining_gaps(gaps, found_ids, new_ids, last_id, now):
+    """
+    아직 보이지 않은 id 구간 목록 갱신
+    - 기존 구간에서 이번에 나타난 id 를 빼고, 새로 읽은 id 사이의 공백을 추가
+    - FUNNEL_GAP_TIMEOUT 보다 오래된 구간은 롤백된 것으로 보고 버림
+    """
+    found = set(found_ids)
+    result = []
+    for first, last, detected in gaps:
+        start = first
+        for event_id in sorted(i for i in found if first <= i <= last):
+            if start < event_id:
+                result.append([start, event_id - 1, detected])
+            start = event_id + 1
+        if start <= last:
+            result.append([start, last, detected])
+    stamp = int(now.timestamp())
+    previous = last_id
+    for event_id in new_ids:
+        if event_id > previous + 1:
+            result.append([previous + 1, event_id - 1, stamp])
+        previous = event_id
+    expired_before = stamp - _gap_timeout().total_seconds()
+    return [gap for gap in result if gap[2] >= expired_before]
+
+
+def _process_batch(watermark, batch_size):
+    rows = list(
+        StatusEvent.objects.filter(id__gt=watermark.lastEventId)
+        .order_by('id')
+        .values_list(*_COLUMNS)[:batch_size]
+    )
+    gaps = watermark.pendingGaps
+    late = list(StatusEvent.objects.filter(_gap_filter(gaps)).values_list(*_COLUMNS)) if gaps else []
+    now = timezone.now()
+    remaining = _remaining_gaps(gaps, [row[0] for row in late], [row[0] for row in rows], watermark.lastEventId, now)
+    if not rows and not late:
+        if remaining != gaps:
+            watermark.pendingGaps = remaining
+            watermark.save(update_fields=['pendingGaps', 'updatedAt'])
+        return 0
+    last_event_id = rows[-1][0] if rows else watermark.lastEventId
+    batch_ids = [row[0] for row in late]
+    rows = sorted(late + rows)
+
+    waiting_ids = {request_id for _, kind, request_id, code, _ in rows
+                   if kind == KIND_REQUEST and code == _R['WAITING_FOR_HELPER']}
+    seen_waiting = set(
+        StatusEvent.objects.filter(
+            kind=KIND_REQUEST, toStatus=_R['WAITING_FOR_HELPER'],
+            requestId__in=waiting_ids, id__lte=watermark.lastEventId,
+        ).exclude(id__in=batch_ids).values_list('requestId', flat=True)
+    )
+    games = _request_games({row[2] for row in rows})
+
+    daily = defaultdict(lambda: defaultdict(int))
+    per_game = defaultdict(lambda: defaultdict(int))
+    matched_days, matched_games = set(), set()
+    for _, kind, request_id, code, at in rows:
+        first_waiting = kind == KIND_REQUEST and code == _R['WAITING_FOR_HELPER'] and request_id not in seen_waiting
+        if first_waiting:
+            seen_waiting.add(request_id)
+        field = _counter(kind, code, first_waiting)
+        if field is None:
+            continue
+        day = timezone.localtime(at).date()
+        game_id = games.get(request_id)
+        daily[day][field] += 1
+        if game_id is not None:
+            per_game[game_id][field] += 1
+        if field == 'matches':
+            matched_days.add(day)
+            if game_id is not None:
+                matched_games.add(game_id)
+
+    _apply(DailyFunnel, 'day', daily, {day: _day_median(day) for day in matched_days})
+    _apply(GameFunnel, 'game_id', per_game, {game_id: _game_median(game_id) for game_id in matched_games})
+    watermark.lastEventId = last_event_id
+    watermark.pendingGaps = remaining
+    watermark.save(update_fields=['lastEventId', 'pendingGaps', 'updatedAt'])
+    return len(rows)
+
+
+def update_rollups(batch_size=None):
+    """
+    워터마크 이후의 이벤트를 batch_size 개씩 반영하고 처리한 이벤트 수를 반환
+    - 배치마다 워터마크 행을 잠그므로 동시에 여러 번 실행되어도 같은 이벤트를 두 번 세지 않음
+    """
+    batch_size = batch_size or _batch_size()
+    RollupWatermark.objects.get_or_create(name=WATERMARK)
+    processed = 0
+    while True:
+        with transaction.atomic():
+            watermark = RollupWatermark.objects.select_for_update().get(name=WATERMARK)
+            count = _process_batch(watermark, batch_size)
+        processed += count
+        if count < batch_size:
+            return processed
+
+
+def rebuild():
+    """집계를 비우고 처음 이벤트부터 다시 계산"""
+    with transaction.atomic():
+        DailyFunnel.objects.all().delete()
+        GameFunnel.objects.all().delete()
+        RollupWatermark.objects.update_or_create(name=WATERMARK, defaults={'lastEventId': 0, 'pendingGaps': []})
+    return update_rollups()
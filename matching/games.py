@@ -0,0 +1,78 @@
+# matching/games.py
+"""
+경기 취소(우천 취소 등) / 재편성 처리
+
+경기에 걸린 요청과 제안을 한 트랜잭션 안에서 테이블마다 UPDATE 한 번으로 정리하고,
+알림 대상(시니어, 헬퍼)마다 OutboxEvent 를 남긴다.
+- 취소: 열린 요청 → CANCELLED
+- 재편성: 열린 요청을 새 경기로 옮기고 WAITING_FOR_HELPER 로 되돌림 (기존 티켓은 무효)
+- 두 경우 모두 살아 있는 제안(대기/자동 제안/수락) → cancelled
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Game, Request, Proposal, OutboxEvent
+from .bulk import FINISHED_REQUEST_STATUSES
+from . import recommendations, events
+
+LIVE_PROPOSAL_STATUSES = ('pending', 'suggested', 'accepted')
+
+
+def _event(topic, recipient_id, **payload):
+    return OutboxEvent(topic=topic, recipientId=recipient_id, payload=payload)
+
+
+def cancel_game(game, reschedule_to=None, reason=''):
+    """
+    경기를 취소하거나 reschedule_to 경기로 재편성
+    - 이미 취소/연기된 경기이거나, reschedule_to 가 같은 경기이거나 예정(SCHEDULED) 경기가 아니면 ValueError
+    - 반환값: {'requests': 처리한 요청 수, 'proposals': 취소한 제안 수, 'events': 기록한 이벤트 수}
+    """
+    if reschedule_to is not None and reschedule_to.pk == game.pk:
+        raise ValueError('재편성 경기는 원래 경기와 달라야 합니다.')
+
+    with transaction.atomic():
+        game = Game.objects.select_for_update().get(pk=game.pk)
+        if game.status != 'SCHEDULED':
+            raise ValueError(f'이미 {game.get_status_display()} 처리된 경기입니다.')
+        if reschedule_to is not None:
+            # 재편성 경기도 잠가서 동시에 취소되지 않게 함
+            reschedule_to = Game.objects.select_for_update().get(pk=reschedule_to.pk)
+            if reschedule_to.status != 'SCHEDULED':
+                raise ValueError(f'재편성 경기가 {reschedule_to.get_status_display()} 상태입니다.')
+
+        open_requests = Request.objects.filter(game=game).exclude(status__in=FINISHED_REQUEST_STATUSES)
+        request_rows = list(open_requests.select_for_update().values_list('requestId', 'userId'))
+        request_ids = [request_id for request_id, _ in request_rows]
+        live_proposals = Proposal.objects.filter(requestId__in=request_ids, status__in=LIVE_PROPOSAL_STATUSES)
+        proposal_rows = list(live_proposals.values_list('proposalId', 'requestId', 'helperId'))
+
+        now = timezone.now()
+        events.transition(live_proposals, 'cancelled', updatedAt=now)
+        if reschedule_to is None:
+            events.transition(Request.objects.filter(pk__in=request_ids), 'CANCELLED', updatedAt=now)
+            game.status, topic = 'CANCELLED', 'game.cancelled'
+        else:
+            events.transition(
+                Request.objects.filter(pk__in=request_ids), 'WAITING_FOR_HELPER', game=reschedule_to, updatedAt=now
+            )
+            game.status, topic = 'POSTPONED', 'game.rescheduled'
+        game.rescheduledTo = reschedule_to
+        game.save(update_fields=['status', 'rescheduledTo'])
+
+        new_game_id = reschedule_to.pk if reschedule_to is not None else None
+        notifications = [
+            _event(topic, user_id, role='senior', requestId=request_id, gameId=game.pk,
+                   rescheduledTo=new_game_id, reason=reason)
+            for request_id, user_id in request_rows
+        ]
+        notifications += [
+            _event(topic, helper_id, role='helper', requestId=request_id, proposalId=proposal_id,
+                   gameId=game.pk, rescheduledTo=new_game_id, reason=reason)
+            for proposal_id, request_id, helper_id in proposal_rows
+        ]
+        OutboxEvent.objects.bulk_create(notifications, batch_size=1000)
+
+    if request_ids:
+        recommendations.mark_changed()
+    return {'requests': len(request_ids), 'proposals': len(proposal_rows), 'events': len(notifications)}
@@ -0,0 +1,124 @@
+# matching/idempotency.py
+import hashlib
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http.request import RawPostDataException
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 64
+
+
+def _ttl():
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', timedelta(hours=24))
+
+
+def _fingerprint(request):
+    """메서드 + 경로 + 본문 해시 (같은 키를 다른 본문으로 재사용하면 422)"""
+    try:
+        body = request.body
+    except RawPostDataException:
+        # multipart 처럼 본문 스트림을 이미 읽은 경우 파싱된 값으로 대신함
+        body = repr(sorted(request.data.items())).encode()
+    digest = hashlib.sha256(f'{request.method}:{request.path}:'.encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def _claim(user, key, fingerprint):
+    """
+    (user, key) 행을 먼저 INSERT 한 쪽이 처리 권한을 가짐
+    - 반환값: (record, created)
+    - TTL 이 지난 기록은 지우고 다시 선점
+    """
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(user=user, key=key, fingerprint=fingerprint), True
+        except IntegrityError:
+            record = IdempotencyKey.objects.filter(user=user, key=key).first()
+            if record is None:
+                continue
+            if record.createdAt >= timezone.now() - _ttl():
+                return record, False
+            IdempotencyKey.objects.filter(pk=record.pk).delete()
+    return None, False
+
+
+def _wait_for_response(record):
+    """
+    같은 키로 동시에 들어온 요청은 먼저 들어온 요청이 끝날 때까지 기다렸다가 그 응답을 재생
+    """
+    deadline = time.monotonic() + getattr(settings, 'IDEMPOTENCY_WAIT_SECONDS', 5)
+    while record is not None and record.responseStatus is None:
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.05)
+        record = IdempotencyKey.objects.filter(pk=record.pk).first()
+    return record
+
+
+def _replay(record):
+    response = Response(record.responseBody, status=record.responseStatus)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view_func):
+    """
+    Idempotency-Key 헤더가 있는 요청의 첫 응답을 저장하고, 같은 키의 재시도에는 뷰를 다시 실행하지 않고 재생
+    - 함수형 뷰: @api_view 아래에 바로 사용
+    - 클래스형 뷰: @method_decorator(idempotent, name='post')
+    - 5xx 응답이나 예외는 저장하지 않으므로 재시도 시 다시 실행됨
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key or not request.user.is_authenticated:
+            return view_func(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({'detail': f'{HEADER} 는 {MAX_KEY_LENGTH}자 이하여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        fingerprint = _fingerprint(request)
+        record, created = _claim(request.user, key, fingerprint)
+        if not created:
+            if record is not None and record.fingerprint != fingerprint:
+                return Response({'detail': '다른 요청에 이미 사용된 Idempotency-Key 입니다.'}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            record = _wait_for_response(record)
+            if record is None:
+                return Response({'detail': '같은 Idempotency-Key 의 요청이 처리 중입니다.'}, status=status.HTTP_409_CONFLICT)
+            return _replay(record)
+
+        try:
+            response = view_func(request, *args, **kwargs)
+        except Exception:
+            IdempotencyKey.objects.filter(pk=record.pk).delete()
+            raise
+
+        if response.status_code >= 500 or not hasattr(response, 'data'):
+            IdempotencyKey.objects.filter(pk=record.pk).delete()
+        else:
+            IdempotencyKey.objects.filter(pk=record.pk).update(
+                responseStatus=response.status_code, responseBody=response.data
+            )
+        return response
+    return wrapper
+
+
+def purge_expired(batch_size=1000):
+    """TTL 이 지난 기록을 batch_size 단위로 삭제하고 삭제한 개수를 반환"""
+    cutoff = timezone.now() - _ttl()
+    deleted = 0
+    while True:
+        ids = list(IdempotencyKey.objects.filter(createdAt__lt=cutoff).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
@@ -2,12 +2,24 @@
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from .models import User
+
+
+def issue_tokens(user):
+    """
+    (refresh, access) 토큰 문자열 발급
+    - 사용자 클레임은 refresh 토큰에 한 번만 넣고, access 토큰은 그 클레임을 복사해 만듦
+    """
+    refresh = CustomTokenObtainPairSerializer.get_token(user)
+    return str(refresh), str(refresh.access_token)
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
         
-        # JWT 페이로드에 사용자 정보 추가
+        # JWT 페이로드에 사용자 정보 추가 (access 토큰에도 그대로 복사됨)
         token['userId'] = user.id
         token['role'] = user.role
         token['name'] = user.name
@@ -15,5 +27,10 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         
         return token
 
+    def validate(self, attrs):
+        # 전화번호 형식을 맞춘 뒤 기본 인증
+        attrs[self.username_field] = User.objects.normalize_phone(attrs.get(self.username_field))
+        return super().validate(attrs)
+
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
@@ -0,0 +1,87 @@
+# matching/leaderboard.py
+"""
+헬퍼 리더보드 (마일리지 순)
+
+상위 CACHED_TOP_N 명은 (role, mileagePoints) 인덱스 순서대로 읽어 완료 횟수와 함께 캐시하고,
+마일리지가 바뀌면 캐시를 지운다. 개인 순위는 같은 인덱스에서 '나보다 마일리지가 많은 헬퍼 수' 를
+세므로 헬퍼 수와 상관없이 인덱스 범위 카운트 한 번이다.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import User, Proposal, ArchivedProposal
+
+CACHE_KEY = 'leaderboard:helpers'
+
+
+def _settings():
+    return getattr(settings, 'LEADERBOARD', {})
+
+
+def cached_top_n():
+    return _settings().get('CACHED_TOP_N', 100)
+
+
+def completed_sessions(helper_ids):
+    """헬퍼 id → 완료한 동행 수 (보관된 제안 포함, 헬퍼 수와 무관하게 쿼리 2번)"""
+    counts = defaultdict(int)
+    for model in (Proposal, ArchivedProposal):
+        rows = (
+            model.objects.filter(helperId__in=helper_ids, status='accepted', requestId__status='COMPLETED')
+            .values('helperId').annotate(n=Count('pk')).values_list('helperId', 'n')
+        )
+        for helper_id, n in rows:
+            counts[helper_id] += n
+    return counts
+
+
+def _build():
+    helpers = list(
+        User.objects.filter(role='helper')
+        .order_by('-mileagePoints', 'id')
+        .values_list('id', 'name', 'mileagePoints')[:cached_top_n()]
+    )
+    sessions = completed_sessions([helper_id for helper_id, _, _ in helpers])
+    rows = []
+    for position, (helper_id, name, points) in enumerate(helpers, start=1):
+        # 마일리지가 같으면 같은 순위 (1, 2, 2, 4 ...)
+        rank = rows[-1]['rank'] if rows and rows[-1]['mileagePoints'] == points else position
+        rows.append({
+            'rank': rank,
+            'helperId': helper_id,
+            'name': name,
+            'mileagePoints': points,
+            'completedSessions': sessions.get(helper_id, 0),
+        })
+    return rows
+
+
+def top(limit=20):
+    rows = cache.get(CACHE_KEY)
+    if rows is None:
+        rows = _build()
+        cache.set(CACHE_KEY, rows, _settings().get('TTL', 300))
+    return rows[:limit]
+
+
+def rank_of(user):
+    """헬퍼의 현재 순위 (마일리지가 더 많은 헬퍼 수 + 1)"""
+    return User.objects.filter(role='helper', mileagePoints__gt=user.mileagePoints).count() + 1
+
+
+def invalidate():
+    """마일리지가 바뀐 뒤 호출 (F() 로 일괄 적립하는 곳은 직접 호출)"""
+    cache.delete(CACHE_KEY)
+
+
+@receiver(post_save, sender=User)
+def _mileage_saved(sender, instance, created, update_fields=None, **kwargs):
+    # 로그인 시 last_login 만 저장하는 경우 등은 무시
+    if instance.role != 'helper' or (update_fields is not None and 'mileagePoints' not in update_fields):
+        return
+    invalidate()
@@ -0,0 +1,93 @@
+# matching/login.py
+"""
+로그인 비밀번호 검증
+
+PBKDF2 는 요청 하나에 수백 ms 의 CPU 를 쓰므로, 티켓 오픈 직전처럼 로그인이 몰리면 모든 워커 스레드가
+해싱에 묶인다. 해싱은 크기가 정해진 스레드 풀에서만 돌리고(hashlib 은 해싱 중 GIL 을 놓음),
+실행 중 + 대기 중인 작업이 HASH_WORKERS + HASH_QUEUE 를 넘으면 기다리지 않고 바로 Overloaded 를 던져
+뷰가 503 + Retry-After 로 응답하게 한다.
+- 검증과 함께, 저장된 해시의 반복 횟수가 현재 설정과 다르면 새 해시도 같은 풀에서 만들어 돌려줌 (로그인 시 재해싱)
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, identify_hasher, make_password
+
+DEFAULT_ITERATIONS = PBKDF2PasswordHasher.iterations
+
+
+def _settings():
+    return getattr(settings, 'LOGIN', {})
+
+
+class Overloaded(Exception):
+    """해싱 풀이 가득 참 (retry_after 초 뒤 재시도 권장)"""
+    def __init__(self, retry_after):
+        super().__init__('login hashing pool is full')
+        self.retry_after = retry_after
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    반복 횟수를 settings.LOGIN['PBKDF2_ITERATIONS'] 에서 읽는 PBKDF2 (알고리즘 이름은 기본값과 같음)
+    - 기존 해시도 그대로 검증되고, 반복 횟수가 다르면 must_update 가 True 가 되어 로그인 때 재해싱됨
+    """
+    @property
+    def iterations(self):
+        return _settings().get('PBKDF2_ITERATIONS', DEFAULT_ITERATIONS)
+
+
+class HashingPool:
+    def __init__(self, workers, queue):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='login-hash')
+        self.slots = threading.BoundedSemaphore(workers + queue)
+
+    def submit(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            raise Overloaded(_settings().get('RETRY_AFTER', 2))
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(_settings().get('HASH_WORKERS', 4), _settings().get('HASH_QUEUE', 16))
+    return _pool
+
+
+def _verify(raw_password, encoded):
+    """(맞는지, 재해싱이 필요하면 새 해시 아니면 None) — DB 를 건드리지 않는 순수 CPU 작업"""
+    if not check_password(raw_password, encoded):
+        return False, None
+    if identify_hasher(encoded).must_update(encoded):
+        return True, make_password(raw_password)
+    return True, None
+
+
+def verify_password(user, raw_password):
+    """
+    해싱 풀에서 비밀번호를 검증하고, 재해싱된 경우 password 컬럼만 저장
+    - 풀이 가득 찼거나 HASH_TIMEOUT 안에 끝나지 않으면 Overloaded
+    """
+    future = get_pool().submit(_verify, raw_password, user.password)
+    try:
+        ok, rehashed = future.result(timeout=_settings().get('HASH_TIMEOUT', 5))
+    except FutureTimeout:
+        raise Overloaded(_settings().get('RETRY_AFTER', 2))
+    if rehashed:
+        user.password = rehashed
+        user.save(update_fields=['password'])
+    return ok
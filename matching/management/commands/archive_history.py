@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from matching import archive
+
+class Command(BaseCommand):
+    help = 'Move finished requests (and their proposals) older than settings.ARCHIVE["AFTER"] into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, help='Requests moved per transaction (default: settings.ARCHIVE["CHUNK_SIZE"])')
+        parser.add_argument('--dry-run', action='store_true', help='Only count archivable rows')
+
+    def handle(self, *args, **options):
+        result = archive.archive_finished(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        verb = 'Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {result["requests"]} requests and {result["proposals"]} proposals.'
+        ))
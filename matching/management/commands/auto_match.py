@@ -0,0 +1,44 @@
+import time
+from django.core.management.base import BaseCommand
+from matching import automatch
+
+class Command(BaseCommand):
+    help = 'Assign eligible helpers to waiting requests for upcoming games as suggested proposals'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=3, help='Match games within this many days (default: 3)')
+        parser.add_argument('--dry-run', action='store_true', help='Solve without writing proposals')
+        parser.add_argument(
+            '--benchmark', type=int, metavar='REQUESTS',
+            help='Time the solver on a synthetic dataset of REQUESTS requests and 10x helpers (no DB access)',
+        )
+
+    def handle(self, *args, **options):
+        if options['benchmark']:
+            return self.benchmark(options['benchmark'])
+
+        started = time.perf_counter()
+        summary = automatch.run(days=options['days'], dry_run=options['dry_run'])
+        for day in summary:
+            self.stdout.write(f"{day['date']}: {day['assigned']}/{day['requests']} requests assigned")
+        total = sum(day['assigned'] for day in summary)
+        verb = 'Would create' if options['dry_run'] else 'Created'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {total} suggested proposals in {time.perf_counter() - started:.2f}s'
+        ))
+
+    def benchmark(self, n_requests):
+        n_helpers = n_requests * 10
+        problem = automatch.synthetic_problem(n_requests, n_helpers)
+
+        started = time.perf_counter()
+        cost = automatch.build_costs(*problem)
+        built = time.perf_counter()
+        pairs = automatch.assign(cost)
+        solved = time.perf_counter()
+
+        solver = 'scipy' if automatch.linear_sum_assignment is not None else 'numpy'
+        self.stdout.write(f'{n_requests} requests x {n_helpers} helpers ({n_requests * n_helpers:,} pairs), solver={solver}')
+        self.stdout.write(f'  cost matrix: {built - started:.3f}s')
+        self.stdout.write(f'  assignment:  {solved - built:.3f}s ({len(pairs)} assigned)')
+        self.stdout.write(self.style.SUCCESS(f'Total {solved - started:.3f}s'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from matching.models import Proposal
+from matching import pricing
+
+FIELDS = ['priceKrw', 'pricePerTicket', 'seatSection', 'seatZone']
+
+class Command(BaseCommand):
+    help = 'Parse free-text Proposal.totalPrice/seatType into the structured price and seat columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--all', action='store_true', help='Re-parse proposals that already have a price')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Proposal.objects.all() if options['all'] else Proposal.objects.filter(priceKrw__isnull=True)
+        rows = queryset.order_by('pk').values_list(
+            'proposalId', 'seatType', 'totalPrice', 'requestId__numberOfTickets'
+        ).iterator(chunk_size=batch_size)
+
+        batch = []
+        scanned = parsed = 0
+        for proposal_id, seat_type, total_price, tickets in rows:
+            scanned += 1
+            fields = pricing.structured_fields(seat_type, total_price, tickets)
+            if fields['priceKrw'] is not None:
+                parsed += 1
+            batch.append(Proposal(proposalId=proposal_id, **fields))
+            if len(batch) >= batch_size:
+                Proposal.objects.bulk_update(batch, FIELDS)
+                batch = []
+        if batch:
+            Proposal.objects.bulk_update(batch, FIELDS)
+
+        self.stdout.write(self.style.SUCCESS(f'Scanned {scanned} proposals, parsed a price for {parsed}.'))
@@ -0,0 +1,49 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from matching import login
+
+class Command(BaseCommand):
+    help = 'Simulate a login storm against the password hashing pool (no DB access) and report latency/backpressure'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=200, help='Total login attempts (default: 200)')
+        parser.add_argument('--concurrency', type=int, default=32, help='Simultaneous clients (default: 32)')
+        parser.add_argument('--workers', type=int, help='Hashing threads (default: settings.LOGIN HASH_WORKERS)')
+        parser.add_argument('--queue', type=int, help='Queued hashes before 503 (default: settings.LOGIN HASH_QUEUE)')
+
+    def handle(self, *args, **options):
+        settings = login._settings()
+        workers = options['workers'] or settings.get('HASH_WORKERS', 4)
+        queue = options['queue'] if options['queue'] is not None else settings.get('HASH_QUEUE', 16)
+        pool = login.HashingPool(workers, queue)
+        encoded = make_password('benchmark-password')
+
+        def attempt(_):
+            started = time.perf_counter()
+            try:
+                pool.submit(login._verify, 'benchmark-password', encoded).result()
+            except login.Overloaded:
+                return None
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as clients:
+            results = list(clients.map(attempt, range(options['logins'])))
+        elapsed = time.perf_counter() - started
+        pool.executor.shutdown()
+
+        latencies = sorted(result for result in results if result is not None)
+        rejected = len(results) - len(latencies)
+        self.stdout.write(
+            f"{options['logins']} logins, {options['concurrency']} clients, "
+            f"{workers} hash workers + {queue} queued, PBKDF2 {login.ConfigurablePBKDF2PasswordHasher().iterations:,} iterations"
+        )
+        if latencies:
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.stdout.write(f'  accepted: {len(latencies)} (median {statistics.median(latencies) * 1000:.0f}ms, p95 {p95 * 1000:.0f}ms)')
+        self.stdout.write(f'  rejected with 503: {rejected}')
+        self.stdout.write(self.style.SUCCESS(f'Total {elapsed:.2f}s, {len(latencies) / elapsed:.1f} logins/s'))
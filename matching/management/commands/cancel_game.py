@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from matching.models import Game
+from matching import games
+
+class Command(BaseCommand):
+    help = 'Cancel a game (e.g. rain-out) or move it to a rescheduled game, cascading to its requests and proposals'
+
+    def add_arguments(self, parser):
+        parser.add_argument('game_id', type=int)
+        parser.add_argument('--reschedule-to', type=int, help='gameId of the rescheduled game')
+        parser.add_argument('--reason', default='')
+
+    def handle(self, *args, **options):
+        try:
+            game = Game.objects.get(pk=options['game_id'])
+            reschedule_to = Game.objects.get(pk=options['reschedule_to']) if options['reschedule_to'] else None
+        except Game.DoesNotExist as e:
+            raise CommandError(str(e))
+        if reschedule_to is not None:
+            if reschedule_to.pk == game.pk:
+                raise CommandError('--reschedule-to must be a different game')
+            if reschedule_to.status != 'SCHEDULED':
+                raise CommandError(f'Game {reschedule_to.pk} is {reschedule_to.status}, not SCHEDULED')
+
+        try:
+            result = games.cancel_game(game, reschedule_to=reschedule_to, reason=options['reason'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        action = f'moved to game {reschedule_to.pk}' if reschedule_to else 'cancelled'
+        self.stdout.write(self.style.SUCCESS(
+            f'Game {game.pk} {action}: {result["requests"]} requests, '
+            f'{result["proposals"]} proposals, {result["events"]} events.'
+        ))
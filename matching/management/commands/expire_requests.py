@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from matching import expiry
+
+class Command(BaseCommand):
+    help = 'Expire WAITING_FOR_HELPER/TICKET_PROPOSED requests whose game has already started (run periodically, e.g. cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, help='Rows per UPDATE (default: settings.EXPIRY_CHUNK_SIZE)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count stale requests')
+
+    def handle(self, *args, **options):
+        result = expiry.expire_stale(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f'{result["requests"]} stale requests would be expired.')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Expired {result["requests"]} requests and cancelled {result["proposals"]} open proposals.'
+        ))
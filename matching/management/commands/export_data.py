@@ -0,0 +1,39 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from matching import exports
+
+class Command(BaseCommand):
+    help = 'Stream requests, proposals or user mileage to a CSV/NDJSON file (or stdout)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=sorted(exports.EXPORTS))
+        parser.add_argument('--format', choices=exports.FORMATS, default='csv')
+        parser.add_argument('--output', help='File path (default: stdout)')
+        parser.add_argument('--from', dest='date_from', help='YYYY-MM-DD')
+        parser.add_argument('--to', dest='date_to', help='YYYY-MM-DD')
+        parser.add_argument('--status')
+        parser.add_argument('--gzip', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['gzip'] and not options['output']:
+            raise CommandError('--gzip requires --output')
+        try:
+            date_from, date_to = exports.date_range({'from': options['date_from'], 'to': options['date_to']})
+        except ValueError:
+            raise CommandError('--from/--to must be YYYY-MM-DD')
+
+        chunks = exports.stream(
+            options['name'], options['format'], options['gzip'],
+            date_from=date_from, date_to=date_to, status=options['status'],
+        )
+        if not options['output']:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            return
+
+        written = 0
+        with open(options['output'], 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        self.stderr.write(self.style.SUCCESS(f'Wrote {written} bytes to {options["output"]}'))
@@ -0,0 +1,83 @@
+import csv
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from matching import leaderboard
+from matching.models import User, Team
+
+ROLES = {role for role, _ in User.ROLE_CHOICES}
+
+class Command(BaseCommand):
+    help = ('Bulk-create users and their profiles from a CSV file '
+            '(columns: phone,name,role[,password,nickname,favorite_team]; empty password = unusable)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row')
+        parser.add_argument('--batch-size', type=int, default=500, help='Users per bulk_create round')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, do not write')
+
+    def handle(self, *args, **options):
+        # 관심 구단은 팀 id 또는 팀명
+        teams = {}
+        for team in Team.objects.all():
+            teams[str(team.pk)] = teams[team.name] = team
+
+        try:
+            f = open(options['path'], newline='', encoding='utf-8-sig')
+        except OSError as e:
+            raise CommandError(f'Cannot open {options["path"]}: {e}')
+        created = skipped = 0
+        seen = set()
+        with f:
+            reader = csv.DictReader(f)
+            missing = {'phone', 'name', 'role'} - set(reader.fieldnames or ())
+            if missing:
+                raise CommandError(f'Missing columns: {", ".join(sorted(missing))}')
+            rows = enumerate(reader, start=2)
+            while True:
+                batch = list(islice(rows, options['batch_size']))
+                if not batch:
+                    break
+                for _, row in batch:
+                    row['phone'] = User.objects.normalize_phone(row.get('phone'))
+                existing = set(
+                    User.objects.filter(phone__in=[row['phone'] for _, row in batch]).values_list('phone', flat=True)
+                )
+                valid = []
+                for line, row in batch:
+                    error = self._validate(row, existing | seen, teams)
+                    if error:
+                        self.stderr.write(f'line {line}: {error}')
+                        skipped += 1
+                        continue
+                    seen.add(row['phone'])
+                    valid.append({
+                        'phone': row['phone'],
+                        'name': row['name'],
+                        'role': row['role'],
+                        'password': row.get('password') or None,
+                        'profile': {
+                            'nickname': row.get('nickname') or '',
+                            'favorite_team': teams.get(row.get('favorite_team') or ''),
+                        },
+                    })
+                if valid and not options['dry_run']:
+                    User.objects.bulk_create_users(valid, batch_size=options['batch_size'])
+                created += len(valid)
+
+        if created and not options['dry_run']:
+            # bulk_create 는 post_save 를 보내지 않으므로 직접 무효화
+            leaderboard.invalidate()
+        verb = 'Would create' if options['dry_run'] else 'Created'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {created} users ({skipped} rows skipped).'))
+
+    def _validate(self, row, taken, teams):
+        if not row.get('phone') or not row.get('name'):
+            return 'phone and name are required'
+        if row['role'] not in ROLES:
+            return f'unknown role {row["role"]!r}'
+        if row['phone'] in taken:
+            return f'phone {row["phone"]} already exists'
+        if row.get('favorite_team') and row['favorite_team'] not in teams:
+            return f'unknown team {row["favorite_team"]!r}'
+        return None
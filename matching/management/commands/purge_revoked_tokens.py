@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from matching import revocation
+
+class Command(BaseCommand):
+    help = 'Delete revoked refresh-token entries whose tokens have already expired'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Rows per DELETE (default: settings.REVOCATION PURGE_BATCH_SIZE)')
+
+    def handle(self, *args, **options):
+        deleted = revocation.purge(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Purged {deleted} expired revoked tokens.'))
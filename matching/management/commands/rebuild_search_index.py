@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from matching import search
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index (SearchTerm) for teams, request notes and proposal messages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Documents indexed per DELETE/INSERT round')
+
+    def handle(self, *args, **options):
+        counts = search.rebuild(chunk_size=options['chunk_size'])
+        summary = ', '.join(f'{count} {name}s' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Indexed {summary}.'))
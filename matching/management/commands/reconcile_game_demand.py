@@ -0,0 +1,20 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from matching import demand
+
+class Command(BaseCommand):
+    help = 'Recount per-game demand counters (GameDemand) from the request/proposal tables and fix any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='from_date', help='Only games on or after this date (YYYY-MM-DD, default: today)')
+
+    def handle(self, *args, **options):
+        from_date = None
+        if options['from_date']:
+            try:
+                from_date = date.fromisoformat(options['from_date'])
+            except ValueError:
+                raise CommandError('--from must be YYYY-MM-DD')
+        fixed = demand.reconcile(from_date)
+        self.stdout.write(self.style.SUCCESS(f'Reconciled demand counters for {fixed} games.'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from matching import outbox
+
+class Command(BaseCommand):
+    help = 'Deliver OutboxEvent rows to the configured sinks (settings.OUTBOX["SINKS"]) using a thread pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Delivery threads (default: settings.OUTBOX["WORKERS"])')
+        parser.add_argument('--batch-size', type=int, help='Events claimed per batch (default: settings.OUTBOX["BATCH_SIZE"])')
+        parser.add_argument('--poll-interval', type=float, help='Seconds to wait when the outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Drain pending events and exit instead of polling')
+        parser.add_argument('--requeue-dead', action='store_true',
+                            help='Reset attempts of events that hit OUTBOX["MAX_ATTEMPTS"] so they are delivered again')
+
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            self.stdout.write(f'Requeued {outbox.requeue_dead()} dead-lettered events.')
+        totals = outbox.run(
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            once=options['once'],
+            poll_interval=options['poll_interval'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Delivered {totals["delivered"]} events, {totals["failed"]} failed, {totals["dead"]} dead-lettered.'
+        ))
+        stranded = outbox.dead_lettered().count()
+        if stranded:
+            self.stderr.write(f'{stranded} dead-lettered events are waiting; fix the sink and rerun with --requeue-dead.')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from matching import funnel
+
+class Command(BaseCommand):
+    help = 'Fold new StatusEvent rows (after the last watermark) into the daily/per-game funnel rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Events per transaction (default: settings.FUNNEL_BATCH_SIZE)')
+        parser.add_argument('--rebuild', action='store_true', help='Clear the rollups and recompute from the first event')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            processed = funnel.rebuild()
+        else:
+            processed = funnel.update_rollups(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} status events.'))
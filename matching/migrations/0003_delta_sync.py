@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0002_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('request', '요청'), ('proposal', '제안')], max_length=10)),
+                ('objectId', models.IntegerField()),
+                ('ownerId', models.BigIntegerField(verbose_name='소유자 id')),
+                ('deletedAt', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['helperId', 'updatedAt'], name='proposal_helper_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['userId', 'updatedAt'], name='request_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['status', 'updatedAt'], name='request_status_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['updatedAt'], name='request_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['kind', 'ownerId', 'deletedAt'], name='tombstone_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['kind', 'deletedAt'], name='tombstone_kind_idx'),
+        ),
+    ]
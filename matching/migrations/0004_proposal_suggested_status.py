@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0003_delta_sync'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='proposal',
+            name='status',
+            field=models.CharField(choices=[('pending', '대기중'), ('accepted', '수락됨'), ('rejected', '거절됨'), ('suggested', '자동 매칭 제안')], default='pending', max_length=20, verbose_name='상태'),
+        ),
+    ]
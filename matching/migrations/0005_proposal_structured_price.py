@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0004_proposal_suggested_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proposal',
+            name='priceKrw',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='총 가격(원)'),
+        ),
+        migrations.AddField(
+            model_name='proposal',
+            name='pricePerTicket',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='장당 가격(원)'),
+        ),
+        migrations.AddField(
+            model_name='proposal',
+            name='seatSection',
+            field=models.CharField(blank=True, max_length=20, verbose_name='좌석 구역'),
+        ),
+        migrations.AddField(
+            model_name='proposal',
+            name='seatZone',
+            field=models.CharField(blank=True, max_length=50, verbose_name='좌석 존'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['requestId', 'priceKrw'], name='proposal_request_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['requestId', 'pricePerTicket'], name='proposal_request_ppt_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:40
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0005_proposal_structured_price'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='rescheduledTo',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='matching.game', verbose_name='재편성 경기'),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='status',
+            field=models.CharField(choices=[('SCHEDULED', '예정'), ('POSTPONED', '연기 (재편성)'), ('CANCELLED', '취소')], default='SCHEDULED', max_length=20, verbose_name='경기 상태'),
+        ),
+        migrations.AlterField(
+            model_name='proposal',
+            name='status',
+            field=models.CharField(choices=[('pending', '대기중'), ('accepted', '수락됨'), ('rejected', '거절됨'), ('suggested', '자동 매칭 제안'), ('cancelled', '경기 취소/연기로 취소됨')], default='pending', max_length=20, verbose_name='상태'),
+        ),
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=50)),
+                ('recipientId', models.BigIntegerField(blank=True, null=True)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+                ('processedAt', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['processedAt', 'id'], name='outbox_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0006_game_cancellation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='proposal',
+            name='status',
+            field=models.CharField(choices=[('pending', '대기중'), ('accepted', '수락됨'), ('rejected', '거절됨'), ('suggested', '자동 매칭 제안'), ('cancelled', '취소됨')], default='pending', max_length=20, verbose_name='상태'),
+        ),
+        migrations.AlterField(
+            model_name='request',
+            name='status',
+            field=models.CharField(choices=[('WAITING_FOR_HELPER', '헬퍼 배정 대기 중'), ('HELPER_MATCHED', '헬퍼 매칭! 티켓 찾는 중'), ('TICKET_PROPOSED', '헬퍼가 티켓을 찾았어요!'), ('SEAT_CONFIRMED', '좌석 확정! 경기 당일 만나요'), ('COMPLETED', '관람 완료'), ('CANCELLED', '요청 취소됨'), ('EXPIRED', '경기 시작으로 만료됨')], default='WAITING_FOR_HELPER', max_length=50, verbose_name='상태'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['date', 'time'], name='game_date_time_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0007_request_expiry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRequest',
+            fields=[
+                ('requestId', models.IntegerField(primary_key=True, serialize=False)),
+                ('accompanyType', models.CharField(choices=[('with', '함께 관람'), ('ticket_only', '티켓만 전달')], max_length=20, verbose_name='동행 유형')),
+                ('additionalInfo', models.TextField(blank=True, verbose_name='추가 정보')),
+                ('status', models.CharField(choices=[('WAITING_FOR_HELPER', '헬퍼 배정 대기 중'), ('HELPER_MATCHED', '헬퍼 매칭! 티켓 찾는 중'), ('TICKET_PROPOSED', '헬퍼가 티켓을 찾았어요!'), ('SEAT_CONFIRMED', '좌석 확정! 경기 당일 만나요'), ('COMPLETED', '관람 완료'), ('CANCELLED', '요청 취소됨'), ('EXPIRED', '경기 시작으로 만료됨')], max_length=50, verbose_name='상태')),
+                ('numberOfTickets', models.IntegerField(verbose_name='티켓 수량')),
+                ('createdAt', models.DateTimeField()),
+                ('updatedAt', models.DateTimeField()),
+                ('archivedAt', models.DateTimeField(auto_now_add=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_requests', to='matching.game')),
+                ('userId', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_requests', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedProposal',
+            fields=[
+                ('proposalId', models.IntegerField(primary_key=True, serialize=False)),
+                ('seatType', models.CharField(max_length=100, verbose_name='좌석 정보')),
+                ('totalPrice', models.CharField(max_length=50, verbose_name='총 가격')),
+                ('message', models.TextField(blank=True, verbose_name='메시지')),
+                ('priceKrw', models.PositiveIntegerField(blank=True, null=True, verbose_name='총 가격(원)')),
+                ('pricePerTicket', models.PositiveIntegerField(blank=True, null=True, verbose_name='장당 가격(원)')),
+                ('seatSection', models.CharField(blank=True, max_length=20, verbose_name='좌석 구역')),
+                ('seatZone', models.CharField(blank=True, max_length=50, verbose_name='좌석 존')),
+                ('status', models.CharField(choices=[('pending', '대기중'), ('accepted', '수락됨'), ('rejected', '거절됨'), ('suggested', '자동 매칭 제안'), ('cancelled', '취소됨')], max_length=20, verbose_name='상태')),
+                ('createdAt', models.DateTimeField()),
+                ('updatedAt', models.DateTimeField()),
+                ('archivedAt', models.DateTimeField(auto_now_add=True)),
+                ('helperId', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_proposals', to=settings.AUTH_USER_MODEL)),
+                ('requestId', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='proposals', to='matching.archivedrequest')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedrequest',
+            index=models.Index(fields=['userId', 'createdAt'], name='archived_request_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedproposal',
+            index=models.Index(fields=['helperId', 'createdAt'], name='archived_proposal_helper_idx'),
+        ),
+    ]
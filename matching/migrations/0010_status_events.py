@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0009_outbox_worker'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.PositiveSmallIntegerField()),
+                ('objectId', models.BigIntegerField()),
+                ('requestId', models.BigIntegerField()),
+                ('toStatus', models.PositiveSmallIntegerField()),
+                ('actorId', models.BigIntegerField(blank=True, null=True)),
+                ('at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['requestId', 'kind', 'toStatus', 'at'], name='status_event_request_idx'), models.Index(fields=['kind', 'toStatus', 'at'], name='status_event_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0010_status_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyFunnel',
+            fields=[
+                ('requestsCreated', models.PositiveIntegerField(default=0)),
+                ('proposalsMade', models.PositiveIntegerField(default=0)),
+                ('matches', models.PositiveIntegerField(default=0)),
+                ('completions', models.PositiveIntegerField(default=0)),
+                ('cancellations', models.PositiveIntegerField(default=0)),
+                ('expirations', models.PositiveIntegerField(default=0)),
+                ('medianTimeToMatch', models.FloatField(blank=True, null=True, verbose_name='매칭까지 걸린 시간 중앙값(초)')),
+                ('day', models.DateField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='GameFunnel',
+            fields=[
+                ('requestsCreated', models.PositiveIntegerField(default=0)),
+                ('proposalsMade', models.PositiveIntegerField(default=0)),
+                ('matches', models.PositiveIntegerField(default=0)),
+                ('completions', models.PositiveIntegerField(default=0)),
+                ('cancellations', models.PositiveIntegerField(default=0)),
+                ('expirations', models.PositiveIntegerField(default=0)),
+                ('medianTimeToMatch', models.FloatField(blank=True, null=True, verbose_name='매칭까지 걸린 시간 중앙값(초)')),
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='funnel', serialize=False, to='matching.game')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('lastEventId', models.BigIntegerField(default=0)),
+                ('updatedAt', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0012_user_mileage_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameDemand',
+            fields=[
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='demand', serialize=False, to='matching.game')),
+                ('waitingRequests', models.IntegerField(default=0)),
+                ('waitingTickets', models.IntegerField(default=0)),
+                ('proposedRequests', models.IntegerField(default=0)),
+                ('proposedTickets', models.IntegerField(default=0)),
+                ('openProposals', models.IntegerField(default=0)),
+                ('updatedAt', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
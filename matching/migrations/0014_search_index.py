@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0013_game_demand'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('term', models.CharField(max_length=100)),
+                ('kind', models.PositiveSmallIntegerField()),
+                ('objectId', models.IntegerField()),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'kind', 'objectId', 'weight'], name='search_term_idx'), models.Index(fields=['kind', 'objectId'], name='search_term_object_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+import re
+import sys
+
+from django.db import migrations
+
+
+def _normalize(phone):
+    # UserManager.normalize_phone 과 같은 규칙 (마이그레이션에서는 모델 매니저를 import 하지 않음)
+    digits = re.sub(r'\D', '', phone or '')
+    if digits.startswith('82') and len(digits) > 10:
+        digits = '0' + digits[2:]
+    return digits
+
+
+def normalize_phones(apps, schema_editor):
+    """
+    기존 사용자 전화번호를 숫자만 남긴 형태로 정리
+    - 로그인/가입이 정규화된 번호로 조회하므로, 예전 형식('010-1234-5678')으로 저장된 사용자는 로그인할 수 없었음
+    - 정리 후 번호가 다른 사용자와 겹치면 해당 행은 그대로 두고 목록을 출력 (수동 병합 필요)
+    """
+    User = apps.get_model('matching', 'User')
+    db = schema_editor.connection.alias
+    users = User.objects.using(db)
+    taken = set(users.values_list('phone', flat=True))
+    collisions = []
+    for pk, phone in users.order_by('pk').values_list('pk', 'phone').iterator():
+        normalized = _normalize(phone)
+        if not normalized or normalized == phone:
+            continue
+        if normalized in taken:
+            collisions.append((pk, phone, normalized))
+            continue
+        users.filter(pk=pk).update(phone=normalized)
+        taken.discard(phone)
+        taken.add(normalized)
+    if collisions:
+        sys.stdout.write('\n  전화번호가 겹쳐 정리하지 못한 사용자 (id, 기존 번호, 정리된 번호):\n')
+        for row in collisions:
+            sys.stdout.write('    %s %r -> %r\n' % row)
+    return collisions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0016_revoked_tokens'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_phones, migrations.RunPython.noop),
+    ]
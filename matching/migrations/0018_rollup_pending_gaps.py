@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0017_normalize_user_phones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rollupwatermark',
+            name='pendingGaps',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
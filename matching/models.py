@@ -1,18 +1,53 @@
-from django.db import models
+import re
+from django.db import models, transaction
 from django.conf import settings
 from django.contrib.auth.models import BaseUserManager, AbstractBaseUser, PermissionsMixin
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.core.serializers.json import DjangoJSONEncoder
 
 class UserManager(BaseUserManager):
-    def create_user(self, phone, name, role, password=None, **extra_fields):
+    @classmethod
+    def normalize_phone(cls, phone):
+        """'010-1234-5678', '+82 10 1234 5678' → '01012345678' (숫자가 아닌 문자 제거, 국가번호 82 → 0)"""
+        digits = re.sub(r'\D', '', phone or '')
+        if digits.startswith('82') and len(digits) > 10:
+            digits = '0' + digits[2:]
+        return digits
+
+    def _build(self, phone, name, role, password=None, profile=None, **extra_fields):
+        phone = self.normalize_phone(phone)
         if not phone:
             raise ValueError('사용자는 반드시 전화번호를 가져야 합니다.')
         user = self.model(phone=phone, name=name, role=role, **extra_fields)
         user.set_password(password)
-        user.save(using=self._db)
+        # create_user_profile 시그널이 이 값으로 Profile 을 한 번에 INSERT
+        user._profile_defaults = profile or {}
+        return user
+
+    def create_user(self, phone, name, role, password=None, profile=None, **extra_fields):
+        """
+        사용자 + 프로필 생성 (한 트랜잭션, INSERT 2번)
+        - profile: Profile 필드 초기값 (nickname, favorite_team 등)
+        """
+        user = self._build(phone, name, role, password, profile, **extra_fields)
+        with transaction.atomic(using=self._db):
+            user.save(using=self._db)
         return user
 
+    def bulk_create_users(self, rows, batch_size=500):
+        """
+        create_user 와 같은 인자(dict)의 목록으로 사용자 + 프로필 일괄 생성 (bulk_create 2번)
+        - post_save 시그널은 보내지 않으므로 필요한 후처리는 호출한 쪽에서
+        """
+        users = [self._build(**row) for row in rows]
+        with transaction.atomic(using=self._db):
+            self.bulk_create(users, batch_size=batch_size)
+            Profile.objects.using(self._db).bulk_create(
+                [Profile(user=user, **user._profile_defaults) for user in users], batch_size=batch_size,
+            )
+        return users
+
     def create_superuser(self, phone, name, role, password=None, **extra_fields):
         extra_fields.setdefault('is_staff', True)
         extra_fields.setdefault('is_superuser', True)
@@ -30,6 +65,15 @@ class User(AbstractBaseUser, PermissionsMixin):
     objects = UserManager()
     USERNAME_FIELD = 'phone'
     REQUIRED_FIELDS = ['name', 'role']
+
+    class Meta:
+        indexes = [
+            # 헬퍼 리더보드 상위 N명 / 순위 계산 (mileagePoints 가 더 큰 헬퍼 수)
+            models.Index(fields=['role', 'mileagePoints'], name='user_role_mileage_idx'),
+            # 관리자 접두어 검색 (Postgres 에서 LIKE 'x%' 가 인덱스를 타도록 pattern_ops)
+            models.Index(fields=['name'], name='user_name_prefix_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['phone'], name='user_phone_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.get_role_display()})"
@@ -45,13 +89,9 @@ class Profile(models.Model):
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
+    # 프로필은 가입 시 한 번만 만들고, 이후 수정은 UserProfileSerializer 가 바뀐 필드만 저장
     if created:
-        Profile.objects.create(user=instance)
-
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
+        Profile.objects.create(user=instance, **getattr(instance, '_profile_defaults', {}))
 
 class Team(models.Model):
     teamId = models.AutoField(primary_key=True)
@@ -63,12 +103,25 @@ class Team(models.Model):
         return self.name
 
 class Game(models.Model):
+    GAME_STATUS_CHOICES = (
+        ('SCHEDULED', '예정'),
+        ('POSTPONED', '연기 (재편성)'),
+        ('CANCELLED', '취소'),
+    )
+
     gameId = models.AutoField(primary_key=True)
     date = models.DateField(verbose_name="경기일")
     time = models.TimeField(verbose_name="경기 시간")
     homeTeam = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="home_games")
     awayTeam = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="away_games")
     stadium = models.CharField(max_length=100, verbose_name="경기장")
+    status = models.CharField(max_length=20, choices=GAME_STATUS_CHOICES, default='SCHEDULED', verbose_name="경기 상태")
+    rescheduledTo = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name="+", verbose_name="재편성 경기")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'time'], name='game_date_time_idx'),
+        ]
     
     def __str__(self):
         return f"{self.homeTeam.name} vs {self.awayTeam.name} ({self.date})"
@@ -81,6 +134,7 @@ class Request(models.Model):
         ('SEAT_CONFIRMED', '좌석 확정! 경기 당일 만나요'),
         ('COMPLETED', '관람 완료'),
         ('CANCELLED', '요청 취소됨'),
+        ('EXPIRED', '경기 시작으로 만료됨'),
     )
     ACCOMPANY_TYPE_CHOICES = (
         ('with', '함께 관람'), 
@@ -96,6 +150,14 @@ class Request(models.Model):
     numberOfTickets = models.IntegerField(default=1, verbose_name="티켓 수량")
     createdAt = models.DateTimeField(auto_now_add=True)
     updatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # 델타 동기화: 내 요청 / 도움 요청 피드 / 피드에서 빠진 요청
+            models.Index(fields=['userId', 'updatedAt'], name='request_user_updated_idx'),
+            models.Index(fields=['status', 'updatedAt'], name='request_status_updated_idx'),
+            models.Index(fields=['updatedAt'], name='request_updated_idx'),
+        ]
     
     def __str__(self):
         return f"[{self.get_status_display()}] {self.userId.name} - {self.game}"
@@ -105,6 +167,8 @@ class Proposal(models.Model):
         ('pending', '대기중'), 
         ('accepted', '수락됨'), 
         ('rejected', '거절됨'), 
+        ('suggested', '자동 매칭 제안'),
+        ('cancelled', '취소됨'),
     )
     
     proposalId = models.AutoField(primary_key=True)
@@ -113,9 +177,257 @@ class Proposal(models.Model):
     seatType = models.CharField(max_length=100, verbose_name="좌석 정보", default="좌석 정보 없음")
     totalPrice = models.CharField(max_length=50, verbose_name="총 가격", default="가격 정보 없음")
     message = models.TextField(blank=True, verbose_name="메시지")
+    # seatType/totalPrice 자유 입력을 정렬/집계 가능하게 파싱한 값 (matching.pricing)
+    priceKrw = models.PositiveIntegerField(null=True, blank=True, verbose_name="총 가격(원)")
+    pricePerTicket = models.PositiveIntegerField(null=True, blank=True, verbose_name="장당 가격(원)")
+    seatSection = models.CharField(max_length=20, blank=True, verbose_name="좌석 구역")
+    seatZone = models.CharField(max_length=50, blank=True, verbose_name="좌석 존")
     status = models.CharField(max_length=20, choices=PROPOSAL_STATUS_CHOICES, default='pending', verbose_name="상태")
     createdAt = models.DateTimeField(auto_now_add=True)
     updatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['helperId', 'updatedAt'], name='proposal_helper_updated_idx'),
+            # 요청별 제안 가격순 정렬/필터, 경기별 가격 통계
+            models.Index(fields=['requestId', 'priceKrw'], name='proposal_request_price_idx'),
+            models.Index(fields=['requestId', 'pricePerTicket'], name='proposal_request_ppt_idx'),
+        ]
     
     def __str__(self):
         return f"[{self.get_status_display()}] {self.helperId.name} -> {self.requestId}"
+
+class Tombstone(models.Model):
+    """
+    삭제된 Request/Proposal 기록 (델타 동기화에서 removed 로 내려주기 위함)
+    - 사용자 삭제 후에도 남도록 FK 대신 id 만 저장
+    """
+    KIND_CHOICES = (
+        ('request', '요청'),
+        ('proposal', '제안'),
+    )
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    objectId = models.IntegerField()
+    ownerId = models.BigIntegerField(verbose_name="소유자 id")
+    deletedAt = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'ownerId', 'deletedAt'], name='tombstone_owner_idx'),
+            models.Index(fields=['kind', 'deletedAt'], name='tombstone_kind_idx'),
+        ]
+
+class IdempotencyKey(models.Model):
+    """
+    Idempotency-Key 헤더로 들어온 POST 의 첫 응답을 저장해 재시도 시 그대로 재생
+    - responseStatus 가 비어 있으면 아직 처리 중인 요청
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    key = models.CharField(max_length=64)
+    fingerprint = models.CharField(max_length=64, verbose_name="메서드+경로 해시")
+    responseStatus = models.PositiveSmallIntegerField(null=True)
+    responseBody = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    createdAt = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='uniq_idempotency_user_key'),
+        ]
+
+class OutboxEvent(models.Model):
+    """
+    알림 등 부수 효과를 위한 이벤트 (상태 변경과 같은 트랜잭션에서 기록)
+    - recipientId: 알림 받을 사용자 id (없으면 시스템 이벤트)
+    - claimedAt/claimToken: 워커가 잡아간 시각과 배치 식별자 (OUTBOX['LEASE'] 가 지나면 다시 잡을 수 있음)
+    - 전달에 성공하면 processedAt 기록, 실패하면 lastError 를 남기고 attempts 가 MAX_ATTEMPTS 가 될 때까지 재시도
+    """
+    topic = models.CharField(max_length=50)
+    recipientId = models.BigIntegerField(null=True, blank=True)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    createdAt = models.DateTimeField(auto_now_add=True)
+    processedAt = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    claimedAt = models.DateTimeField(null=True, blank=True)
+    claimToken = models.CharField(max_length=32, blank=True, db_index=True)
+    lastError = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['processedAt', 'id'], name='outbox_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"[{self.topic}] -> {self.recipientId}"
+
+
+class ArchivedRequest(models.Model):
+    """
+    완료/취소/만료된 지 오래된 요청 보관 테이블 (archive_history 명령이 Request 에서 옮김)
+    - requestId 는 원래 값을 그대로 사용
+    """
+    requestId = models.IntegerField(primary_key=True)
+    userId = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="archived_requests")
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="archived_requests")
+    accompanyType = models.CharField(max_length=20, choices=Request.ACCOMPANY_TYPE_CHOICES, verbose_name="동행 유형")
+    additionalInfo = models.TextField(blank=True, verbose_name="추가 정보")
+    status = models.CharField(max_length=50, choices=Request.REQUEST_STATUS_CHOICES, verbose_name="상태")
+    numberOfTickets = models.IntegerField(verbose_name="티켓 수량")
+    createdAt = models.DateTimeField()
+    updatedAt = models.DateTimeField()
+    archivedAt = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['userId', 'createdAt'], name='archived_request_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"[보관][{self.get_status_display()}] {self.requestId}"
+
+
+class ArchivedProposal(models.Model):
+    """보관된 요청의 제안 (요청과 함께 옮겨짐, proposalId 는 원래 값)"""
+    proposalId = models.IntegerField(primary_key=True)
+    requestId = models.ForeignKey(ArchivedRequest, on_delete=models.CASCADE, related_name="proposals")
+    helperId = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="archived_proposals")
+    seatType = models.CharField(max_length=100, verbose_name="좌석 정보")
+    totalPrice = models.CharField(max_length=50, verbose_name="총 가격")
+    message = models.TextField(blank=True, verbose_name="메시지")
+    priceKrw = models.PositiveIntegerField(null=True, blank=True, verbose_name="총 가격(원)")
+    pricePerTicket = models.PositiveIntegerField(null=True, blank=True, verbose_name="장당 가격(원)")
+    seatSection = models.CharField(max_length=20, blank=True, verbose_name="좌석 구역")
+    seatZone = models.CharField(max_length=50, blank=True, verbose_name="좌석 존")
+    status = models.CharField(max_length=20, choices=Proposal.PROPOSAL_STATUS_CHOICES, verbose_name="상태")
+    createdAt = models.DateTimeField()
+    updatedAt = models.DateTimeField()
+    archivedAt = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['helperId', 'createdAt'], name='archived_proposal_helper_idx'),
+        ]
+
+    def __str__(self):
+        return f"[보관][{self.get_status_display()}] {self.proposalId}"
+
+
+class StatusEvent(models.Model):
+    """
+    요청/제안 상태 변경 이력 (append-only, matching.events 가 기록)
+    - kind: 1 요청, 2 제안 / toStatus: matching.events.STATUS_CODES 의 정수 코드
+    - requestId: 요청 이력이면 objectId 와 같고, 제안 이력이면 그 제안의 요청 (요청 단위 집계용)
+    - 원본 행이 보관/삭제되어도 이력은 남도록 FK 대신 정수 id 저장
+    """
+    id = models.BigAutoField(primary_key=True)
+    kind = models.PositiveSmallIntegerField()
+    objectId = models.BigIntegerField()
+    requestId = models.BigIntegerField()
+    toStatus = models.PositiveSmallIntegerField()
+    actorId = models.BigIntegerField(null=True, blank=True)
+    at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # 요청별 첫 제안/매칭 시각 집계가 인덱스만 읽도록
+            models.Index(fields=['requestId', 'kind', 'toStatus', 'at'], name='status_event_request_idx'),
+            models.Index(fields=['kind', 'toStatus', 'at'], name='status_event_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.objectId} -> {self.toStatus}"
+
+
+class FunnelCounts(models.Model):
+    """퍼널 집계 공통 컬럼 (matching.funnel 이 StatusEvent 에서 증분 갱신)"""
+    requestsCreated = models.PositiveIntegerField(default=0)
+    proposalsMade = models.PositiveIntegerField(default=0)
+    matches = models.PositiveIntegerField(default=0)
+    completions = models.PositiveIntegerField(default=0)
+    cancellations = models.PositiveIntegerField(default=0)
+    expirations = models.PositiveIntegerField(default=0)
+    medianTimeToMatch = models.FloatField(null=True, blank=True, verbose_name="매칭까지 걸린 시간 중앙값(초)")
+
+    class Meta:
+        abstract = True
+
+
+class DailyFunnel(FunnelCounts):
+    """일별 퍼널 (이벤트 발생일 기준)"""
+    day = models.DateField(primary_key=True)
+
+
+class GameFunnel(FunnelCounts):
+    """경기별 퍼널"""
+    game = models.OneToOneField(Game, on_delete=models.CASCADE, primary_key=True, related_name="funnel")
+
+
+class RollupWatermark(models.Model):
+    """
+    증분 집계가 어디까지 반영했는지 (StatusEvent id 기준)
+    - pendingGaps: lastEventId 아래에서 아직 보이지 않은 id 구간 [[시작, 끝, 발견 시각(epoch 초)], ...]
+      (id 는 INSERT 시점에 받으므로 늦게 커밋된 트랜잭션의 이벤트가 나중에 나타날 수 있음)
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    lastEventId = models.BigIntegerField(default=0)
+    pendingGaps = models.JSONField(default=list, blank=True)
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.lastEventId}"
+
+
+class GameDemand(models.Model):
+    """
+    경기별 미충족 수요 카운터 (matching.demand 가 상태 변경마다 증분 갱신, reconcile_game_demand 로 보정)
+    - waiting*: 헬퍼를 기다리는 요청, proposed*: 티켓 제안을 받은 요청
+    - openProposals: 대기/자동 제안 상태의 제안 수
+    """
+    game = models.OneToOneField(Game, on_delete=models.CASCADE, primary_key=True, related_name="demand")
+    waitingRequests = models.IntegerField(default=0)
+    waitingTickets = models.IntegerField(default=0)
+    proposedRequests = models.IntegerField(default=0)
+    proposedTickets = models.IntegerField(default=0)
+    openProposals = models.IntegerField(default=0)
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.game_id}: 대기 {self.waitingRequests} / 제안받음 {self.proposedRequests}"
+
+
+class SearchTerm(models.Model):
+    """
+    검색용 역색인 (matching.search 가 저장 시점에 갱신)
+    - term: 자모로 분해한 토큰 (접두어 검색이 글자 중간에서도 맞도록)
+    - kind/objectId: 원본 (팀, 요청, 제안)
+    """
+    id = models.BigAutoField(primary_key=True)
+    term = models.CharField(max_length=100)
+    kind = models.PositiveSmallIntegerField()
+    objectId = models.IntegerField()
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            # 접두어 범위 검색이 테이블을 읽지 않고 인덱스만으로 끝나도록 조회 컬럼을 모두 포함
+            models.Index(fields=['term', 'kind', 'objectId', 'weight'], name='search_term_idx'),
+            models.Index(fields=['kind', 'objectId'], name='search_term_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} -> {self.kind}:{self.objectId}"
+
+
+class RevokedToken(models.Model):
+    """
+    폐기된 refresh 토큰 (matching.revocation)
+    - 회전(refresh)으로 이미 쓰인 토큰과 로그아웃한 토큰의 jti
+    - 토큰 만료 시각이 지나면 purge_revoked_tokens 명령이 지움
+    """
+    id = models.BigAutoField(primary_key=True)
+    jti = models.CharField(max_length=64, unique=True)
+    expiresAt = models.DateTimeField(db_index=True)
+    revokedAt = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.jti} (~{self.expiresAt})"
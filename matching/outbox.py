@@ -0,0 +1,196 @@
+# matching/outbox.py
+"""
+트랜잭션 아웃박스
+
+뷰는 상태 변경과 같은 트랜잭션 안에서 publish() 로 OutboxEvent 행만 쓰고 바로 응답한다.
+알림 전송, 파생 데이터 갱신 같은 부수 효과는 별도 프로세스(run_outbox_worker 명령)가
+이벤트를 배치로 잡아 스레드 풀에서 sink 들로 전달한다.
+- Postgres 는 SELECT ... FOR UPDATE SKIP LOCKED, SQLite 는 조건부 UPDATE 로 배치를 잡으므로
+  워커를 여러 개 띄워도 같은 이벤트를 동시에 처리하지 않음
+- 전달은 최소 한 번(at-least-once) 이므로 sink 는 같은 이벤트를 다시 받아도 안전해야 함
+- MAX_ATTEMPTS 번 실패한 이벤트는 더 잡지 않고(dead letter) 로그로 남김. 원인을 고친 뒤
+  run_outbox_worker --requeue-dead 로 다시 시도
+"""
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SINKS = ['matching.outbox.LogSink', 'matching.outbox.DerivedDataSink']
+
+
+def _settings():
+    return getattr(settings, 'OUTBOX', {})
+
+
+def publish(topic, recipient_id=None, **payload):
+    """이벤트 기록 (호출한 쪽 트랜잭션이 롤백되면 이벤트도 사라짐)"""
+    return OutboxEvent.objects.create(topic=topic, recipientId=recipient_id, payload=payload)
+
+
+# -------------------- Sinks --------------------
+
+class Sink:
+    """
+    이벤트 전달 대상
+    - topics 가 None 이면 모든 이벤트를 받음
+    - deliver() 에서 예외가 나면 해당 이벤트는 나중에 다시 전달됨
+    - 워커 스레드에서 호출되므로 상태를 공유한다면 스레드 안전해야 함
+    """
+    topics = None
+
+    def accepts(self, topic):
+        return self.topics is None or topic in self.topics
+
+    def deliver(self, event):
+        raise NotImplementedError
+
+
+class LocalSink(Sink):
+    """테스트/개발용: 전달된 이벤트를 프로세스 메모리에 보관"""
+    delivered = []
+
+    def deliver(self, event):
+        LocalSink.delivered.append((event.topic, event.recipientId, event.payload))
+
+
+class LogSink(Sink):
+    """알림 채널이 붙기 전까지 로그로만 남김"""
+
+    def deliver(self, event):
+        logger.info('outbox %s -> %s %s', event.topic, event.recipientId, event.payload)
+
+
+class DerivedDataSink(Sink):
+    """헬퍼의 수락/완료 이력이 바뀌면 추천 특성 캐시를 무효화"""
+    topics = {'proposal.accepted', 'request.seat_confirmed', 'request.completed'}
+
+    def deliver(self, event):
+        helper_id = event.payload.get('helperId')
+        if helper_id:
+            cache.delete(f'reco:features:{helper_id}')
+
+
+def load_sinks(paths=None):
+    return [import_string(path)() for path in (paths or _settings().get('SINKS', DEFAULT_SINKS))]
+
+
+# -------------------- Worker --------------------
+
+def _max_attempts():
+    return _settings().get('MAX_ATTEMPTS', 5)
+
+
+def _claimable(now):
+    lease = _settings().get('LEASE', timedelta(seconds=60))
+    return OutboxEvent.objects.filter(
+        processedAt__isnull=True,
+        attempts__lt=_max_attempts(),
+    ).filter(Q(claimedAt__isnull=True) | Q(claimedAt__lt=now - lease))
+
+
+def dead_lettered():
+    """MAX_ATTEMPTS 번 실패해 더 이상 잡히지 않는 이벤트"""
+    return OutboxEvent.objects.filter(processedAt__isnull=True, attempts__gte=_max_attempts())
+
+
+def requeue_dead():
+    """dead letter 이벤트의 시도 횟수를 초기화해 다시 전달되게 함 (반환값: 개수)"""
+    return dead_lettered().update(attempts=0, claimedAt=None, claimToken='')
+
+
+def _close_stale_connections():
+    # 오래 도는 워커는 요청/응답 주기가 없으므로 끊기거나 CONN_MAX_AGE 가 지난 연결을 직접 정리
+    # (호출한 쪽 트랜잭션 안이면 연결을 닫지 않음)
+    if not connection.in_atomic_block:
+        close_old_connections()
+
+
+def claim(batch_size=None):
+    """
+    아직 처리되지 않은 이벤트를 batch_size 개까지 잡아서 반환
+    - 잡은 행에는 claimedAt, claimToken 을 기록하고 attempts 를 1 올림
+    """
+    batch_size = batch_size or _settings().get('BATCH_SIZE', 100)
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    with transaction.atomic():
+        candidates = _claimable(now).order_by('pk')
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return []
+        # SKIP LOCKED 가 없는 DB 에서는 같은 후보를 본 다른 워커와 경쟁할 수 있으므로
+        # 조건을 다시 건 UPDATE 로 먼저 쓴 쪽만 가져감
+        _claimable(now).filter(pk__in=ids).update(claimedAt=now, claimToken=token, attempts=F('attempts') + 1)
+    return list(OutboxEvent.objects.filter(claimToken=token).order_by('pk'))
+
+
+def _deliver(event, sinks):
+    """모든 sink 에 전달하고, 실패하면 오류 문자열 반환"""
+    try:
+        for sink in sinks:
+            if sink.accepts(event.topic):
+                sink.deliver(event)
+    except Exception as e:
+        logger.exception('outbox event %s (%s) failed', event.pk, event.topic)
+        return repr(e)
+    finally:
+        # sink 가 DB 를 쓰면 스레드마다 연결이 생기므로 스레드 쪽 연결도 정리
+        _close_stale_connections()
+    return None
+
+
+def process(events, sinks, executor):
+    """잡은 이벤트를 스레드 풀에서 전달하고 결과를 기록"""
+    errors = list(executor.map(lambda event: _deliver(event, sinks), events))
+    delivered = [event.pk for event, error in zip(events, errors) if error is None]
+    if delivered:
+        OutboxEvent.objects.filter(pk__in=delivered).update(processedAt=timezone.now(), lastError='')
+    # 실패한 이벤트는 claimedAt 을 그대로 두어 LEASE 가 지난 뒤에 다시 잡히게 함 (재시도 간격)
+    dead = 0
+    for event, error in zip(events, errors):
+        if error is not None:
+            OutboxEvent.objects.filter(pk=event.pk).update(lastError=error[:1000])
+            if event.attempts >= _max_attempts():
+                dead += 1
+                logger.error('outbox event %s (%s) dead-lettered after %s attempts: %s',
+                             event.pk, event.topic, event.attempts, error)
+    return {'delivered': len(delivered), 'failed': len(events) - len(delivered), 'dead': dead}
+
+
+def run(workers=None, batch_size=None, once=False, poll_interval=None, sinks=None):
+    """
+    워커 루프
+    - once=True 면 밀린 이벤트를 모두 처리하고 종료, 아니면 poll_interval 초마다 새 이벤트 확인
+    - 반환값: {'delivered', 'failed', 'dead'} 누적 개수 (dead: 이번 실패로 MAX_ATTEMPTS 에 도달한 이벤트)
+    """
+    workers = workers or _settings().get('WORKERS', 4)
+    poll_interval = poll_interval if poll_interval is not None else _settings().get('POLL_INTERVAL', 1.0)
+    sinks = sinks if sinks is not None else load_sinks()
+    totals = {'delivered': 0, 'failed': 0, 'dead': 0}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='outbox') as executor:
+        while True:
+            _close_stale_connections()
+            events = claim(batch_size)
+            if events:
+                result = process(events, sinks, executor)
+                for key in totals:
+                    totals[key] += result[key]
+                continue
+            if once:
+                return totals
+            time.sleep(poll_interval)
@@ -2,6 +2,21 @@
 from rest_framework import permissions
 
 
+# -------------------- 소유권 확인 (FK id 비교) --------------------
+# obj.userId == request.user 처럼 비교하면 관련 User 행을 한 번 더 읽으므로
+# *_id 컬럼끼리 비교한다. Proposal 의 요청 소유자는 select_related('requestId') 로
+# 같은 쿼리에서 가져온 뒤 확인한다.
+
+def is_request_owner(user, request_obj):
+    return request_obj.userId_id == user.pk
+
+
+def is_proposal_helper(user, proposal):
+    return proposal.helperId_id == user.pk
+
+
+def is_proposal_request_owner(user, proposal):
+    return proposal.requestId.userId_id == user.pk
 
 
 class IsSeniorUser(permissions.BasePermission):
@@ -30,7 +45,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
         
         # 쓰기 권한은 객체의 소유자에게만 허용
-        return obj.userId == request.user
+        return is_request_owner(request.user, obj)
 
 
 class IsRequestOwnerOrHelper(permissions.BasePermission):
@@ -39,7 +54,7 @@ class IsRequestOwnerOrHelper(permissions.BasePermission):
     """
     def has_object_permission(self, request, view, obj):
         # 요청 소유자는 모든 권한
-        if hasattr(obj, 'userId') and obj.userId == request.user:
+        if hasattr(obj, 'userId_id') and is_request_owner(request.user, obj):
             return True
         
         # 도우미는 읽기 권한만
@@ -55,13 +70,11 @@ class IsProposalOwnerOrRequestOwner(permissions.BasePermission):
     """
     def has_object_permission(self, request, view, obj):
         # 제안 작성자
-        if hasattr(obj, 'helperId') and obj.helperId == request.user:
+        if hasattr(obj, 'helperId_id') and is_proposal_helper(request.user, obj):
             return True
         
-        # 요청 작성자
-        if hasattr(obj, 'requestId') and obj.requestId.userId == request.user:
+        # 요청 작성자 (뷰의 queryset 에서 requestId 를 select_related 해 둘 것)
+        if hasattr(obj, 'requestId_id') and is_proposal_request_owner(request.user, obj):
             return True
         
         return False
-
-
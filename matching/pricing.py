@@ -0,0 +1,119 @@
+# matching/pricing.py
+import re
+
+# 금액 조각: '4만 5천원', '4만5000원', '45000원', '1.5만', '2장', '12번', '2연석' 등
+# 뒤에 수량/좌석 단위가 붙은 숫자는 금액이 아님
+_AMOUNT = re.compile(r'''
+    (?<![\d.])
+    (?:(?P<man>\d+(?:\.\d+)?)\s*만\s*)?
+    (?:(?P<cheon>\d+(?:\.\d+)?)\s*천\s*)?
+    (?P<number>\d+(?:\.\d+)?)?\s*
+    (?P<unit>원|장|매|인|명|번|루|연석|구역|석|열|층|블록)?
+''', re.VERBOSE)
+_NOT_PRICE_UNITS = {'장', '매', '인', '명', '번', '루', '연석', '구역', '석', '열', '층', '블록'}
+# '장당 2만원', '1인 2만원' 처럼 장당 가격으로 적은 경우
+_PER_TICKET = re.compile(r'장당|매당|인당|(?<!\d)1\s*(?:장|매|인)(?!\d)')
+# '총 5만원, 장당 2.5만원' 처럼 합계를 함께 적은 경우
+_TOTAL = re.compile(r'총|합계')
+# 단위 없이 숫자만 적은 경우 이보다 작으면 좌석 번호 등으로 보고 무시
+MIN_BARE_PRICE = 1000
+# 이보다 큰 금액은 잘못 입력한 것으로 보고 저장하지 않음 (PositiveIntegerField 범위 안)
+MAX_PRICE = 100_000_000
+
+_SECTIONS = ('1루', '3루', '외야', '중앙', '포수', '내야')
+_ZONE = re.compile(r'([가-힣A-Za-z0-9]+석)')
+
+
+def parse_price(text):
+    """
+    자유 입력 가격 문자열에서 원 단위 금액을 추출 (없으면 None)
+    - '45,000원' → 45000, '4만5천원' → 45000, '1.5만' → 15000
+    - 원/만/천 이 붙은 금액을 우선하고, 없으면 단위 없는 MIN_BARE_PRICE 이상의 숫자
+    - '2장', '12번', '1루', '2연석' 처럼 수량/좌석 단위가 붙은 숫자는 무시
+    - MAX_PRICE 를 넘으면 None
+    """
+    return _checked(_first(_amounts(_clean(text))))
+
+
+def _clean(text):
+    return (text or '').replace(',', '')
+
+
+def _amounts(text):
+    """금액으로 볼 수 있는 조각 목록 [(시작, 끝, 금액, 원/만/천 표기 여부)]"""
+    found = []
+    for match in _AMOUNT.finditer(text):
+        man, cheon, number, unit = match.group('man', 'cheon', 'number', 'unit')
+        if not (man or cheon or number) or unit in _NOT_PRICE_UNITS:
+            continue
+        value = float(man or 0) * 10000 + float(cheon or 0) * 1000 + float(number or 0)
+        explicit = bool(man or cheon or unit == '원')
+        if explicit or value >= MIN_BARE_PRICE:
+            found.append((match.start(), match.end(), value, explicit))
+    return found
+
+
+def _first(amounts):
+    """원/만/천 이 붙은 첫 금액, 없으면 단위 없는 첫 금액"""
+    for _, _, value, explicit in amounts:
+        if explicit:
+            return value
+    return amounts[0][2] if amounts else None
+
+
+def _next_to(amounts, marker):
+    """표시어('장당', '총' 등)에 가장 가까운 금액 조각 (거리가 같으면 뒤쪽)"""
+    def distance(amount):
+        start, end = amount[:2]
+        return (start - marker.end(), 0) if start >= marker.end() else (marker.start() - end, 1)
+    return min(amounts, key=distance, default=None)
+
+
+def _checked(value):
+    if value is None or value > MAX_PRICE:
+        return None
+    return int(value)
+
+
+def is_per_ticket(text):
+    """'장당 2만원', '1인 2만원' 처럼 장당 가격으로 적었는지"""
+    return bool(text and _PER_TICKET.search(text))
+
+
+def parse_seat(text):
+    """좌석 문자열에서 (구역, 존) 추출. '1루 블루석' → ('1루', '블루석')"""
+    if not text:
+        return '', ''
+    section = next((name for name in _SECTIONS if name in text), '')
+    rest = text.replace(section, '', 1) if section else text
+    zone = next((found for found in _ZONE.findall(rest) if found != '좌석'), '')
+    return section, zone
+
+
+def structured_fields(seat_type, total_price, number_of_tickets):
+    """
+    Proposal 의 숫자/구조화 컬럼 값
+    - '장당 2만원' 은 표시어 옆의 금액을 장당 가격으로 보고, '총'/'합계' 금액이 따로 있으면 그 값을 총액으로 사용
+      (없으면 장당 가격 x 티켓 수)
+    """
+    text = _clean(total_price)
+    amounts = _amounts(text)
+    price = _checked(_first(amounts))
+    section, zone = parse_seat(seat_type)
+    per_ticket_marker = _PER_TICKET.search(text)
+    if price is not None and per_ticket_marker:
+        total_marker = _TOTAL.search(text)
+        total = _next_to(amounts, total_marker) if total_marker else None
+        if total is not None:
+            amounts.remove(total)   # 총액 조각은 장당 가격 후보에서 뺌
+        per_ticket = (_next_to(amounts, per_ticket_marker) or total)[2]
+        price = _checked(total[2] if total else per_ticket * (number_of_tickets or 1))
+        per_ticket = _checked(per_ticket) if price is not None else None
+    else:
+        per_ticket = price // number_of_tickets if price is not None and number_of_tickets else None
+    return {
+        'priceKrw': price,
+        'pricePerTicket': per_ticket,
+        'seatSection': section,
+        'seatZone': zone,
+    }
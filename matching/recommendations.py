@@ -0,0 +1,257 @@
+# matching/recommendations.py
+"""
+헬퍼별 열린 요청 추천
+
+열린 요청 전체를 id/팀/구장/시각 배열로 압축한 스냅샷 하나를 캐시에 두고,
+헬퍼마다 NumPy 로 전체 요청 점수를 한 번에 계산해 상위 N개 id 만 캐시한다.
+요청이 바뀌면 스냅샷은 updatedAt 인덱스로 바뀐 행만 다시 읽어 갱신한다.
+"""
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Profile, Proposal, Request, Tombstone
+
+SNAPSHOT_KEY = 'reco:snapshot'
+CHANGED_KEY = 'reco:changed-at'
+
+DEFAULT_WEIGHTS = {
+    'favorite_team': 3.0,
+    'team_history': 1.5,
+    'stadium_history': 1.0,
+    'proximity': 2.0,
+    'age': 1.0,
+}
+
+
+def _settings():
+    return getattr(settings, 'RECOMMENDATIONS', {})
+
+
+def _weights():
+    return {**DEFAULT_WEIGHTS, **_settings().get('WEIGHTS', {})}
+
+
+@dataclass
+class OpenRequestSnapshot:
+    """열린 요청의 열 지향 배열 (행 i 가 요청 하나)"""
+    ids: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    stadium: np.ndarray
+    game_ts: np.ndarray
+    created_ts: np.ndarray
+    stadium_codes: dict
+    built_at: float
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _game_timestamp(game_date, game_time):
+    tz = timezone.get_current_timezone()
+    return datetime.combine(game_date, game_time, tzinfo=tz).timestamp()
+
+
+def _open_rows(queryset):
+    return queryset.filter(status='WAITING_FOR_HELPER').values_list(
+        'requestId', 'game__homeTeam', 'game__awayTeam', 'game__stadium',
+        'game__date', 'game__time', 'createdAt',
+    )
+
+
+def _to_arrays(rows, stadium_codes):
+    n = len(rows)
+    ids = np.empty(n, dtype=np.int64)
+    home = np.empty(n, dtype=np.int32)
+    away = np.empty(n, dtype=np.int32)
+    stadium = np.empty(n, dtype=np.int32)
+    game_ts = np.empty(n, dtype=np.float64)
+    created_ts = np.empty(n, dtype=np.float64)
+    for i, (request_id, home_id, away_id, stadium_name, game_date, game_time, created) in enumerate(rows):
+        ids[i] = request_id
+        home[i] = home_id
+        away[i] = away_id
+        stadium[i] = stadium_codes.setdefault(stadium_name, len(stadium_codes))
+        game_ts[i] = _game_timestamp(game_date, game_time)
+        created_ts[i] = created.timestamp()
+    return ids, home, away, stadium, game_ts, created_ts
+
+
+def build_snapshot():
+    built_at = time.time()
+    today = timezone.localdate()
+    rows = list(_open_rows(Request.objects.filter(game__date__gte=today)))
+    stadium_codes = {}
+    return OpenRequestSnapshot(*_to_arrays(rows, stadium_codes), stadium_codes=stadium_codes, built_at=built_at)
+
+
+def refresh_snapshot(snapshot):
+    """
+    스냅샷 생성 이후 바뀐 요청만 반영 (updatedAt 인덱스 사용)
+    - 바뀐 요청은 일단 빼고, 여전히 열린 상태면 새 값으로 다시 붙임
+    - 삭제된 요청은 tombstone 으로 제거
+    """
+    built_at = time.time()
+    overlap = getattr(settings, 'DELTA_SYNC_OVERLAP', timedelta(seconds=2))
+    since = datetime.fromtimestamp(snapshot.built_at, tz=dt_timezone.utc) - overlap
+    changed = Request.objects.filter(updatedAt__gt=since)
+    changed_ids = np.fromiter(changed.values_list('requestId', flat=True), dtype=np.int64)
+    deleted_ids = np.fromiter(
+        Tombstone.objects.filter(kind='request', deletedAt__gt=since).values_list('objectId', flat=True),
+        dtype=np.int64,
+    )
+    keep = ~np.isin(snapshot.ids, np.concatenate([changed_ids, deleted_ids]))
+    rows = list(_open_rows(changed))
+    added = _to_arrays(rows, snapshot.stadium_codes)
+
+    columns = [
+        np.concatenate([old[keep], new])
+        for old, new in zip(
+            (snapshot.ids, snapshot.home, snapshot.away, snapshot.stadium, snapshot.game_ts, snapshot.created_ts),
+            added,
+        )
+    ]
+    return OpenRequestSnapshot(*columns, stadium_codes=snapshot.stadium_codes, built_at=built_at)
+
+
+def get_snapshot():
+    """
+    캐시된 스냅샷 반환
+    - 바뀐 요청이 있으면 증분 갱신, MAX_SNAPSHOT_AGE 가 지나면 (지난 경기 정리를 위해) 전체 재생성
+    - built_at 이 스냅샷의 버전 역할을 함
+    """
+    snapshot = cache.get(SNAPSHOT_KEY)
+    max_age = _settings().get('MAX_SNAPSHOT_AGE', 300)
+    if snapshot is None or time.time() - snapshot.built_at > max_age:
+        snapshot = build_snapshot()
+    elif (cache.get(CHANGED_KEY) or 0) >= snapshot.built_at:
+        snapshot = refresh_snapshot(snapshot)
+    else:
+        return snapshot
+    cache.set(SNAPSHOT_KEY, snapshot, None)
+    return snapshot
+
+
+def mark_changed():
+    """
+    요청이 바뀌었음을 알림 (다음 조회 때 스냅샷을 증분 갱신)
+    - QuerySet.update() 처럼 시그널이 없는 일괄 변경 후에는 직접 호출
+    """
+    cache.set(CHANGED_KEY, time.time(), None)
+
+
+@receiver(post_save, sender=Request)
+@receiver(post_delete, sender=Request)
+def _request_changed(sender, **kwargs):
+    mark_changed()
+
+
+@dataclass
+class HelperFeatures:
+    favorite_team: int
+    team_history: np.ndarray
+    stadium_history: dict
+    completion_rate: float
+
+
+def helper_features(helper):
+    """
+    헬퍼의 관심 구단, 팀/구장별 수락된 제안 수, 완료율 (캐시)
+    """
+    key = f'reco:features:{helper.pk}'
+    features = cache.get(key)
+    if features is not None:
+        return features
+
+    favorite_team = Profile.objects.filter(user_id=helper.pk).values_list('favorite_team', flat=True).first()
+    history = list(
+        Proposal.objects.filter(helperId_id=helper.pk, status='accepted').values_list(
+            'requestId__game__homeTeam', 'requestId__game__awayTeam', 'requestId__game__stadium', 'requestId__status'
+        )
+    )
+    teams = np.array([team for row in history for team in row[:2]], dtype=np.int64)
+    team_history = np.bincount(teams) if len(teams) else np.zeros(0, dtype=np.int64)
+    stadium_history = {}
+    for _, _, stadium_name, _ in history:
+        stadium_history[stadium_name] = stadium_history.get(stadium_name, 0) + 1
+    completed = sum(1 for row in history if row[3] == 'COMPLETED')
+    # 기록이 적은 헬퍼가 0 또는 1 로 튀지 않도록 (완료+1)/(수락+2)
+    completion_rate = (completed + 1) / (len(history) + 2)
+
+    features = HelperFeatures(favorite_team or -1, team_history, stadium_history, completion_rate)
+    cache.set(key, features, _settings().get('FEATURE_TTL', 600))
+    return features
+
+
+def _lookup(table, index):
+    """index 가 table 범위를 벗어나면 0 으로 보는 벡터 조회"""
+    if len(table) == 0:
+        return np.zeros(len(index), dtype=np.float64)
+    clipped = np.clip(index, 0, len(table) - 1)
+    return np.where(index < len(table), table[clipped], 0).astype(np.float64)
+
+
+def score(snapshot, features, now=None):
+    """스냅샷의 모든 요청에 대한 점수 벡터 (지난 경기는 -inf)"""
+    now = time.time() if now is None else now
+    w = _weights()
+
+    favorite = ((snapshot.home == features.favorite_team) | (snapshot.away == features.favorite_team))
+    team_history = np.log1p(_lookup(features.team_history, snapshot.home) + _lookup(features.team_history, snapshot.away))
+
+    stadium_table = np.zeros(len(snapshot.stadium_codes), dtype=np.float64)
+    for stadium_name, count in features.stadium_history.items():
+        code = snapshot.stadium_codes.get(stadium_name)
+        if code is not None:
+            stadium_table[code] = count
+    stadium_history = np.log1p(_lookup(stadium_table, snapshot.stadium))
+
+    # 경기가 가까울수록, 오래 기다린 요청일수록 가산. 급한 요청은 완료율이 높은 헬퍼에게 더 위로
+    hours_to_game = (snapshot.game_ts - now) / 3600
+    proximity = np.exp(-np.maximum(hours_to_game, 0) / 72) * features.completion_rate
+    age = np.minimum((now - snapshot.created_ts) / 86400 / 7, 1.0)
+
+    scores = (
+        w['favorite_team'] * favorite
+        + w['team_history'] * team_history
+        + w['stadium_history'] * stadium_history
+        + w['proximity'] * proximity
+        + w['age'] * age
+    )
+    return np.where(hours_to_game > 0, scores, -np.inf)
+
+
+def recommend(helper, limit=20):
+    """
+    헬퍼에게 추천할 (요청 id, 점수) 목록
+    - 같은 스냅샷 버전이면 캐시된 상위 목록을 그대로 사용
+    """
+    snapshot = get_snapshot()
+    key = f'reco:helper:{helper.pk}'
+    cached = cache.get(key)
+    if cached is not None and cached[0] == snapshot.built_at and len(cached[1]) >= limit:
+        return cached[1][:limit]
+
+    if len(snapshot) == 0:
+        ranked = []
+    else:
+        scores = score(snapshot, helper_features(helper))
+        top_n = max(limit, _settings().get('CACHED_TOP_N', 50))
+        k = min(top_n, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        ranked = [
+            (int(snapshot.ids[i]), round(float(scores[i]), 4))
+            for i in top if math.isfinite(scores[i])
+        ]
+    cache.set(key, (snapshot.built_at, ranked), _settings().get('FEATURE_TTL', 600))
+    return ranked[:limit]
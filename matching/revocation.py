@@ -0,0 +1,167 @@
+# matching/revocation.py
+"""
+refresh 토큰 폐기 목록 (rest_framework_simplejwt.token_blacklist 대신)
+
+- 폐기된 jti 는 RevokedToken 테이블에 저장하고, 프로세스마다 Bloom filter 로 들고 있는다.
+  Bloom filter 에 없으면 폐기되지 않은 것이 확실하므로 DB 를 보지 않고, 있을 때만 테이블로 확인한다.
+- 다른 프로세스에서 폐기한 jti 는 SYNC_INTERVAL 초마다 id 워터마크 이후 행만 읽어 반영하고,
+  지워진(만료된) 행을 비우기 위해 REBUILD_INTERVAL 초마다 filter 를 새로 만든다.
+- 회전(rotate)은 이전 토큰의 jti 를 INSERT 하는 것으로 '사용 처리' 하므로, 동기화 주기와 상관없이
+  같은 refresh 토큰을 두 번 쓰면 unique 제약에서 걸린다.
+- access 토큰은 수명이 짧으므로 검사하지 않음 (로그아웃 후에도 만료 시까지 유효)
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import User, RevokedToken
+from .jwt_utils import issue_tokens
+
+
+def _settings():
+    return getattr(settings, 'REVOCATION', {})
+
+
+class BloomFilter:
+    """
+    bytearray 하나로 된 Bloom filter
+    - 해시는 blake2b 128비트 한 번을 두 64비트 값으로 나눠 h1 + i*h2 로 k 개 위치를 만듦
+    """
+    def __init__(self, bits, hashes):
+        self.size = bits
+        self.hashes = hashes
+        self.bits = bytearray((bits + 7) // 8)
+
+    @staticmethod
+    def _hash(key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        # h2 가 짝수면 size 가 2의 거듭제곱일 때 위치가 겹치므로 홀수로
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    def add(self, key):
+        h1, h2 = self._hash(key)
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % self.size
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        h1, h2 = self._hash(key)
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % self.size
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationStore:
+    """프로세스 로컬 Bloom filter + 동기화 상태"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.last_id = 0
+        self.synced_at = 0.0
+        self.built_at = 0.0
+
+    def _rebuild(self, now):
+        bloom = BloomFilter(_settings().get('BLOOM_BITS', 1 << 23), _settings().get('BLOOM_HASHES', 7))
+        last_id = 0
+        for pk, jti in RevokedToken.objects.order_by('pk').values_list('pk', 'jti').iterator(chunk_size=10000):
+            bloom.add(jti)
+            last_id = pk
+        self.bloom, self.last_id, self.built_at = bloom, last_id, now
+
+    def _sync(self, now):
+        if self.bloom is None or now - self.built_at > _settings().get('REBUILD_INTERVAL', 3600):
+            self._rebuild(now)
+        else:
+            for pk, jti in RevokedToken.objects.filter(pk__gt=self.last_id).order_by('pk').values_list('pk', 'jti'):
+                self.bloom.add(jti)
+                self.last_id = pk
+        self.synced_at = now
+
+    def might_be_revoked(self, jti):
+        now = time.monotonic()
+        if now - self.synced_at > _settings().get('SYNC_INTERVAL', 5):
+            # 처음 한 번은 다 읽을 때까지 기다리고, 그 뒤에는 다른 스레드가 동기화 중이면 기존 filter 사용
+            if self.lock.acquire(blocking=self.bloom is None):
+                try:
+                    if now - self.synced_at > _settings().get('SYNC_INTERVAL', 5):
+                        self._sync(now)
+                finally:
+                    self.lock.release()
+        return jti in self.bloom
+
+    def add(self, jti):
+        if self.bloom is not None:
+            self.bloom.add(jti)
+
+    def reset(self):
+        with self.lock:
+            self.bloom = None
+            self.last_id = 0
+            self.synced_at = self.built_at = 0.0
+
+
+store = RevocationStore()
+
+
+def is_revoked(jti):
+    """Bloom filter 에 없으면 바로 False, 있으면 테이블에서 확인 (오탐 제거)"""
+    return store.might_be_revoked(jti) and RevokedToken.objects.filter(jti=jti).exists()
+
+
+def revoke(token):
+    """refresh 토큰 폐기. 이미 폐기된 토큰이면 False"""
+    jti = token[jwt_settings.JTI_CLAIM]
+    expires_at = datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=jti, expiresAt=expires_at)
+    except IntegrityError:
+        return False
+    store.add(jti)
+    return True
+
+
+def rotate(raw_token):
+    """
+    refresh 토큰을 새 (refresh, access) 로 교환하고 이전 토큰은 폐기
+    - 서명/만료가 잘못됐거나, 폐기됐거나, 이미 회전에 쓰인 토큰이면 TokenError
+    - 반환값: (user, refresh, access)
+    """
+    token = RefreshToken(raw_token)
+    if is_revoked(token[jwt_settings.JTI_CLAIM]):
+        raise TokenError('Token is revoked')
+    if not revoke(token):
+        # 동시에 같은 토큰으로 두 번 요청한 경우 먼저 INSERT 한 쪽만 통과
+        raise TokenError('Token is revoked')
+    user = User.objects.filter(
+        **{jwt_settings.USER_ID_FIELD: token[jwt_settings.USER_ID_CLAIM]}, is_active=True
+    ).first()
+    if user is None:
+        raise TokenError('User not found')
+    refresh, access = issue_tokens(user)
+    return user, refresh, access
+
+
+def purge(batch_size=None, now=None):
+    """만료 시각이 지난 행을 batch_size 개씩 삭제하고 지운 행 수 반환 (만료된 토큰은 폐기 여부와 상관없이 거부됨)"""
+    batch_size = batch_size or _settings().get('PURGE_BATCH_SIZE', 1000)
+    now = now or timezone.now()
+    deleted = 0
+    while True:
+        ids = list(RevokedToken.objects.filter(expiresAt__lt=now).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += RevokedToken.objects.filter(pk__in=ids).delete()[0]
+        if len(ids) < batch_size:
+            return deleted
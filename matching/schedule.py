@@ -0,0 +1,103 @@
+# matching/schedule.py
+"""
+월간 경기 일정 (캘린더 화면용)
+
+한 달치 경기를 팀 조인 쿼리 한 번으로 읽고, 팀 정보는 경기마다 반복하지 않고 teams 로 따로 모은다.
+결과는 (월, 버전) 키로 캐시하며 경기나 팀이 바뀌면 버전을 올려 이전 캐시를 모두 무시한다.
+경기별 대기 요청 수는 자주 바뀌므로 캐시하지 않고 GameDemand 에서 따로 읽는다.
+"""
+import calendar
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Team, Game, GameDemand
+
+VERSION_KEY = 'schedule:version'
+
+
+def _settings():
+    return getattr(settings, 'SCHEDULE', {})
+
+
+def parse_month(value):
+    """'YYYY-MM' → (해당 월 1일, 말일). 형식이 틀리면 ValueError"""
+    year, month = (int(part) for part in value.split('-'))
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _team(row, prefix):
+    return {
+        'id': row[f'{prefix}__teamId'],
+        'name': row[f'{prefix}__name'],
+        'shortName': row[f'{prefix}__name'],
+        'logoUrl': row[f'{prefix}__logo'],
+        'homeStadium': row[f'{prefix}__stadium'],
+    }
+
+
+def _build(first, last):
+    team_fields = [f'{prefix}__{field}' for prefix in ('homeTeam', 'awayTeam')
+                   for field in ('teamId', 'name', 'logo', 'stadium')]
+    rows = (
+        Game.objects.filter(date__range=(first, last))
+        .order_by('date', 'time', 'gameId')
+        .values('gameId', 'date', 'time', 'stadium', 'status', 'rescheduledTo', *team_fields)
+    )
+    games, teams = [], {}
+    for row in rows:
+        for prefix in ('homeTeam', 'awayTeam'):
+            teams.setdefault(row[f'{prefix}__teamId'], _team(row, prefix))
+        games.append({
+            'gameId': row['gameId'],
+            'date': row['date'].isoformat(),
+            'time': row['time'].strftime('%H:%M'),
+            'homeTeam': row['homeTeam__teamId'],
+            'awayTeam': row['awayTeam__teamId'],
+            'stadium': row['stadium'],
+            'status': row['status'],
+            'rescheduledTo': row['rescheduledTo'],
+        })
+    # JSON 객체 키는 문자열이므로 캐시에 넣기 전에 맞춰 둠
+    return {'games': games, 'teams': {str(team_id): team for team_id, team in teams.items()}}
+
+
+def month_calendar(value, with_counts=False):
+    """
+    value('YYYY-MM') 월의 경기 일정
+    - 캐시 적중 시 쿼리 없음, with_counts=True 면 GameDemand 조회 1번 추가
+    """
+    first, last = parse_month(value)
+    version = cache.get(VERSION_KEY) or 0
+    key = f'schedule:month:{version}:{first:%Y-%m}'
+    data = cache.get(key)
+    if data is None:
+        data = _build(first, last)
+        cache.set(key, data, _settings().get('TTL', 3600))
+    data = {'month': f'{first:%Y-%m}', **data}
+    if with_counts:
+        counts = dict(
+            GameDemand.objects.filter(game__date__range=(first, last))
+            .values_list('game_id', 'waitingRequests')
+        )
+        data['games'] = [{**game, 'waitingRequests': counts.get(game['gameId'], 0)} for game in data['games']]
+    return data
+
+
+def invalidate():
+    """경기/팀이 바뀐 뒤 호출 (QuerySet.update() 처럼 시그널이 없는 일괄 변경은 직접 호출)"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def _schedule_changed(sender, **kwargs):
+    invalidate()
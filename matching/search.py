@@ -0,0 +1,234 @@
+# matching/search.py
+"""
+팀/구장/요청 메모/제안 메시지 검색 (역색인)
+
+- 텍스트를 토큰으로 나누고 한글은 자모로 분해해 SearchTerm 에 저장한다.
+  ('두ㅅ', '두사' 처럼 입력 중인 글자도 '두산' 의 접두어가 됨)
+- 한글 토큰은 음절마다 시작하는 접미어도 저장해 '구장' 으로 '잠실야구장' 을 찾을 수 있게 한다.
+- 조회는 검색어마다 (term, kind, objectId, weight) 인덱스 범위 검색 한 번이고, 모든 검색어가 맞은
+  문서만 가중치 합으로 정렬한다.
+- 색인은 post_save/post_delete 에서 문서 단위로 갱신하며, 기존 데이터는 rebuild_search_index 명령으로 채운다.
+"""
+import re
+import unicodedata
+from contextlib import contextmanager
+import contextvars
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Team, Request, Proposal, SearchTerm
+
+KIND_TEAM = 1
+KIND_REQUEST = 2
+KIND_PROPOSAL = 3
+KIND_NAMES = {KIND_TEAM: 'team', KIND_REQUEST: 'request', KIND_PROPOSAL: 'proposal'}
+PUBLIC_KINDS = (KIND_TEAM,)
+
+# 모델별 (kind, {필드: 가중치})
+INDEXED = {
+    Team: (KIND_TEAM, {'name': 3, 'stadium': 2}),
+    Request: (KIND_REQUEST, {'additionalInfo': 1}),
+    Proposal: (KIND_PROPOSAL, {'message': 1}),
+}
+
+MAX_TOKEN_LENGTH = 20
+MAX_POSTINGS = 5000
+EXACT_BONUS = 1
+
+# -------------------- 정규화 --------------------
+
+_CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+_JONGSEONG = ' ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ'
+# 겹모음/겹받침은 입력 순서대로 쪼갬 ('고' 를 입력한 시점에 '과' 와 맞도록)
+_SPLIT = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ',
+    'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+_TOKEN = re.compile(r'\w+')
+
+
+def _is_syllable(char):
+    return '가' <= char <= '힣'
+
+
+def to_jamo(text):
+    """한글 음절을 호환 자모로 분해 (그 외 문자는 그대로)"""
+    out = []
+    for char in text:
+        if _is_syllable(char):
+            code = ord(char) - ord('가')
+            jamo = _CHOSEONG[code // 588] + _JUNGSEONG[code % 588 // 28] + _JONGSEONG[code % 28].strip()
+        else:
+            jamo = char
+        out.append(''.join(_SPLIT.get(j, j) for j in jamo))
+    return ''.join(out)
+
+
+def tokenize(text):
+    # NFKC: 전각 문자를 맞추고, 분해된 채(NFD) 들어온 한글은 음절로 합침
+    return [token[:MAX_TOKEN_LENGTH] for token in _TOKEN.findall(unicodedata.normalize('NFKC', text or '').lower())]
+
+
+def terms_for(text, weight):
+    """텍스트 → {자모 term: 가중치}. 토큰 시작은 weight*2, 한글 토큰 중간 음절부터의 접미어는 weight"""
+    terms = {}
+
+    def add(term, term_weight):
+        term = term[:100]
+        terms[term] = max(terms.get(term, 0), term_weight)
+
+    for token in tokenize(text):
+        add(to_jamo(token), weight * 2)
+        if any(_is_syllable(char) for char in token):
+            # 한 글자짜리 접미어는 너무 많이 맞으므로 두 글자 이상만
+            for start in range(1, len(token) - 1):
+                add(to_jamo(token[start:]), weight)
+    return terms
+
+
+# -------------------- 색인 --------------------
+
+def _document_terms(instance):
+    _, fields = INDEXED[type(instance)]
+    terms = {}
+    for field, weight in fields.items():
+        for term, term_weight in terms_for(getattr(instance, field), weight).items():
+            terms[term] = max(terms.get(term, 0), term_weight)
+    return terms
+
+
+def index(instances, created=False):
+    """
+    문서들의 색인을 다시 만듦 (DELETE 1번 + INSERT 1번, 같은 모델끼리 묶어서 호출)
+    - created=True 면 지울 이전 색인이 없으므로 DELETE 생략
+    """
+    if not instances:
+        return 0
+    kind, _ = INDEXED[type(instances[0])]
+    rows = [
+        SearchTerm(term=term, kind=kind, objectId=instance.pk, weight=weight)
+        for instance in instances
+        for term, weight in _document_terms(instance).items()
+    ]
+    with transaction.atomic():
+        if not created:
+            SearchTerm.objects.filter(kind=kind, objectId__in=[instance.pk for instance in instances]).delete()
+        SearchTerm.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rebuild(chunk_size=1000):
+    """전체 색인 재생성 (반환값: 모델별 문서 수)"""
+    SearchTerm.objects.all().delete()
+    counts = {}
+    for model, (kind, fields) in INDEXED.items():
+        counts[KIND_NAMES[kind]] = 0
+        queryset = model.objects.only('pk', *fields).order_by('pk')
+        chunk = []
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(instance)
+            if len(chunk) >= chunk_size:
+                index(chunk, created=True)
+                counts[KIND_NAMES[kind]] += len(chunk)
+                chunk = []
+        index(chunk, created=True)
+        counts[KIND_NAMES[kind]] += len(chunk)
+    return counts
+
+
+def _indexed_text(instance):
+    _, fields = INDEXED[type(instance)]
+    return tuple(instance.__dict__.get(field) for field in fields)
+
+
+@receiver(post_init, sender=Team)
+@receiver(post_init, sender=Request)
+@receiver(post_init, sender=Proposal)
+def _remember_text(sender, instance, **kwargs):
+    # 상태만 바뀌는 저장이 대부분이므로, 색인 대상 텍스트가 그대로면 색인을 건드리지 않음
+    instance._indexed_text = _indexed_text(instance)
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_save, sender=Request)
+@receiver(post_save, sender=Proposal)
+def _reindex(sender, instance, created, update_fields=None, **kwargs):
+    _, fields = INDEXED[sender]
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return
+    text = _indexed_text(instance)
+    if not created and text == instance._indexed_text:
+        return
+    index([instance], created=created)
+    instance._indexed_text = text
+
+
+_deferred = contextvars.ContextVar('search_unindex_deferred', default=False)
+
+
+def unindex(model, object_ids):
+    """문서 여러 개의 색인 삭제 (DELETE 1번)"""
+    kind, _ = INDEXED[model]
+    return SearchTerm.objects.filter(kind=kind, objectId__in=object_ids).delete()[0]
+
+
+@contextmanager
+def deferred_unindex():
+    """
+    블록 안의 QuerySet.delete() 에서 문서마다 나가는 색인 DELETE 를 건너뜀
+    (archive 처럼 많이 지우는 쪽이 unindex() 로 한 번에 지움)
+    """
+    token = _deferred.set(True)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+
+
+@receiver(post_delete, sender=Team)
+@receiver(post_delete, sender=Request)
+@receiver(post_delete, sender=Proposal)
+def _unindex(sender, instance, **kwargs):
+    if _deferred.get():
+        return
+    unindex(sender, [instance.pk])
+
+
+# -------------------- 조회 --------------------
+
+def search(query, kinds=PUBLIC_KINDS, limit=20):
+    """
+    검색어의 모든 토큰을 (접두어로) 포함하는 문서를 점수순으로 반환
+    - 점수: 토큰마다 가장 높은 term 가중치의 합 (토큰과 term 이 완전히 같으면 EXACT_BONUS 추가)
+    - 토큰마다 (term, kind, objectId, weight) 인덱스 범위 검색 한 번. 긴(덜 흔한) 토큰부터 찾고,
+      다음 토큰은 앞에서 남은 문서 안에서만 찾으므로 교집합이 MAX_POSTINGS 에 잘리지 않음
+    - 한 토큰의 posting 이 MAX_POSTINGS 를 넘으면 가중치가 높은 것부터 남김
+    - 반환값: [(kind, objectId, score)]
+    """
+    tokens = list(dict.fromkeys(to_jamo(token) for token in tokenize(query)))
+    if not tokens:
+        return []
+    scores = None
+    for token in sorted(tokens, key=len, reverse=True):
+        postings = SearchTerm.objects.filter(term__gte=token, term__lt=token + '\uffff', kind__in=kinds)
+        if scores is not None:
+            postings = postings.filter(objectId__in={object_id for _, object_id in scores})
+        best = {}
+        for term, kind, object_id, weight in (
+            postings.order_by('-weight', 'kind', 'objectId').values_list('term', 'kind', 'objectId', 'weight')[:MAX_POSTINGS]
+        ):
+            key = (kind, object_id)
+            if scores is not None and key not in scores:
+                continue
+            best[key] = max(best.get(key, 0), weight + (EXACT_BONUS if term == token else 0))
+        scores = {key: (scores[key] if scores is not None else 0) + score for key, score in best.items()}
+        if not scores:
+            return []
+    ranked = [(kind, object_id, score) for (kind, object_id), score in scores.items()]
+    ranked.sort(key=lambda row: (-row[2], row[0], row[1]))
+    return ranked[:limit]
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import User, Profile, Request, Proposal, Team, Game
+from .models import User, Profile, Request, Proposal, Team, Game, ArchivedRequest, ArchivedProposal
+from . import pricing
 import re
 
 # -------------------- User 관련 Serializer --------------------
@@ -43,17 +44,21 @@ class UserProfileSerializer(serializers.ModelSerializer):
         user와 profile을 함께 업데이트
         """
         profile_data = validated_data.pop('profile', {})  # profile 데이터 추출
-        # User 필드 업데이트
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
-        # Profile 필드 업데이트
+        # User 필드 업데이트 (바뀐 필드만)
+        changed = [attr for attr, value in validated_data.items() if getattr(instance, attr) != value]
+        for attr in changed:
+            setattr(instance, attr, validated_data[attr])
+        if changed:
+            instance.save(update_fields=changed)
+
+        # Profile 필드 업데이트 (바뀐 필드만)
         if profile_data:
             profile = instance.profile
-            for attr, value in profile_data.items():
-                setattr(profile, attr, value)
-            profile.save()
+            changed = [attr for attr, value in profile_data.items() if getattr(profile, attr) != value]
+            for attr in changed:
+                setattr(profile, attr, profile_data[attr])
+            if changed:
+                profile.save(update_fields=changed)
         return instance
 
 
@@ -71,22 +76,26 @@ class RegisterSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['name', 'phone', 'role', 'password', 'nickname', 'favorite_team']
+
+    def validate_phone(self, value):
+        # unique 검사는 입력 그대로 하므로, 정규화한 번호로 다시 확인
+        phone = User.objects.normalize_phone(value)
+        if not phone:
+            raise serializers.ValidationError('전화번호를 입력해주세요.')
+        if User.objects.filter(phone=phone).exists():
+            raise serializers.ValidationError('이미 가입된 전화번호입니다.')
+        return phone
     
     def create(self, validated_data):
         """
         User 생성 시 profile 정보도 함께 설정
         """
-        favorite_team_obj = validated_data.pop('favorite_team', None)
-        nickname = validated_data.pop('nickname', '')
-        user = User.objects.create_user(**validated_data)
-
-        # profile 저장
-        if nickname:
-            user.profile.nickname = nickname
-        if favorite_team_obj:
-            user.profile.favorite_team = favorite_team_obj
-        user.profile.save()
-        return user
+        profile = {
+            'nickname': validated_data.pop('nickname', ''),
+            'favorite_team': validated_data.pop('favorite_team', None),
+        }
+        # 사용자/프로필 INSERT 2번 (프로필은 create_user_profile 시그널이 위 값으로 생성)
+        return User.objects.create_user(profile=profile, **validated_data)
 
 
 # -------------------- Team / Game 관련 Serializer --------------------
@@ -120,7 +129,8 @@ class GameSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Game
-        fields = ['gameId', 'date', 'time', 'homeTeam', 'awayTeam', 'stadium']
+        fields = ['gameId', 'date', 'time', 'homeTeam', 'awayTeam', 'stadium', 'status', 'rescheduledTo']
+        read_only_fields = ['status', 'rescheduledTo']
 
 
 # -------------------- Request 관련 Serializer --------------------
@@ -187,6 +197,7 @@ class ProposalSerializer(serializers.ModelSerializer):
         model = Proposal
         fields = [
             'proposalId', 'requestId', 'helperId', 'seatType', 'totalPrice', 'message',
+            'priceKrw', 'pricePerTicket', 'seatSection', 'seatZone',
             'status', 'createdAt', 'updatedAt'
         ]
 
@@ -194,11 +205,50 @@ class ProposalSerializer(serializers.ModelSerializer):
 class ProposalCreateSerializer(serializers.ModelSerializer):
     """
     Proposal 생성 전용 Serializer
+    - seatType/totalPrice 문자열을 파싱해 가격(원)/좌석 구역 컬럼도 함께 저장
     """
     class Meta:
         model = Proposal
         fields = ['seatType', 'totalPrice', 'message']
 
+    def create(self, validated_data):
+        validated_data.update(pricing.structured_fields(
+            validated_data.get('seatType', ''),
+            validated_data.get('totalPrice', ''),
+            validated_data['requestId'].numberOfTickets,
+        ))
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        # 자동 매칭 추천(suggested)을 헬퍼의 실제 제안으로 바꿀 때
+        validated_data.update(pricing.structured_fields(
+            validated_data.get('seatType', instance.seatType),
+            validated_data.get('totalPrice', instance.totalPrice),
+            instance.requestId.numberOfTickets,
+        ))
+        return super().update(instance, validated_data)
+
+
+class ProposalComparisonSerializer(serializers.Serializer):
+    """
+    시니어용 제안 비교표 Serializer (matching.comparison 의 dict 행을 그대로 사용)
+    - 비교에 필요한 필드만, 요청 정보는 중첩하지 않음
+    """
+    proposalId = serializers.IntegerField()
+    rank = serializers.IntegerField()
+    score = serializers.FloatField()
+    helperId = serializers.IntegerField()
+    helperName = serializers.CharField(source='helperId__name')
+    helperMileage = serializers.IntegerField(source='helperId__mileagePoints')
+    helperCompletedSessions = serializers.IntegerField()
+    priceKrw = serializers.IntegerField(allow_null=True)
+    pricePerTicket = serializers.IntegerField(allow_null=True)
+    seatSection = serializers.CharField()
+    seatZone = serializers.CharField()
+    seatType = serializers.CharField()
+    totalPrice = serializers.CharField()
+    createdAt = serializers.DateTimeField()
+
 
 # -------------------- MyPage(내 요청 / 내 제안) --------------------
 
@@ -273,5 +323,27 @@ class MyPageProposalSerializer(serializers.ModelSerializer):
         model = Proposal
         fields = [
             'proposalId', 'request', 'seatType', 'totalPrice', 'message',
+            'priceKrw', 'pricePerTicket', 'seatSection', 'seatZone',
             'status', 'createdAt', 'updatedAt'
         ]
+
+
+
+# -------------------- 보관(archive) 테이블용 Serializer --------------------
+# hot 테이블 Serializer 와 같은 응답 형태를 유지 (목록에서 두 테이블 행이 섞여 나감)
+
+class ArchivedRequestSerializer(RequestSerializer):
+    class Meta(RequestSerializer.Meta):
+        model = ArchivedRequest
+
+
+class ArchivedMyPageRequestSerializer(MyPageRequestSerializer):
+    class Meta(MyPageRequestSerializer.Meta):
+        model = ArchivedRequest
+
+
+class ArchivedMyPageProposalSerializer(MyPageProposalSerializer):
+    request = ArchivedRequestSerializer(source='requestId', read_only=True)
+
+    class Meta(MyPageProposalSerializer.Meta):
+        model = ArchivedProposal
@@ -1,13 +1,31 @@
 # matching/tests.py
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from io import StringIO
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.urls import reverse
-from .models import Profile, Request, Proposal, Team, Game
+from . import outbox, events, games, demand, search, login, revocation, funnel
+from .admin import EstimatedCountPaginator
+from .sync import encode_token
+from .models import (
+    Profile, Request, Proposal, Team, Game, OutboxEvent, ArchivedRequest, ArchivedProposal, StatusEvent,
+    DailyFunnel, GameFunnel, GameDemand, SearchTerm, RevokedToken, RollupWatermark,
+)
 from datetime import date, time, timedelta
 from django.utils import timezone
+import importlib
 import json
+import os
+import tempfile
+import threading
+from unittest import mock
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
 User = get_user_model()
 
@@ -279,3 +297,1611 @@ class ModelTestCase(TestCase):
         self.assertEqual(request_obj.userId, self.user)
         self.assertEqual(request_obj.status, 'pending')
         self.assertEqual(str(request_obj), f'[대기중] {self.user.name} - LG 트윈스 vs 두산 베어스 ({request_obj.gameDate})')
+
+
+THROTTLE_TEST_SETTINGS = {
+    'RATES': {
+        '*': {'anon': None, 'senior': None, 'helper': None, 'staff': None},
+        'help_request_list': {'helper': '2/min'},
+        'login': {'anon': None},
+    },
+    'LOGIN_PHONE_RATE': '2/min',
+}
+
+
+@override_settings(TOKEN_BUCKET_THROTTLE=THROTTLE_TEST_SETTINGS)
+class ThrottleAPITestCase(APITestCase):
+    """토큰 버킷 Throttle 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+
+    def test_help_request_list_throttled_per_user(self):
+        """URL 별 역할 한도를 넘으면 429 와 Retry-After 반환"""
+        self.client.force_authenticate(self.helper_user)
+        for _ in range(2):
+            response = self.client.get(reverse('help_request_list'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(reverse('help_request_list'))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    def test_login_throttled_per_phone(self):
+        """같은 전화번호 로그인 시도는 별도 버킷으로 제한"""
+        data = {'phone': '01087654321', 'password': 'wrongpass'}
+        for _ in range(2):
+            response = self.client.post(reverse('login'), data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('login'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        other = {'phone': '01000000000', 'password': 'wrongpass'}
+        response = self.client.post(reverse('login'), other, format='json')
+        self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class IdempotencyAPITestCase(APITestCase):
+    """Idempotency-Key 재시도 처리 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        self.team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        self.game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=self.team1, awayTeam=self.team2, stadium='잠실야구장'
+        )
+        self.client.force_authenticate(self.senior_user)
+
+    def test_retried_create_is_replayed(self):
+        """같은 키로 재시도하면 요청이 한 번만 생성되고 첫 응답이 재생됨"""
+        data = {'teamId': self.team1.teamId, 'gameDate': str(self.game.date), 'numberOfTickets': 2}
+        first = self.client.post(reverse('request_create'), data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        second = self.client.post(reverse('request_create'), data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.json()['requestId'], first.json()['requestId'])
+        self.assertEqual(Request.objects.filter(userId=self.senior_user).count(), 1)
+
+    def test_complete_request_applies_mileage_once(self):
+        """완료 처리 재시도 시 마일리지가 중복 적립되지 않음"""
+        request_obj = Request.objects.create(userId=self.senior_user, game=self.game, status='SEAT_CONFIRMED')
+        url = reverse('complete_request', args=[request_obj.requestId])
+        for _ in range(2):
+            response = self.client.post(url, HTTP_IDEMPOTENCY_KEY='done-1')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.senior_user.refresh_from_db()
+        self.assertEqual(self.senior_user.mileagePoints, 10)
+
+    def test_key_reused_for_other_endpoint_is_rejected(self):
+        """다른 경로에 같은 키를 쓰면 422"""
+        request_obj = Request.objects.create(userId=self.senior_user, game=self.game, status='SEAT_CONFIRMED')
+        self.client.post(reverse('complete_request', args=[request_obj.requestId]), HTTP_IDEMPOTENCY_KEY='k')
+        response = self.client.post(
+            reverse('confirm_proposed_ticket', args=[request_obj.requestId]), HTTP_IDEMPOTENCY_KEY='k'
+        )
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_key_reused_with_other_body_is_rejected(self):
+        """같은 경로라도 본문이 다르면 첫 응답을 재생하지 않고 422"""
+        data = {'teamId': self.team1.teamId, 'gameDate': str(self.game.date), 'numberOfTickets': 2}
+        self.client.post(reverse('request_create'), data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        response = self.client.post(
+            reverse('request_create'), {**data, 'numberOfTickets': 4}, format='json', HTTP_IDEMPOTENCY_KEY='abc'
+        )
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Request.objects.filter(userId=self.senior_user).count(), 1)
+
+
+@override_settings(DELTA_SYNC_OVERLAP=timedelta(0))
+class DeltaSyncAPITestCase(APITestCase):
+    """?since 델타 동기화 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        self.game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.old_request = Request.objects.create(userId=self.senior_user, game=self.game)
+
+    def test_senior_delta_returns_changes_and_tombstones(self):
+        self.client.force_authenticate(self.senior_user)
+        initial = self.client.get(reverse('senior_my_requests_delta')).json()
+        self.assertEqual([row['id'] for row in initial['changed']], [self.old_request.requestId])
+
+        new_request = Request.objects.create(userId=self.senior_user, game=self.game)
+        self.client.delete(reverse('request_delete', args=[self.old_request.requestId]))
+
+        delta = self.client.get(reverse('senior_my_requests_delta'), {'since': initial['next']}).json()
+        self.assertEqual([row['id'] for row in delta['changed']], [new_request.requestId])
+        self.assertEqual(delta['removed'], [self.old_request.requestId])
+        self.assertNotEqual(delta['next'], initial['next'])
+
+    def test_help_request_delta_reports_requests_leaving_feed(self):
+        self.client.force_authenticate(self.helper_user)
+        initial = self.client.get(reverse('help_request_delta')).json()
+        self.assertEqual(len(initial['changed']), 1)
+
+        self.old_request.status = 'HELPER_MATCHED'
+        self.old_request.save()
+
+        delta = self.client.get(reverse('help_request_delta'), {'since': initial['next']}).json()
+        self.assertEqual(delta['changed'], [])
+        self.assertEqual(delta['removed'], [self.old_request.requestId])
+
+    def test_help_request_delta_removes_started_games(self):
+        """since 이후 시작한 경기의 요청은 changed 가 아니라 removed 로"""
+        self.client.force_authenticate(self.helper_user)
+        started = timezone.localtime() - timedelta(minutes=30)
+        Game.objects.filter(pk=self.game.pk).update(date=started.date(), time=started.time())
+        since = encode_token(timezone.now() - timedelta(hours=1))
+
+        delta = self.client.get(reverse('help_request_delta'), {'since': since}).json()
+        self.assertEqual(delta['changed'], [])
+        self.assertEqual(delta['removed'], [self.old_request.requestId])
+
+    @override_settings(DELTA_SYNC_MAX_REMOVED=0)
+    def test_too_many_removed_ids_resets(self):
+        """빠진 id 가 상한을 넘으면 전체 목록을 reset=true 로"""
+        self.client.force_authenticate(self.helper_user)
+        initial = self.client.get(reverse('help_request_delta')).json()
+        new_request = Request.objects.create(userId=self.senior_user, game=self.game)
+        Request.objects.filter(pk=self.old_request.pk).update(status='HELPER_MATCHED', updatedAt=timezone.now())
+
+        delta = self.client.get(reverse('help_request_delta'), {'since': initial['next']}).json()
+        self.assertTrue(delta['reset'])
+        self.assertEqual(delta['removed'], [])
+        self.assertEqual([row['id'] for row in delta['changed']], [new_request.requestId])
+
+    def test_invalid_token_is_rejected(self):
+        self.client.force_authenticate(self.helper_user)
+        response = self.client.get(reverse('help_request_delta'), {'since': '!!!'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BatchAPITestCase(APITestCase):
+    """배치 API 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+
+    def test_batch_dispatches_subrequests_once_authenticated(self):
+        self.client.force_authenticate(self.senior_user)
+        urls = ['/api/auth/user/', '/api/mypage/stats/', '/api/senior/requests/', '/api/teams/?x=1', '/api/helper/stats/x/']
+        response = self.client.post(reverse('batch'), {'requests': urls}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = response.json()['responses']
+        self.assertEqual([r['status'] for r in results], [200, 200, 200, 200, 404])
+        self.assertEqual(results[0]['body']['name'], '김시니어')
+        self.assertEqual(results[1]['body'], {'totalRequests': 0, 'completedRequests': 0})
+        self.assertEqual(len(results[3]['body']), 1)
+
+    def test_batch_respects_sub_view_permissions(self):
+        self.client.force_authenticate(self.senior_user)
+        response = self.client.post(reverse('batch'), {'requests': ['/api/helper/activities/']}, format='json')
+        self.assertEqual(response.json()['responses'][0]['status'], 403)
+
+    @override_settings(BATCH_MAX_SUBREQUESTS=2)
+    def test_batch_size_is_limited(self):
+        self.client.force_authenticate(self.senior_user)
+        response = self.client.post(reverse('batch'), {'requests': ['/api/teams/'] * 3}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_requires_authentication(self):
+        response = self.client.post(reverse('batch'), {'requests': ['/api/teams/']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ExportAPITestCase(APITestCase):
+    """운영용 스트리밍 내보내기 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.staff_user = User.objects.create_user(
+            phone='01000000000', password='testpass123', name='운영자', role='helper', is_staff=True
+        )
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        Request.objects.create(userId=self.senior_user, game=game)
+        Request.objects.create(userId=self.senior_user, game=game, status='CANCELLED')
+
+    def test_csv_export_streams_filtered_rows(self):
+        self.client.force_authenticate(self.staff_user)
+        response = self.client.get(reverse('export', args=['requests']), {'status': 'CANCELLED'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('requestId,'))
+        self.assertIn('CANCELLED', lines[1])
+
+    def test_gzip_ndjson_export(self):
+        import gzip
+        self.client.force_authenticate(self.staff_user)
+        response = self.client.get(reverse('export', args=['mileage']), {'output': 'ndjson', 'gzip': '1'})
+        rows = [json.loads(line) for line in gzip.decompress(b''.join(response.streaming_content)).splitlines()]
+        self.assertEqual({row['name'] for row in rows}, {'운영자', '김시니어'})
+
+    def test_export_is_staff_only(self):
+        self.client.force_authenticate(self.senior_user)
+        response = self.client.get(reverse('export', args=['requests']))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_date_is_rejected(self):
+        self.client.force_authenticate(self.staff_user)
+        for params in ({'from': 'abc'}, {'to': '2026-13-01'}):
+            response = self.client.get(reverse('export', args=['requests']), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for option in ('--from', '--to'):
+            with self.assertRaisesMessage(CommandError, 'YYYY-MM-DD'):
+                call_command('export_data', 'requests', option, '2026-13-01', stdout=StringIO())
+
+    def test_export_includes_archived_rows(self):
+        helper = User.objects.create_user(phone='01087654321', password='testpass123', name='이도우미', role='helper')
+        finished = Request.objects.filter(status='CANCELLED').get()
+        Proposal.objects.create(requestId=finished, helperId=helper, status='cancelled')
+        Request.objects.filter(pk=finished.pk).update(updatedAt=timezone.now() - timedelta(days=365))
+        call_command('archive_history', stdout=StringIO())
+        self.assertFalse(Request.objects.filter(pk=finished.pk).exists())
+
+        self.client.force_authenticate(self.staff_user)
+        for name, expected in (('requests', 2), ('proposals', 1)):
+            response = self.client.get(reverse('export', args=[name]), {'output': 'ndjson'})
+            rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+            self.assertEqual(len(rows), expected, name)
+        response = self.client.get(reverse('export', args=['requests']), {'status': 'CANCELLED'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith(f'{finished.pk},'))
+
+
+class OwnershipQueryCountTestCase(APITestCase):
+    """소유권 확인이 관련 User/Request 를 추가로 조회하지 않는지 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.request_obj = Request.objects.create(userId=self.senior_user, game=game, status='TICKET_PROPOSED')
+        self.proposal = Proposal.objects.create(requestId=self.request_obj, helperId=self.helper_user)
+
+    def test_reject_proposal_queries(self):
+        self.client.force_authenticate(self.senior_user)
+        # 조회 + UPDATE + 상태 이력 INSERT + 경기별 수요 카운터 UPDATE
+        with self.assertNumQueries(4):
+            response = self.client.post(reverse('reject_proposal', args=[self.proposal.proposalId]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_proposal_detail_single_query(self):
+        self.client.force_authenticate(self.helper_user)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('proposal_detail', args=[self.proposal.proposalId]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_non_owner_is_forbidden(self):
+        self.client.force_authenticate(self.helper_user)
+        response = self.client.post(reverse('accept_proposal', args=[self.proposal.proposalId]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_complete_request_credits_mileage(self):
+        self.request_obj.status = 'SEAT_CONFIRMED'
+        self.request_obj.save()
+        self.proposal.status = 'accepted'
+        self.proposal.save()
+        self.client.force_authenticate(self.senior_user)
+        self.client.post(reverse('complete_request', args=[self.request_obj.requestId]))
+        self.helper_user.refresh_from_db()
+        self.senior_user.refresh_from_db()
+        self.assertEqual((self.helper_user.mileagePoints, self.senior_user.mileagePoints), (20, 10))
+
+
+class RecommendationAPITestCase(APITestCase):
+    """헬퍼 추천 요청 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        lg = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        doosan = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        kt = Team.objects.create(name='KT 위즈', stadium='수원케이티위즈파크')
+        ssg = Team.objects.create(name='SSG 랜더스', stadium='인천SSG랜더스필드')
+        self.helper_user.profile.favorite_team = lg
+        self.helper_user.profile.save()
+        game_date = date.today() + timedelta(days=2)
+        self.lg_game = Game.objects.create(date=game_date, time=time(18, 30), homeTeam=lg, awayTeam=doosan, stadium='잠실야구장')
+        self.kt_game = Game.objects.create(date=game_date, time=time(18, 30), homeTeam=kt, awayTeam=ssg, stadium='수원케이티위즈파크')
+        self.kt_request = Request.objects.create(userId=self.senior_user, game=self.kt_game)
+        self.lg_request = Request.objects.create(userId=self.senior_user, game=self.lg_game)
+        self.client.force_authenticate(self.helper_user)
+
+    def test_favorite_team_ranks_first(self):
+        response = self.client.get(reverse('help_request_recommended'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.json()], [self.lg_request.requestId, self.kt_request.requestId])
+
+    def test_snapshot_is_refreshed_incrementally(self):
+        self.client.get(reverse('help_request_recommended'))
+        self.lg_request.status = 'HELPER_MATCHED'
+        self.lg_request.save()
+        new_request = Request.objects.create(userId=self.senior_user, game=self.lg_game)
+
+        response = self.client.get(reverse('help_request_recommended'))
+        self.assertEqual([row['id'] for row in response.json()], [new_request.requestId, self.kt_request.requestId])
+
+
+class AutoMatchTestCase(TestCase):
+    """자동 매칭 명령 테스트"""
+
+    def setUp(self):
+        senior = User.objects.create_user(phone='01012345678', password='testpass123', name='김시니어', role='senior')
+        lg = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        doosan = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        kt = Team.objects.create(name='KT 위즈', stadium='수원케이티위즈파크')
+        ssg = Team.objects.create(name='SSG 랜더스', stadium='인천SSG랜더스필드')
+        game_date = date.today() + timedelta(days=1)
+        lg_game = Game.objects.create(date=game_date, time=time(18, 30), homeTeam=lg, awayTeam=doosan, stadium='잠실야구장')
+        kt_game = Game.objects.create(date=game_date, time=time(18, 30), homeTeam=kt, awayTeam=ssg, stadium='수원케이티위즈파크')
+        self.lg_request = Request.objects.create(userId=senior, game=lg_game)
+        self.kt_request = Request.objects.create(userId=senior, game=kt_game)
+
+        self.kt_fan = User.objects.create_user(phone='01011112222', password='testpass123', name='KT팬', role='helper')
+        self.lg_fan = User.objects.create_user(phone='01033334444', password='testpass123', name='LG팬', role='helper')
+        for helper, team in ((self.kt_fan, kt), (self.lg_fan, lg)):
+            helper.profile.favorite_team = team
+            helper.profile.save()
+
+    def test_assigns_by_team_affinity(self):
+        call_command('auto_match', stdout=StringIO())
+
+        suggested = dict(Proposal.objects.filter(status='suggested').values_list('requestId', 'helperId'))
+        self.assertEqual(suggested, {
+            self.lg_request.requestId: self.lg_fan.pk,
+            self.kt_request.requestId: self.kt_fan.pk,
+        })
+
+        # 이미 제안이 있는 요청은 다시 배정하지 않음
+        call_command('auto_match', stdout=StringIO())
+        self.assertEqual(Proposal.objects.count(), 2)
+
+    def test_suggested_helper_can_propose(self):
+        """추천받은 헬퍼의 제안은 추천 행이 대기 중인 제안으로 바뀌어 시니어 비교표에 나타남"""
+        call_command('auto_match', stdout=StringIO())
+        client = APIClient()
+        client.force_authenticate(self.lg_fan)
+        response = client.post(
+            reverse('proposal_create', args=[self.lg_request.requestId]),
+            {'seatType': '1루 블루석', 'totalPrice': '3만원'}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        proposal = Proposal.objects.get(requestId=self.lg_request, helperId=self.lg_fan)
+        self.assertEqual((proposal.status, proposal.priceKrw), ('pending', 30000))
+        self.lg_request.refresh_from_db()
+        self.assertEqual(self.lg_request.status, 'TICKET_PROPOSED')
+
+        client.force_authenticate(self.lg_request.userId)
+        rows = client.get(reverse('proposal_compare', args=[self.lg_request.requestId])).json()
+        self.assertEqual([row['proposalId'] for row in rows], [proposal.proposalId])
+
+    def test_accept_and_decline_suggestion(self):
+        call_command('auto_match', stdout=StringIO())
+        client = APIClient()
+        kt_suggestion = Proposal.objects.get(requestId=self.kt_request)
+        lg_suggestion = Proposal.objects.get(requestId=self.lg_request)
+
+        client.force_authenticate(self.kt_fan)
+        response = client.post(reverse('accept_suggestion', args=[kt_suggestion.proposalId]), {'totalPrice': '2만원'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        kt_suggestion.refresh_from_db()
+        self.assertEqual(kt_suggestion.status, 'pending')
+        # 다른 헬퍼의 추천은 건드릴 수 없음
+        response = client.post(reverse('decline_suggestion', args=[lg_suggestion.proposalId]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        client.force_authenticate(self.lg_fan)
+        response = client.post(reverse('decline_suggestion', args=[lg_suggestion.proposalId]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lg_suggestion.refresh_from_db()
+        self.assertEqual(lg_suggestion.status, 'cancelled')
+
+        # 거절한 헬퍼에게는 다시 추천하지 않음
+        call_command('auto_match', stdout=StringIO())
+        self.assertFalse(
+            Proposal.objects.filter(requestId=self.lg_request, helperId=self.lg_fan, status='suggested').exists()
+        )
+
+    def test_solver_matches_brute_force(self):
+        import itertools
+        import numpy as np
+        from matching.automatch import solve_assignment
+        cost = np.random.default_rng(3).random((4, 6))
+        rows, cols = solve_assignment(cost)
+        best = min(sum(cost[i, j] for i, j in enumerate(perm)) for perm in itertools.permutations(range(6), 4))
+        self.assertAlmostEqual(cost[rows, cols].sum(), best)
+
+
+class ProposalPricingTestCase(APITestCase):
+    """제안 가격 구조화 / 가격순 정렬 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helpers = [
+            User.objects.create_user(phone=f'0109999000{i}', password='testpass123', name=f'도우미{i}', role='helper')
+            for i in range(3)
+        ]
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        self.game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.request_obj = Request.objects.create(userId=self.senior_user, game=self.game, numberOfTickets=2)
+
+    def test_parse_price_strings(self):
+        from matching.pricing import parse_price, parse_seat
+        self.assertEqual(parse_price('45,000원'), 45000)
+        self.assertEqual(parse_price('4만 5천원'), 45000)
+        self.assertEqual(parse_price('2장 30000원'), 30000)
+        self.assertIsNone(parse_price('가격 정보 없음'))
+        # 좌석 번호/구역/수량 숫자는 금액이 아님
+        self.assertEqual(parse_price('A구역 12번 45000원'), 45000)
+        self.assertEqual(parse_price('1루 블루석 2연석 3만원'), 30000)
+        self.assertIsNone(parse_price('12'))
+        self.assertIsNone(parse_price('99999999999원'))
+        self.assertEqual(parse_seat('1루 블루석'), ('1루', '블루석'))
+
+    def test_per_ticket_price(self):
+        from matching.pricing import structured_fields
+        self.assertEqual(
+            structured_fields('1루 블루석', '장당 2만원', 2),
+            {'priceKrw': 40000, 'pricePerTicket': 20000, 'seatSection': '1루', 'seatZone': '블루석'},
+        )
+        self.assertIsNone(structured_fields('', '장당 9000만원', 2)['priceKrw'])
+        # 총액과 장당 가격을 함께 적으면 각 표시어 옆의 금액을 사용
+        for text in ('총 5만원, 장당 2.5만원', '장당 2.5만원 합계 5만원', '2만5천원(장당), 총 50,000원'):
+            fields = structured_fields('1루', text, 2)
+            self.assertEqual((fields['priceKrw'], fields['pricePerTicket']), (50000, 25000), text)
+        fields = structured_fields('', '1인 2만원', 3)
+        self.assertEqual((fields['priceKrw'], fields['pricePerTicket']), (60000, 20000))
+
+    def test_create_parses_and_list_orders_by_price(self):
+        for helper, price in zip(self.helpers, ['6만원', '30,000원', '4만5천원']):
+            self.client.force_authenticate(helper)
+            self.client.post(
+                reverse('proposal_create', args=[self.request_obj.requestId]),
+                {'seatType': '1루 블루석', 'totalPrice': price}, format='json'
+            )
+        self.client.force_authenticate(self.senior_user)
+        response = self.client.get(
+            reverse('proposal_list', args=[self.request_obj.requestId]), {'ordering': 'price', 'max_price': 50000}
+        )
+        self.assertEqual([row['priceKrw'] for row in response.json()], [30000, 45000])
+        self.assertEqual(response.json()[0]['pricePerTicket'], 15000)
+
+        stats = self.client.get(reverse('game_price_stats', args=[self.game.gameId])).json()
+        self.assertEqual((stats['proposals'], stats['minPricePerTicket'], stats['maxPricePerTicket']), (3, 15000, 30000))
+
+    def test_backfill_command(self):
+        proposal = Proposal.objects.create(requestId=self.request_obj, helperId=self.helpers[0], totalPrice='5만원', seatType='3루 레드석')
+        call_command('backfill_proposal_prices', stdout=StringIO())
+        proposal.refresh_from_db()
+        self.assertEqual((proposal.priceKrw, proposal.pricePerTicket, proposal.seatZone), (50000, 25000, '레드석'))
+
+
+class ProposalComparisonAPITestCase(APITestCase):
+    """제안 비교 엔드포인트 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.veteran = User.objects.create_user(phone='01011110000', password='testpass123', name='베테랑', role='helper')
+        self.rookie = User.objects.create_user(phone='01022220000', password='testpass123', name='신입', role='helper')
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        for _ in range(3):
+            done = Request.objects.create(userId=self.senior_user, game=game, status='COMPLETED')
+            Proposal.objects.create(requestId=done, helperId=self.veteran, status='accepted')
+        self.request_obj = Request.objects.create(userId=self.senior_user, game=game, status='TICKET_PROPOSED')
+        self.cheap = Proposal.objects.create(requestId=self.request_obj, helperId=self.veteran, priceKrw=20000, pricePerTicket=20000)
+        self.pricey = Proposal.objects.create(requestId=self.request_obj, helperId=self.rookie, priceKrw=40000, pricePerTicket=40000)
+
+    def test_ranked_compact_rows_in_one_query(self):
+        self.client.force_authenticate(self.senior_user)
+        url = reverse('proposal_compare', args=[self.request_obj.requestId])
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        rows = response.json()
+        self.assertEqual([row['proposalId'] for row in rows], [self.cheap.proposalId, self.pricey.proposalId])
+        self.assertEqual(rows[0]['rank'], 1)
+        self.assertEqual(rows[0]['helperCompletedSessions'], 3)
+        self.assertNotIn('requestId', rows[0])
+
+    def test_completed_sessions_include_archived(self):
+        from matching import archive
+        done = Request.objects.filter(userId=self.senior_user, status='COMPLETED').first()
+        Request.objects.filter(pk=done.pk).update(updatedAt=timezone.now() - timedelta(days=365))
+        self.assertEqual(archive.archive_finished()['proposals'], 1)
+
+        self.client.force_authenticate(self.senior_user)
+        rows = self.client.get(reverse('proposal_compare', args=[self.request_obj.requestId])).json()
+        self.assertEqual(rows[0]['helperCompletedSessions'], 3)
+
+    def test_only_request_owner(self):
+        self.client.force_authenticate(self.rookie)
+        response = self.client.get(reverse('proposal_compare', args=[self.request_obj.requestId]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BulkTransitionAPITestCase(APITestCase):
+    """일괄 수락/거절/취소 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.other_senior = User.objects.create_user(
+            phone='01055556666', password='testpass123', name='박시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        self.game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.mine = [Request.objects.create(userId=self.senior_user, game=self.game, status='TICKET_PROPOSED') for _ in range(2)]
+        self.theirs = Request.objects.create(userId=self.other_senior, game=self.game, status='TICKET_PROPOSED')
+        self.proposals = [Proposal.objects.create(requestId=r, helperId=self.helper_user) for r in self.mine + [self.theirs]]
+        self.client.force_authenticate(self.senior_user)
+
+    def test_bulk_reject_reports_per_id(self):
+        ids = [p.proposalId for p in self.proposals] + [999999]
+        # SAVEPOINT/RELEASE + 조회 1번 + (이력용 id 조회 + UPDATE + 이력 INSERT + 수요 카운터 UPDATE)
+        with self.assertNumQueries(7):
+            response = self.client.post(reverse('bulk_reject_proposals'), {'proposalIds': ids}, format='json')
+        results = {row['id']: row['result'] for row in response.json()['results']}
+        self.assertEqual(list(results.values()), ['rejected', 'rejected', 'forbidden', 'not_found'])
+        self.assertEqual(Proposal.objects.filter(status='rejected').count(), 2)
+
+    def test_bulk_accept_matches_requests(self):
+        sibling = Proposal.objects.create(requestId=self.mine[0], helperId=self.other_senior)
+        ids = [self.proposals[0].proposalId, self.proposals[1].proposalId]
+        response = self.client.post(reverse('bulk_accept_proposals'), {'proposalIds': ids}, format='json')
+        self.assertEqual([row['result'] for row in response.json()['results']], ['accepted', 'accepted'])
+        self.assertEqual(set(Request.objects.filter(status='HELPER_MATCHED').values_list('pk', flat=True)), {r.pk for r in self.mine})
+        sibling.refresh_from_db()
+        self.assertEqual(sibling.status, 'rejected')
+
+    def test_cancel_all_my_requests_for_game(self):
+        response = self.client.post(reverse('bulk_cancel_requests'), {'gameId': self.game.gameId}, format='json')
+        self.assertEqual([row['result'] for row in response.json()['results']], ['cancelled', 'cancelled'])
+        self.assertEqual(Request.objects.get(pk=self.theirs.pk).status, 'TICKET_PROPOSED')
+        self.assertEqual(Proposal.objects.filter(requestId__in=self.mine, status='rejected').count(), 2)
+
+    def test_invalid_payload(self):
+        response = self.client.post(reverse('bulk_cancel_requests'), {'requestIds': ['a']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class GameCancellationTestCase(TestCase):
+    """경기 취소/재편성 일괄 처리 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        self.game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.new_game = Game.objects.create(
+            date=date.today() + timedelta(days=2), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.open_request = Request.objects.create(userId=self.senior_user, game=self.game, status='TICKET_PROPOSED')
+        self.done_request = Request.objects.create(userId=self.senior_user, game=self.game, status='COMPLETED')
+        self.proposal = Proposal.objects.create(requestId=self.open_request, helperId=self.helper_user)
+        self.done_proposal = Proposal.objects.create(requestId=self.done_request, helperId=self.helper_user, status='accepted')
+
+    def test_cancel_game(self):
+        out = StringIO()
+        call_command('cancel_game', self.game.gameId, '--reason', '우천 취소', stdout=out)
+        self.assertIn('1 requests, 1 proposals, 2 events', out.getvalue())
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.status, 'CANCELLED')
+        self.assertEqual(Request.objects.get(pk=self.open_request.pk).status, 'CANCELLED')
+        self.assertEqual(Request.objects.get(pk=self.done_request.pk).status, 'COMPLETED')
+        self.assertEqual(Proposal.objects.get(pk=self.proposal.pk).status, 'cancelled')
+        self.assertEqual(Proposal.objects.get(pk=self.done_proposal.pk).status, 'accepted')
+        recipients = set(OutboxEvent.objects.filter(topic='game.cancelled').values_list('recipientId', flat=True))
+        self.assertEqual(recipients, {self.senior_user.pk, self.helper_user.pk})
+
+    def test_reschedule_moves_open_requests(self):
+        call_command('cancel_game', self.game.gameId, '--reschedule-to', self.new_game.gameId, stdout=StringIO())
+        moved = Request.objects.get(pk=self.open_request.pk)
+        self.assertEqual((moved.game_id, moved.status), (self.new_game.gameId, 'WAITING_FOR_HELPER'))
+        self.assertEqual(Request.objects.get(pk=self.done_request.pk).game_id, self.game.gameId)
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.status, self.game.rescheduledTo_id), ('POSTPONED', self.new_game.gameId))
+        self.assertEqual(OutboxEvent.objects.filter(topic='game.rescheduled').count(), 2)
+
+    def test_cancel_twice_fails(self):
+        call_command('cancel_game', self.game.gameId, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('cancel_game', self.game.gameId, stdout=StringIO())
+
+    def test_reschedule_target_must_be_scheduled(self):
+        Game.objects.filter(pk=self.new_game.pk).update(status='CANCELLED')
+        self.new_game.refresh_from_db()
+        with self.assertRaises(CommandError):
+            call_command('cancel_game', self.game.gameId, '--reschedule-to', self.new_game.gameId, stdout=StringIO())
+        with self.assertRaises(ValueError):
+            games.cancel_game(self.game, reschedule_to=self.new_game)
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.status, 'SCHEDULED')
+
+    def test_no_new_requests_for_cancelled_game(self):
+        call_command('cancel_game', self.game.gameId, stdout=StringIO())
+        client = APIClient()
+        client.force_authenticate(self.senior_user)
+        data = {'teamId': self.game.homeTeam_id, 'gameDate': str(self.game.date), 'numberOfTickets': 1}
+        response = client.post(reverse('request_create'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RequestExpiryTestCase(APITestCase):
+    """지난 경기 요청 만료 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        past_game = Game.objects.create(
+            date=date.today() - timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        future_game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.stale = [
+            Request.objects.create(userId=self.senior_user, game=past_game, status=status)
+            for status in ('WAITING_FOR_HELPER', 'TICKET_PROPOSED', 'WAITING_FOR_HELPER')
+        ]
+        self.matched = Request.objects.create(userId=self.senior_user, game=past_game, status='HELPER_MATCHED')
+        self.upcoming = Request.objects.create(userId=self.senior_user, game=future_game)
+        self.proposal = Proposal.objects.create(requestId=self.stale[1], helperId=self.helper_user)
+
+    def test_expire_in_chunks(self):
+        out = StringIO()
+        call_command('expire_requests', '--chunk-size', '2', stdout=out)
+        self.assertIn('Expired 3 requests and cancelled 1 open proposals', out.getvalue())
+        self.assertEqual(Request.objects.filter(status='EXPIRED').count(), 3)
+        self.assertEqual(Request.objects.get(pk=self.matched.pk).status, 'HELPER_MATCHED')
+        self.assertEqual(Proposal.objects.get(pk=self.proposal.pk).status, 'cancelled')
+
+        # 다시 돌려도 추가로 바뀌는 행 없음
+        out = StringIO()
+        call_command('expire_requests', stdout=out)
+        self.assertIn('Expired 0 requests', out.getvalue())
+
+    def test_help_feed_hides_started_games(self):
+        self.client.force_authenticate(self.helper_user)
+        response = self.client.get(reverse('help_request_list'))
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        self.assertEqual([row['id'] for row in results], [self.upcoming.requestId])
+
+
+class ArchiveHistoryTestCase(APITestCase):
+    """끝난 요청 보관 + 내 요청/내 제안 목록 합치기 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        game = Game.objects.create(
+            date=date.today() - timedelta(days=400), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.old = Request.objects.create(userId=self.senior_user, game=game, status='COMPLETED')
+        self.old_proposal = Proposal.objects.create(requestId=self.old, helperId=self.helper_user, status='accepted')
+        self.recent = Request.objects.create(userId=self.senior_user, game=game, status='COMPLETED')
+        self.live = Request.objects.create(userId=self.senior_user, game=game, status='HELPER_MATCHED')
+        long_ago = timezone.now() - timedelta(days=365)
+        Request.objects.filter(pk__in=[self.old.pk, self.live.pk]).update(updatedAt=long_ago)
+        Request.objects.filter(pk=self.old.pk).update(createdAt=long_ago)
+
+    def test_archive_moves_only_old_finished_rows(self):
+        out = StringIO()
+        call_command('archive_history', '--chunk-size', '1', stdout=out)
+        self.assertIn('Archived 1 requests and 1 proposals', out.getvalue())
+        self.assertFalse(Request.objects.filter(pk=self.old.pk).exists())
+        self.assertEqual(set(Request.objects.values_list('pk', flat=True)), {self.recent.pk, self.live.pk})
+        archived = ArchivedRequest.objects.get(pk=self.old.pk)
+        self.assertEqual((archived.status, archived.userId_id), ('COMPLETED', self.senior_user.pk))
+        self.assertEqual(ArchivedProposal.objects.get(pk=self.old_proposal.pk).requestId_id, self.old.pk)
+
+    def test_history_lists_union_hot_and_archived(self):
+        call_command('archive_history', stdout=StringIO())
+        self.client.force_authenticate(self.senior_user)
+        response = self.client.get(reverse('senior_my_requests'))
+        self.assertEqual([row['id'] for row in response.data], [self.live.pk, self.recent.pk, self.old.pk])
+        self.assertEqual(response.data[-1]['helperName'], '이도우미')
+
+    def test_history_skips_rows_moved_during_listing(self):
+        """키 조회 뒤 in_bulk 전에 보관된 행은 500 대신 건너뜀"""
+        from django.db.models.query import QuerySet
+        in_bulk = QuerySet.in_bulk
+
+        def archive_in_between(queryset, *args, **kwargs):
+            Request.objects.filter(pk=self.recent.pk).delete()
+            return in_bulk(queryset, *args, **kwargs)
+
+        self.client.force_authenticate(self.senior_user)
+        with mock.patch.object(QuerySet, 'in_bulk', archive_in_between):
+            response = self.client.get(reverse('senior_my_requests'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data], [self.live.pk, self.old.pk])
+
+        self.client.force_authenticate(self.helper_user)
+        response = self.client.get(reverse('helper_my_activities'))
+        self.assertEqual(response.data[0]['proposalId'], self.old_proposal.pk)
+        self.assertEqual(response.data[0]['request']['requestId'], self.old.pk)
+
+        response = self.client.get(reverse('my_stats'))
+        self.assertEqual(response.data['totalSessionsCompleted'], 1)
+
+    def test_archive_unindexes_in_bulk(self):
+        """보관할 때 검색 색인은 청크마다 종류별 DELETE 한 번으로 지움"""
+        from matching import archive
+        requests = [
+            Request.objects.create(userId=self.senior_user, game=self.old.game, status='COMPLETED', additionalInfo=f'메모{i}')
+            for i in range(5)
+        ]
+        proposals = [Proposal.objects.create(requestId=r, helperId=self.helper_user, message='메시지') for r in requests]
+        Request.objects.filter(pk__in=[r.pk for r in requests]).update(updatedAt=timezone.now() - timedelta(days=365))
+        self.assertTrue(SearchTerm.objects.filter(kind=search.KIND_PROPOSAL, objectId__in=[p.pk for p in proposals]).exists())
+
+        with CaptureQueriesContext(connection) as queries:
+            archive.archive_finished()
+        deletes = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('DELETE FROM "matching_searchterm"')]
+        self.assertEqual(len(deletes), 2)
+        self.assertFalse(SearchTerm.objects.filter(kind=search.KIND_REQUEST, objectId__in=[r.pk for r in requests]).exists())
+        self.assertFalse(SearchTerm.objects.filter(kind=search.KIND_PROPOSAL, objectId__in=[p.pk for p in proposals]).exists())
+
+
+class FailingSink:
+    def accepts(self, topic):
+        return True
+
+    def deliver(self, event):
+        raise RuntimeError('push service down')
+
+
+@override_settings(OUTBOX={'SINKS': ['matching.outbox.LocalSink'], 'WORKERS': 2, 'BATCH_SIZE': 2})
+class OutboxWorkerTestCase(APITestCase):
+    """아웃박스 기록 + 워커 전달 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        outbox.LocalSink.delivered.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.request_obj = Request.objects.create(userId=self.senior_user, game=game, status='TICKET_PROPOSED')
+        self.proposal = Proposal.objects.create(requestId=self.request_obj, helperId=self.helper_user)
+        self.client.force_authenticate(self.senior_user)
+
+    def test_status_change_writes_event_and_worker_delivers(self):
+        self.client.post(reverse('accept_proposal', args=[self.proposal.proposalId]))
+        event = OutboxEvent.objects.get(topic='proposal.accepted')
+        self.assertEqual(event.recipientId, self.helper_user.pk)
+        self.assertIsNone(event.processedAt)
+
+        out = StringIO()
+        call_command('run_outbox_worker', '--once', stdout=out)
+        self.assertIn('Delivered 1 events, 0 failed', out.getvalue())
+        self.assertEqual(outbox.LocalSink.delivered, [('proposal.accepted', self.helper_user.pk, event.payload)])
+        event.refresh_from_db()
+        self.assertIsNotNone(event.processedAt)
+
+    def test_claims_do_not_overlap(self):
+        for i in range(3):
+            outbox.publish('test', i)
+        first, second, third = outbox.claim(), outbox.claim(), outbox.claim()
+        self.assertEqual((len(first), len(second), third), (2, 1, []))
+        self.assertFalse({e.pk for e in first} & {e.pk for e in second})
+
+    def test_failed_delivery_is_retried_after_lease(self):
+        event = outbox.publish('test', self.helper_user.pk)
+        totals = outbox.run(once=True, sinks=[FailingSink()])
+        self.assertEqual(totals, {'delivered': 0, 'failed': 1, 'dead': 0})
+        event.refresh_from_db()
+        self.assertEqual((event.attempts, event.processedAt), (1, None))
+        self.assertIn('push service down', event.lastError)
+        self.assertEqual(outbox.claim(), [])
+
+        with self.settings(OUTBOX={'SINKS': ['matching.outbox.LocalSink'], 'LEASE': timedelta(0)}):
+            self.assertEqual(outbox.run(once=True), {'delivered': 1, 'failed': 0, 'dead': 0})
+        event.refresh_from_db()
+        self.assertEqual((event.attempts, event.lastError), (2, ''))
+        self.assertIsNotNone(event.processedAt)
+
+    def test_exhausted_event_is_dead_lettered_and_requeued(self):
+        event = outbox.publish('test', self.helper_user.pk)
+        with self.settings(OUTBOX={'MAX_ATTEMPTS': 1}), self.assertLogs('matching.outbox', 'ERROR') as logs:
+            totals = outbox.run(once=True, sinks=[FailingSink()])
+            self.assertEqual(totals, {'delivered': 0, 'failed': 1, 'dead': 1})
+            self.assertEqual(list(outbox.dead_lettered()), [event])
+            self.assertTrue(any('dead-lettered' in line for line in logs.output))
+
+            out, err = StringIO(), StringIO()
+            call_command('run_outbox_worker', '--once', '--requeue-dead', stdout=out, stderr=err)
+        self.assertIn('Requeued 1 dead-lettered events', out.getvalue())
+        self.assertIn('Delivered 1 events', out.getvalue())
+        self.assertEqual(err.getvalue(), '')
+
+
+class StatusEventLogTestCase(APITestCase):
+    """상태 변경 이력 기록 + 집계 + NDJSON 내보내기 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        self.staff_user = User.objects.create_user(
+            phone='01000000000', password='testpass123', name='운영자', role='helper', is_staff=True
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        self.game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.request_obj = Request.objects.create(userId=self.senior_user, game=self.game)
+
+    def _codes(self, kind, object_id):
+        return list(StatusEvent.objects.filter(kind=kind, objectId=object_id).order_by('id').values_list('toStatus', flat=True))
+
+    def test_transitions_are_logged_with_actor(self):
+        codes = events.STATUS_CODES
+        proposal = Proposal.objects.create(requestId=self.request_obj, helperId=self.helper_user)
+        other = Proposal.objects.create(requestId=self.request_obj, helperId=self.staff_user)
+        Request.objects.filter(pk=self.request_obj.pk).update(status='TICKET_PROPOSED')
+
+        # 상태가 안 바뀐 저장은 기록하지 않음
+        loaded = Proposal.objects.get(pk=proposal.pk)
+        with self.assertNumQueries(1):
+            loaded.save()
+
+        self.client.force_authenticate(self.senior_user)
+        self.client.post(reverse('accept_proposal', args=[proposal.proposalId]))
+
+        self.assertEqual(self._codes(events.KIND_REQUEST, self.request_obj.pk), [
+            codes[events.KIND_REQUEST]['WAITING_FOR_HELPER'], codes[events.KIND_REQUEST]['HELPER_MATCHED'],
+        ])
+        self.assertEqual(self._codes(events.KIND_PROPOSAL, proposal.pk), [
+            codes[events.KIND_PROPOSAL]['pending'], codes[events.KIND_PROPOSAL]['accepted'],
+        ])
+        self.assertEqual(self._codes(events.KIND_PROPOSAL, other.pk)[-1], codes[events.KIND_PROPOSAL]['rejected'])
+        matched = StatusEvent.objects.get(kind=events.KIND_REQUEST, toStatus=codes[events.KIND_REQUEST]['HELPER_MATCHED'])
+        self.assertEqual((matched.actorId, matched.requestId), (self.senior_user.pk, self.request_obj.pk))
+
+    def test_bulk_transition_logs_each_row(self):
+        proposals = [Proposal.objects.create(requestId=self.request_obj, helperId=self.helper_user) for _ in range(3)]
+        # 조회 + UPDATE + 이력 INSERT + 경기별 수요 카운터 UPDATE (경기당 1번)
+        with self.assertNumQueries(4):
+            updated = events.transition(Proposal.objects.filter(requestId=self.request_obj), 'rejected', updatedAt=timezone.now())
+        self.assertEqual(updated, 3)
+        rejected = events.STATUS_CODES[events.KIND_PROPOSAL]['rejected']
+        self.assertEqual(StatusEvent.objects.filter(toStatus=rejected, kind=events.KIND_PROPOSAL).count(), 3)
+        self.assertTrue(all(self._codes(events.KIND_PROPOSAL, p.pk)[-1] == rejected for p in proposals))
+
+    def test_no_op_transitions_are_not_logged(self):
+        """이미 끝난 제안은 수락 시 나머지 제안 거절에 포함되지 않음 (rejected→rejected, cancelled→rejected 기록 없음)"""
+        proposal = Proposal.objects.create(requestId=self.request_obj, helperId=self.helper_user)
+        rejected = Proposal.objects.create(requestId=self.request_obj, helperId=self.staff_user, status='rejected')
+        cancelled = Proposal.objects.create(requestId=self.request_obj, helperId=self.senior_user, status='cancelled')
+        Request.objects.filter(pk=self.request_obj.pk).update(status='TICKET_PROPOSED')
+        self.client.force_authenticate(self.senior_user)
+        self.client.post(reverse('accept_proposal', args=[proposal.proposalId]))
+
+        codes = events.STATUS_CODES[events.KIND_PROPOSAL]
+        self.assertEqual(self._codes(events.KIND_PROPOSAL, rejected.pk), [codes['rejected']])
+        self.assertEqual(self._codes(events.KIND_PROPOSAL, cancelled.pk), [codes['cancelled']])
+        self.assertEqual(Proposal.objects.get(pk=cancelled.pk).status, 'cancelled')
+        self.assertEqual(events.transition(Proposal.objects.filter(pk=rejected.pk), 'rejected'), 0)
+
+    def test_metrics_and_ndjson_export(self):
+        created = StatusEvent.objects.get(kind=events.KIND_REQUEST, objectId=self.request_obj.pk)
+        StatusEvent.objects.filter(pk=created.pk).update(at=timezone.now() - timedelta(minutes=10))
+        Proposal.objects.create(requestId=self.request_obj, helperId=self.helper_user)
+
+        self.client.force_authenticate(self.staff_user)
+        response = self.client.get(reverse('status_event_metrics'))
+        self.assertEqual(response.data['requests'], 1)
+        self.assertEqual(response.data['timeToFirstProposal']['count'], 1)
+        self.assertGreaterEqual(response.data['timeToFirstProposal']['median'], 600)
+        self.assertEqual(response.data['timeToMatch']['count'], 0)
+
+        response = self.client.get(reverse('export', args=['status-events']), {'output': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([(row['kind'], row['requestId']) for row in rows], [
+            (events.KIND_REQUEST, self.request_obj.pk), (events.KIND_PROPOSAL, self.request_obj.pk),
+        ])
+
+
+class FunnelRollupTestCase(APITestCase):
+    """퍼널 증분 집계 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        self.staff_user = User.objects.create_user(
+            phone='01000000000', password='testpass123', name='운영자', role='helper', is_staff=True
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        self.game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.requests = [Request.objects.create(userId=self.senior_user, game=self.game) for _ in range(3)]
+        self.proposal = Proposal.objects.create(requestId=self.requests[0], helperId=self.helper_user)
+
+    def test_incremental_updates_match_rebuild(self):
+        call_command('update_funnel_rollups', stdout=StringIO())
+        today = DailyFunnel.objects.get(day=timezone.localdate())
+        self.assertEqual((today.requestsCreated, today.proposalsMade, today.matches), (3, 1, 0))
+
+        request_obj = self.requests[0]
+        request_obj.status = 'HELPER_MATCHED'
+        request_obj.save()
+        self.requests[1].status = 'CANCELLED'
+        self.requests[1].save()
+        out = StringIO()
+        call_command('update_funnel_rollups', '--batch-size', '1', stdout=out)
+        self.assertIn('Processed 2 status events', out.getvalue())
+
+        today.refresh_from_db()
+        self.assertEqual((today.requestsCreated, today.matches, today.cancellations), (3, 1, 1))
+        self.assertIsNotNone(today.medianTimeToMatch)
+        game_row = GameFunnel.objects.get(game=self.game)
+        self.assertEqual((game_row.requestsCreated, game_row.matches), (3, 1))
+
+        # 아무 변화 없이 다시 돌려도 값이 그대로
+        call_command('update_funnel_rollups', stdout=StringIO())
+        before = list(DailyFunnel.objects.values())
+        call_command('update_funnel_rollups', '--rebuild', stdout=StringIO())
+        self.assertEqual(list(DailyFunnel.objects.values()), before)
+
+    def test_rescheduled_request_is_not_counted_twice(self):
+        new_game = Game.objects.create(
+            date=date.today() + timedelta(days=2), time=time(18, 30),
+            homeTeam=self.game.homeTeam, awayTeam=self.game.awayTeam, stadium='잠실야구장'
+        )
+        games.cancel_game(self.game, reschedule_to=new_game)
+        call_command('update_funnel_rollups', stdout=StringIO())
+        self.assertEqual(DailyFunnel.objects.get(day=timezone.localdate()).requestsCreated, 3)
+
+    def test_dashboard_reads_rollups(self):
+        call_command('update_funnel_rollups', stdout=StringIO())
+        self.client.force_authenticate(self.staff_user)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('funnel_dashboard'), {'by': 'game'})
+        self.assertEqual(response.data['rows'][0]['game_id'], self.game.gameId)
+        self.assertEqual(response.data['rows'][0]['requestsCreated'], 3)
+        response = self.client.get(reverse('funnel_dashboard'), {'by': 'week'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for params in ({'from': 'abc'}, {'by': 'game', 'to': '2026-13-01'}):
+            response = self.client.get(reverse('funnel_dashboard'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('status_event_metrics'), {'from': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_suggestions_are_not_counted_as_proposals(self):
+        suggestion = Proposal.objects.create(requestId=self.requests[1], helperId=self.staff_user, status='suggested')
+        call_command('update_funnel_rollups', stdout=StringIO())
+        self.assertEqual(DailyFunnel.objects.get(day=timezone.localdate()).proposalsMade, 1)
+        self.assertEqual(events.timing_summary()['timeToFirstProposal']['count'], 1)
+
+        # 헬퍼가 추천을 수락하면 그때 제안으로 셈
+        suggestion.status = 'pending'
+        suggestion.save()
+        call_command('update_funnel_rollups', stdout=StringIO())
+        self.assertEqual(DailyFunnel.objects.get(day=timezone.localdate()).proposalsMade, 2)
+
+    def test_late_committed_event_is_counted(self):
+        """워터마크보다 낮은 id 의 이벤트가 나중에 커밋되어도 집계에 반영"""
+        call_command('update_funnel_rollups', stdout=StringIO())
+        late_request = Request.objects.create(userId=self.senior_user, game=self.game)
+        Request.objects.create(userId=self.senior_user, game=self.game)
+        # 먼저 INSERT 했지만 아직 커밋되지 않은 트랜잭션의 이벤트를 흉내냄
+        late_event = StatusEvent.objects.get(kind=events.KIND_REQUEST, objectId=late_request.pk)
+        late_id = late_event.id
+        late_event.delete()
+        call_command('update_funnel_rollups', stdout=StringIO())
+        self.assertEqual(DailyFunnel.objects.get(day=timezone.localdate()).requestsCreated, 4)
+        watermark = RollupWatermark.objects.get(name=funnel.WATERMARK)
+        self.assertGreater(watermark.lastEventId, late_id)
+        self.assertEqual([gap[:2] for gap in watermark.pendingGaps], [[late_id, late_id]])
+
+        late_event.id = late_id
+        late_event.save()
+        out = StringIO()
+        call_command('update_funnel_rollups', stdout=out)
+        self.assertIn('Processed 1 status events', out.getvalue())
+        self.assertEqual(DailyFunnel.objects.get(day=timezone.localdate()).requestsCreated, 5)
+        self.assertEqual(GameFunnel.objects.get(game=self.game).requestsCreated, 5)
+        self.assertEqual(RollupWatermark.objects.get(name=funnel.WATERMARK).pendingGaps, [])
+
+
+class LeaderboardAPITestCase(APITestCase):
+    """헬퍼 리더보드 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.helpers = [
+            User.objects.create_user(phone=f'0109000000{i}', password='testpass123', name=f'도우미{i}', role='helper', mileagePoints=points)
+            for i, points in enumerate([50, 120, 80, 80])
+        ]
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior', mileagePoints=999
+        )
+
+    def test_top_and_my_rank(self):
+        self.client.force_authenticate(self.helpers[0])
+        response = self.client.get(reverse('helper_leaderboard'))
+        self.assertEqual(
+            [(row['name'], row['rank']) for row in response.data['top']],
+            [('도우미1', 1), ('도우미2', 2), ('도우미3', 2), ('도우미0', 4)],
+        )
+        self.assertEqual(response.data['me']['rank'], 4)
+
+        # 캐시된 상위 목록은 쿼리 없이, 본인 순위 카운트 1번 + 완료 횟수 2번
+        with self.assertNumQueries(3):
+            self.client.get(reverse('helper_leaderboard'), {'limit': 2})
+
+    def test_mileage_change_refreshes_cache(self):
+        self.client.force_authenticate(self.senior_user)
+        self.client.get(reverse('helper_leaderboard'))
+        helper = self.helpers[0]
+        helper.mileagePoints = 500
+        helper.save()
+        response = self.client.get(reverse('helper_leaderboard'))
+        self.assertEqual(response.data['top'][0]['helperId'], helper.pk)
+        self.assertNotIn('me', response.data)
+
+
+class GameDemandTestCase(APITestCase):
+    """경기별 수요 카운터 테스트"""
+
+    def setUp(self):
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.helper_user = User.objects.create_user(
+            phone='01087654321', password='testpass123', name='이도우미', role='helper'
+        )
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        self.game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.new_game = Game.objects.create(
+            date=date.today() + timedelta(days=2), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+
+    def counts(self, game):
+        row = GameDemand.objects.get(game=game)
+        return {field: getattr(row, field) for field in demand.COUNTERS}
+
+    def test_counters_follow_status_changes(self):
+        request_obj = Request.objects.create(userId=self.senior_user, game=self.game, numberOfTickets=2)
+        other = Request.objects.create(userId=self.senior_user, game=self.game, numberOfTickets=1)
+        self.assertEqual(self.counts(self.game), {
+            'waitingRequests': 2, 'waitingTickets': 3, 'proposedRequests': 0, 'proposedTickets': 0, 'openProposals': 0,
+        })
+
+        request_obj.status = 'TICKET_PROPOSED'
+        request_obj.save()
+        proposal = Proposal.objects.create(requestId=request_obj, helperId=self.helper_user)
+        self.assertEqual(self.counts(self.game), {
+            'waitingRequests': 1, 'waitingTickets': 1, 'proposedRequests': 1, 'proposedTickets': 2, 'openProposals': 1,
+        })
+
+        self.client.force_authenticate(self.senior_user)
+        self.client.post(reverse('accept_proposal', args=[proposal.proposalId]))
+        other.delete()
+        self.assertEqual(self.counts(self.game), dict.fromkeys(demand.COUNTERS, 0))
+
+    def test_reschedule_moves_counters(self):
+        Request.objects.create(userId=self.senior_user, game=self.game, numberOfTickets=2, status='TICKET_PROPOSED')
+        games.cancel_game(self.game, reschedule_to=self.new_game)
+        self.assertEqual(self.counts(self.game)['proposedRequests'], 0)
+        self.assertEqual(self.counts(self.new_game)['waitingRequests'], 1)
+        self.assertEqual(self.counts(self.new_game)['waitingTickets'], 2)
+
+    def test_reconcile_fixes_drift(self):
+        Request.objects.create(userId=self.senior_user, game=self.game, numberOfTickets=2)
+        GameDemand.objects.filter(game=self.game).update(waitingRequests=7, openProposals=3)
+        GameDemand.objects.filter(game=self.new_game).delete()
+        out = StringIO()
+        call_command('reconcile_game_demand', stdout=out)
+        self.assertIn('2 games', out.getvalue())
+        self.assertEqual(self.counts(self.game)['waitingRequests'], 1)
+        self.assertEqual(self.counts(self.game)['openProposals'], 0)
+        self.assertEqual(self.counts(self.new_game), dict.fromkeys(demand.COUNTERS, 0))
+
+    def test_demand_endpoint_and_feed_filter(self):
+        Request.objects.create(userId=self.senior_user, game=self.game, numberOfTickets=2)
+        Request.objects.create(userId=self.senior_user, game=self.game, numberOfTickets=1, status='TICKET_PROPOSED')
+        Request.objects.create(userId=self.senior_user, game=self.new_game)
+        Request.objects.create(userId=self.senior_user, game=self.new_game)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('game_demand'))
+        self.assertEqual([row['gameId'] for row in response.data], [self.game.gameId, self.new_game.gameId])
+        self.assertEqual(response.data[0]['homeTeam'], 'LG 트윈스')
+        self.assertEqual(response.data[0]['coverage'], 0.5)
+        self.assertEqual(response.data[1]['coverage'], 0.0)
+
+        self.client.force_authenticate(self.helper_user)
+        response = self.client.get(reverse('help_request_list'), {'minWaiting': 2})
+        self.assertEqual({row['gameDate'] for row in response.data}, {str(self.new_game.date)})
+        self.assertEqual(len(response.data), 2)
+
+
+class GameCalendarAPITestCase(APITestCase):
+    """월간 경기 일정 API 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.lg = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        self.doosan = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        self.kt = Team.objects.create(name='KT 위즈', stadium='수원KT위즈파크')
+        self.games = [
+            Game.objects.create(date=date(2026, 5, day), time=time(18, 30), homeTeam=home, awayTeam=away, stadium=home.stadium)
+            for day, home, away in [(2, self.lg, self.doosan), (3, self.kt, self.lg), (1, self.doosan, self.kt)]
+        ]
+        Game.objects.create(date=date(2026, 6, 1), time=time(18, 30), homeTeam=self.lg, awayTeam=self.kt, stadium='잠실야구장')
+
+    def test_month_payload_and_cache(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('game_calendar'), {'month': '2026-05'})
+        self.assertEqual([game['date'] for game in response.data['games']], ['2026-05-01', '2026-05-02', '2026-05-03'])
+        self.assertEqual(len(response.data['teams']), 3)
+        first = response.data['games'][0]
+        self.assertEqual(response.data['teams'][str(first['homeTeam'])]['name'], '두산 베어스')
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('game_calendar'), {'month': '2026-05'})
+
+        # 경기가 바뀌면 버전이 올라가 다시 조회
+        self.games[0].time = time(17, 0)
+        self.games[0].save()
+        response = self.client.get(reverse('game_calendar'), {'month': '2026-05'})
+        self.assertEqual(response.data['games'][1]['time'], '17:00')
+
+    def test_counts_and_bad_month(self):
+        Request.objects.create(userId=self.senior_user, game=self.games[1])
+        Request.objects.create(userId=self.senior_user, game=self.games[1])
+        self.client.get(reverse('game_calendar'), {'month': '2026-05'})
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('game_calendar'), {'month': '2026-05', 'counts': '1'})
+        self.assertEqual([game['waitingRequests'] for game in response.data['games']], [0, 0, 2])
+
+        response = self.client.get(reverse('game_calendar'), {'month': '2026-13'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SearchAPITestCase(APITestCase):
+    """검색 색인 / API 테스트"""
+
+    def setUp(self):
+        self.senior_user = User.objects.create_user(
+            phone='01012345678', password='testpass123', name='김시니어', role='senior'
+        )
+        self.staff_user = User.objects.create_user(
+            phone='01000000000', password='testpass123', name='운영자', role='helper', is_staff=True
+        )
+        self.doosan = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        self.lg = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        self.ssg = Team.objects.create(name='SSG 랜더스', stadium='인천SSG랜더스필드')
+        self.game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=self.doosan, awayTeam=self.lg, stadium='잠실야구장'
+        )
+        self.request_obj = Request.objects.create(userId=self.senior_user, game=self.game, additionalInfo='휠체어 이용합니다')
+
+    def names(self, response):
+        return [row['name'] for row in response.data['results']]
+
+    def test_jamo_normalization(self):
+        self.assertEqual(search.to_jamo('두산'), 'ㄷㅜㅅㅏㄴ')
+        # 겹모음/겹받침은 쪼개서 입력 중인 글자와도 접두어로 맞음
+        self.assertTrue(search.to_jamo('과').startswith(search.to_jamo('고')))
+        self.assertTrue(search.to_jamo('닭').startswith(search.to_jamo('달')))
+
+    def test_prefix_and_ranking(self):
+        self.assertEqual(self.names(self.client.get(reverse('search'), {'q': '두사'})), ['두산 베어스'])
+        self.assertEqual(self.names(self.client.get(reverse('search'), {'q': '랜더스'})), ['SSG 랜더스'])
+        # 여러 검색어는 모두 맞아야 하고, 홈구장 중간 음절부터 시작하는 검색어도 찾음 (동점이면 id 순)
+        self.assertEqual(self.names(self.client.get(reverse('search'), {'q': '잠실'})), ['두산 베어스', 'LG 트윈스'])
+        self.assertEqual(self.names(self.client.get(reverse('search'), {'q': '잠실 트윈'})), ['LG 트윈스'])
+        self.assertEqual(self.names(self.client.get(reverse('search'), {'q': '구장'})), ['두산 베어스', 'LG 트윈스'])
+
+        with self.assertNumQueries(2):
+            self.client.get(reverse('search'), {'q': '잠실'})
+
+    def test_intersection_is_not_cut_by_posting_cap(self):
+        """흔한 토큰의 posting 이 상한을 넘어도 다른 토큰과 함께 맞는 문서는 찾음"""
+        for i in range(5):
+            Team.objects.create(name=f'야구단{i}', stadium='잠실야구장')
+        with mock.patch.object(search, 'MAX_POSTINGS', 2):
+            ranked = search.search('잠실 트윈')
+        self.assertEqual([object_id for _, object_id, _ in ranked], [self.lg.pk])
+
+    def test_notes_are_staff_only_and_follow_saves(self):
+        response = self.client.get(reverse('search'), {'q': '휠체어', 'type': 'request'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(self.staff_user)
+        response = self.client.get(reverse('search'), {'q': '휠체'})
+        self.assertEqual([(row['type'], row['id']) for row in response.data['results']], [('request', self.request_obj.pk)])
+
+        # 상태만 바뀌는 저장은 색인을 건드리지 않음
+        with CaptureQueriesContext(connection) as queries:
+            self.request_obj.status = 'TICKET_PROPOSED'
+            self.request_obj.save()
+        self.assertFalse(any('matching_searchterm' in query['sql'] for query in queries))
+        self.request_obj.additionalInfo = '유모차 동반'
+        self.request_obj.save()
+        self.assertEqual(self.client.get(reverse('search'), {'q': '휠체어'}).data['results'], [])
+        self.assertEqual(len(self.client.get(reverse('search'), {'q': '유모차'}).data['results']), 1)
+
+        self.request_obj.delete()
+        self.assertFalse(SearchTerm.objects.filter(kind=search.KIND_REQUEST).exists())
+
+    def test_rebuild_command(self):
+        SearchTerm.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('3 teams, 1 requests, 0 proposals', out.getvalue())
+        self.assertEqual(self.names(self.client.get(reverse('search'), {'q': '베어스'})), ['두산 베어스'])
+
+
+class AdminChangelistTestCase(TestCase):
+    """관리자 목록 화면 쿼리 수 / 카운트 테스트"""
+
+    def setUp(self):
+        self.staff_user = User.objects.create_superuser(phone='01000000000', password='testpass123', name='운영자', role='helper')
+        self.client.force_login(self.staff_user)
+        team1 = Team.objects.create(name='LG 트윈스', stadium='잠실야구장')
+        team2 = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+        game = Game.objects.create(
+            date=date.today() + timedelta(days=1), time=time(18, 30),
+            homeTeam=team1, awayTeam=team2, stadium='잠실야구장'
+        )
+        self.helper_user = User.objects.create_user(phone='01087654321', password='testpass123', name='이도우미', role='helper')
+
+        def add_rows(n):
+            for i in range(n):
+                senior = User.objects.create_user(phone=f'0101111{len(self.requests):04d}', password='x', name=f'시니어{i}', role='senior')
+                request_obj = Request.objects.create(userId=senior, game=game)
+                self.requests.append(request_obj)
+                Proposal.objects.create(requestId=request_obj, helperId=self.helper_user)
+
+        self.requests = []
+        self.add_rows = add_rows
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        for name in ('admin:matching_request_changelist', 'admin:matching_proposal_changelist'):
+            self.add_rows(2)
+            few = self.changelist_queries(reverse(name))
+            self.add_rows(5)
+            self.assertEqual(self.changelist_queries(reverse(name)), few, name)
+
+    def test_numeric_search_hits_primary_key(self):
+        self.add_rows(3)
+        target = self.requests[1]
+        response = self.client.get(reverse('admin:matching_request_changelist'), {'q': str(target.pk)})
+        self.assertEqual([obj.pk for obj in response.context['cl'].result_list], [target.pk])
+        response = self.client.get(reverse('admin:matching_request_changelist'), {'q': '시니어2'})
+        self.assertEqual([obj.pk for obj in response.context['cl'].result_list], [self.requests[2].pk])
+
+    def test_numeric_search_still_matches_phone_prefix(self):
+        self.add_rows(3)
+        response = self.client.get(reverse('admin:matching_user_changelist'), {'q': '01087654321'})
+        self.assertEqual([obj.pk for obj in response.context['cl'].result_list], [self.helper_user.pk])
+        response = self.client.get(reverse('admin:matching_request_changelist'), {'q': '01011110001'})
+        self.assertEqual([obj.pk for obj in response.context['cl'].result_list], [self.requests[1].pk])
+
+    def test_estimated_count_is_bounded(self):
+        self.add_rows(5)
+        paginator = EstimatedCountPaginator(Request.objects.order_by('pk'), 2)
+        paginator.EXACT_LIMIT = 2
+        # EXACT_LIMIT + 1 건까지만 셈
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
+
+
+class SignupWritePathTestCase(APITestCase):
+    """가입 / 프로필 쓰기 경로 테스트"""
+
+    def setUp(self):
+        self.team = Team.objects.create(name='두산 베어스', stadium='잠실야구장')
+
+    def inserts(self, queries):
+        return [query['sql'].split('"')[1] for query in queries if query['sql'].startswith('INSERT')]
+
+    def test_signup_inserts_user_and_profile_once(self):
+        data = {
+            'name': '새유저', 'phone': '01087654321', 'role': 'helper',
+            'password': 'newpass123', 'nickname': '새도우미', 'favorite_team': self.team.pk,
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('signup'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.inserts(queries), ['matching_user', 'matching_profile'])
+        self.assertFalse(any(query['sql'].startswith('UPDATE') for query in queries))
+        user = User.objects.select_related('profile').get(phone='01087654321')
+        self.assertEqual((user.profile.nickname, user.profile.favorite_team_id), ('새도우미', self.team.pk))
+
+    def test_user_save_does_not_rewrite_profile(self):
+        user = User.objects.create_user(phone='01012345678', password='testpass123', name='김시니어', role='senior')
+        user = User.objects.select_related('profile').get(pk=user.pk)
+        with CaptureQueriesContext(connection) as queries:
+            user.mileagePoints = 100
+            user.save()
+        self.assertFalse(any('matching_profile' in query['sql'] for query in queries))
+
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(reverse('user_profile'), {'name': '김시니어', 'profile': {'nickname': '야구팬'}}, format='json')
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"nickname"', updates[0])
+        self.assertNotIn('"verification_info"', updates[0])
+
+    def test_import_users_command(self):
+        User.objects.create_user(phone='01000000001', password='x', name='기존', role='senior')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as f:
+            f.write('phone,name,role,password,nickname,favorite_team\n')
+            f.write('01000000001,중복,senior,,,\n')
+            f.write('01000000002,박도우미,helper,pass1234,박박,두산 베어스\n')
+            f.write('01000000003,최시니어,senior,,,\n')
+            f.write('01000000004,이상함,admin,,,\n')
+        self.addCleanup(os.unlink, f.name)
+
+        out, err = StringIO(), StringIO()
+        call_command('import_users', f.name, '--batch-size', '2', stdout=out, stderr=err)
+        self.assertIn('Created 2 users (2 rows skipped)', out.getvalue())
+        self.assertIn('line 2:', err.getvalue())
+        self.assertIn('line 5:', err.getvalue())
+        helper = User.objects.select_related('profile').get(phone='01000000002')
+        self.assertTrue(helper.check_password('pass1234'))
+        self.assertEqual((helper.profile.nickname, helper.profile.favorite_team_id), ('박박', self.team.pk))
+        self.assertFalse(User.objects.get(phone='01000000003').has_usable_password())
+
+
+@override_settings(LOGIN={'HASH_WORKERS': 2, 'HASH_QUEUE': 2, 'HASH_TIMEOUT': 5, 'RETRY_AFTER': 3, 'PBKDF2_ITERATIONS': 1000})
+class LoginPipelineTestCase(APITestCase):
+    """로그인 파이프라인 (전화번호 정규화 / 재해싱 / 과부하 / 토큰) 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(phone='010-1234-5678', password='testpass123', name='김시니어', role='senior')
+
+    def test_phone_is_normalized(self):
+        self.assertEqual(self.user.phone, '01012345678')
+        for phone in ('010-1234-5678', '+82 10 1234 5678', '01012345678'):
+            response = self.client.post(reverse('login'), {'phone': phone, 'password': 'testpass123'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK, phone)
+        response = self.client.post(reverse('signup'), {
+            'name': '중복', 'phone': '010 1234 5678', 'role': 'senior', 'password': 'testpass123',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_migration_normalizes_existing_phones(self):
+        """정규화 이전에 저장된 번호를 정리하고, 겹치는 번호는 그대로 둠"""
+        from django.apps import apps
+        migration = importlib.import_module('matching.migrations.0017_normalize_user_phones')
+        legacy = User.objects.create_user(phone='01055556666', password='testpass123', name='예전가입', role='senior')
+        clash = User.objects.create_user(phone='01099990000', password='testpass123', name='중복', role='senior')
+        User.objects.filter(pk=legacy.pk).update(phone='010-5555-6666')
+        User.objects.filter(pk=clash.pk).update(phone='+82 10 1234 5678')
+
+        with mock.patch('sys.stdout', new_callable=StringIO) as out:
+            collisions = migration.normalize_phones(apps, connection.schema_editor())
+        self.assertEqual(collisions, [(clash.pk, '+82 10 1234 5678', '01012345678')])
+        self.assertIn('+82 10 1234 5678', out.getvalue())
+        self.assertEqual(User.objects.get(pk=legacy.pk).phone, '01055556666')
+        self.assertEqual(User.objects.get(pk=clash.pk).phone, '+82 10 1234 5678')
+        response = self.client.post(reverse('login'), {'phone': '010-5555-6666', 'password': 'testpass123'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_rehash_on_login(self):
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+        with self.settings(LOGIN={'PBKDF2_ITERATIONS': 2000}):
+            response = self.client.post(reverse('login'), {'phone': '01012345678', 'password': 'testpass123'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+        self.assertTrue(self.user.check_password('testpass123'))
+
+    def test_full_pool_returns_503(self):
+        pool = login.HashingPool(workers=1, queue=0)
+        release = threading.Event()
+        pool.submit(release.wait)
+        self.addCleanup(release.set)
+        with mock.patch.object(login, '_pool', pool):
+            response = self.client.post(reverse('login'), {'phone': '01012345678', 'password': 'testpass123'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '3')
+
+    def test_tokens_carry_claims(self):
+        response = self.client.post(reverse('login'), {'phone': '01012345678', 'password': 'testpass123'}, format='json')
+        access = AccessToken(response.data['access'])
+        self.assertEqual((access['userId'], access['role'], access['name']), (self.user.pk, 'senior', '김시니어'))
+        self.assertEqual(response.cookies['refresh_token'].value, response.data['refresh'])
+
+
+@override_settings(LOGIN={'PBKDF2_ITERATIONS': 1000})
+class TokenRevocationTestCase(APITestCase):
+    """refresh 토큰 회전 / 폐기 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        revocation.store.reset()
+        self.user = User.objects.create_user(phone='01012345678', password='testpass123', name='김시니어', role='senior')
+        response = self.client.post(reverse('login'), {'phone': '01012345678', 'password': 'testpass123'}, format='json')
+        self.refresh = response.data['refresh']
+
+    def refresh_with(self, token):
+        self.client.cookies.clear()
+        return self.client.post(reverse('refresh_token'), {'refresh': token}, format='json')
+
+    def test_rotation_revokes_old_token(self):
+        response = self.refresh_with(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['refresh'], self.refresh)
+        self.assertEqual(AccessToken(response.data['access'])['userId'], self.user.pk)
+
+        # 이미 회전에 쓴 토큰은 거부, 새 토큰은 사용 가능
+        self.assertEqual(self.refresh_with(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh_with(response.data['refresh']).status_code, status.HTTP_200_OK)
+
+    def test_logout_and_other_process_revocations(self):
+        self.client.post(reverse('logout'), {'refresh': self.refresh}, format='json')
+        self.assertEqual(self.refresh_with(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # 다른 프로세스에서 폐기된 토큰은 동기화 후 Bloom filter 에 나타남
+        token = RefreshToken.for_user(self.user)
+        RevokedToken.objects.create(jti=token['jti'], expiresAt=timezone.now() + timedelta(days=1))
+        revocation.store.synced_at = 0
+        self.assertTrue(revocation.is_revoked(token['jti']))
+
+        # Bloom filter 에 없는 jti 는 DB 조회 없이 통과
+        with self.assertNumQueries(0):
+            self.assertFalse(revocation.is_revoked(RefreshToken.for_user(self.user)['jti']))
+
+    def test_bloom_filter(self):
+        bloom = revocation.BloomFilter(1 << 12, 5)
+        keys = [f'jti-{i}' for i in range(100)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f'other-{i}' in bloom for i in range(1000))
+        self.assertLess(false_positives, 20)
+
+    def test_purge_expired(self):
+        now = timezone.now()
+        RevokedToken.objects.bulk_create([
+            RevokedToken(jti=f'expired-{i}', expiresAt=now - timedelta(minutes=1)) for i in range(5)
+        ] + [RevokedToken(jti='live', expiresAt=now + timedelta(days=1))])
+        out = StringIO()
+        call_command('purge_revoked_tokens', '--batch-size', '2', stdout=out)
+        self.assertIn('Purged 5', out.getvalue())
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['live'])
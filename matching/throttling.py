@@ -0,0 +1,130 @@
+# matching/throttling.py
+import struct
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+from .models import User
+
+# 버킷 상태는 (남은 토큰, 마지막 갱신 시각) 두 개의 double 만 16바이트로 저장
+_BUCKET = struct.Struct('!dd')
+
+_DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    '30/min', '5/10m' 같은 문자열을 (용량, 초당 충전량) 으로 변환
+    - None 이면 제한 없음
+    """
+    if rate is None:
+        return None
+    num, period = rate.split('/')
+    multiplier = ''.join(ch for ch in period if ch.isdigit()) or '1'
+    unit = period.lstrip('0123456789')[0]
+    duration = int(multiplier) * _DURATIONS[unit]
+    capacity = int(num)
+    return capacity, capacity / duration
+
+
+def _throttle_settings():
+    return getattr(settings, 'TOKEN_BUCKET_THROTTLE', {})
+
+
+def _cache():
+    return caches[_throttle_settings().get('CACHE_ALIAS', 'default')]
+
+
+def consume(key, rate, now=None):
+    """
+    key 에 해당하는 토큰 버킷에서 토큰 1개를 소비
+    - 반환값: (허용 여부, 다음 토큰까지 남은 초)
+    - get/set 사이의 경합으로 소량 초과 허용될 수 있으나, 락 없이 캐시 왕복 2회로 끝남
+    """
+    capacity, refill = rate
+    now = time.time() if now is None else now
+    cache = _cache()
+
+    packed = cache.get(key)
+    if packed is None:
+        tokens = float(capacity)
+    else:
+        tokens, updated = _BUCKET.unpack(packed)
+        tokens = min(float(capacity), tokens + (now - updated) * refill)
+
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    # 버킷이 가득 찰 때까지만 유지하면 충분
+    timeout = int((capacity - tokens) / refill) + 1
+    cache.set(key, _BUCKET.pack(tokens, now), timeout)
+
+    wait = 0 if allowed else (1 - tokens) / refill
+    return allowed, wait
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    URL 이름 + 역할별 한도를 적용하는 토큰 버킷 Throttle
+    - 로그인 사용자는 user id, 익명 사용자는 IP 로 버킷을 나눔
+    - 한도는 settings.TOKEN_BUCKET_THROTTLE['RATES'][url_name][role] 에서 읽고,
+      없으면 '*' 항목을 사용
+    """
+    def get_role(self, request):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return 'anon'
+        if user.is_staff:
+            return 'staff'
+        return user.role
+
+    def get_rate(self, url_name, role):
+        rates = _throttle_settings().get('RATES', {})
+        for name in (url_name, '*'):
+            if name in rates and role in rates[name]:
+                return parse_rate(rates[name][role])
+        return None
+
+    def get_cache_key(self, request, view):
+        user = request.user
+        if user and user.is_authenticated:
+            ident = f'u{user.pk}'
+        else:
+            ident = f'ip{self.get_ident(request)}'
+        url_name = self.get_url_name(request)
+        return f'tb:{url_name}:{ident}'
+
+    def get_url_name(self, request):
+        match = getattr(request, 'resolver_match', None)
+        return match.url_name if match and match.url_name else '*'
+
+    def allow_request(self, request, view):
+        rate = self.get_rate(self.get_url_name(request), self.get_role(request))
+        if rate is None:
+            return True
+        allowed, self._wait = consume(self.get_cache_key(request, view), rate)
+        return allowed
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class LoginPhoneThrottle(BaseThrottle):
+    """
+    로그인 전용: 같은 전화번호에 대한 시도를 별도의 엄격한 버킷으로 제한
+    - IP 를 바꿔가며 특정 계정의 비밀번호를 대입하는 경우까지 막기 위함
+    """
+    def allow_request(self, request, view):
+        rate = parse_rate(_throttle_settings().get('LOGIN_PHONE_RATE'))
+        phone = request.data.get('phone') if hasattr(request, 'data') else None
+        # 형식만 바꿔 ('010-...', '+82 ...') 다른 버킷을 쓰지 못하도록 정규화
+        phone = User.objects.normalize_phone(phone) if isinstance(phone, str) else None
+        if rate is None or not phone:
+            return True
+        allowed, self._wait = consume(f'tb:login-phone:{phone}', rate)
+        return allowed
+
+    def wait(self):
+        return getattr(self, '_wait', None)
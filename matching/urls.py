@@ -1,21 +1,33 @@
 # matching/urls.py
 
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 
 urlpatterns = [
     # 인증 (Authentication)
     path('auth/signup/', views.SignupView.as_view(), name='signup'), # registration -> signup
     path('auth/login/', views.login_view, name='login'),
+    # dj_rest_auth 의 token/refresh/?, logout/? 보다 먼저 매칭되어 회전/폐기를 처리 (끝의 / 유무 모두)
+    re_path(r'^auth/token/refresh/?$', views.refresh_token_view, name='refresh_token'),
+    re_path(r'^auth/logout/?$', views.logout_view, name='logout'),
     path('auth/user/', views.UserProfileView.as_view(), name='user_profile'),
     
+    # 여러 GET 요청을 한 번에 (앱 시작 화면 등)
+    path('batch/', views.batch_view, name='batch'),
+
     # KBO 팀 및 경기 정보
     path('teams/', views.TeamListView.as_view(), name='kbo_team_list'),
     path('games/', views.GameListView.as_view(), name='game_list'),
+    path('games/calendar/', views.game_calendar, name='game_calendar'),
+    path('games/demand/', views.game_demand, name='game_demand'),
+    path('search/', views.search_view, name='search'),
+    path('games/<int:gameId>/price-stats/', views.game_price_stats, name='game_price_stats'),
     
     # 도움 요청 (시니어 -> 헬퍼)
     path('reservation-requests/', views.RequestCreateView.as_view(), name='request_create'),
     path('help-requests/', views.HelpRequestListView.as_view(), name='help_request_list'),
+    path('help-requests/recommended/', views.RecommendedHelpRequestView.as_view(), name='help_request_recommended'),
+    path('help-requests/delta/', views.HelpRequestDeltaView.as_view(), name='help_request_delta'),
     path('requests/<int:requestId>/', views.RequestDetailView.as_view(), name='request_detail'),
     path('requests/<int:requestId>/update/', views.RequestUpdateView.as_view(), name='request_update'),
     path('requests/<int:requestId>/delete/', views.RequestDeleteView.as_view(), name='request_delete'),
@@ -23,16 +35,30 @@ urlpatterns = [
     
     # 제안 (헬퍼 -> 시니어)
     path('requests/<int:request_id>/proposals/', views.ProposalListView.as_view(), name='proposal_list'),
+    path('requests/<int:request_id>/proposals/compare/', views.compare_proposals, name='proposal_compare'),
     path('requests/<int:request_id>/proposals/create/', views.ProposalCreateView.as_view(), name='proposal_create'),
     path('proposals/<int:proposalId>/', views.ProposalDetailView.as_view(), name='proposal_detail'),
     path('proposals/<int:proposal_id>/accept/', views.accept_proposal, name='accept_proposal'),
     path('proposals/<int:proposal_id>/reject/', views.reject_proposal, name='reject_proposal'),
+    path('proposals/<int:proposal_id>/suggestion/accept/', views.accept_suggestion, name='accept_suggestion'),
+    path('proposals/<int:proposal_id>/suggestion/decline/', views.decline_suggestion, name='decline_suggestion'),
+    path('proposals/bulk/accept/', views.bulk_accept_proposals, name='bulk_accept_proposals'),
+    path('proposals/bulk/reject/', views.bulk_reject_proposals, name='bulk_reject_proposals'),
+    path('requests/bulk/cancel/', views.bulk_cancel_requests, name='bulk_cancel_requests'),
     
     # 마이페이지
     path('senior/requests/', views.MyRequestsView.as_view(), name='senior_my_requests'),
+    path('senior/requests/delta/', views.MyRequestsDeltaView.as_view(), name='senior_my_requests_delta'),
     path('helper/activities/', views.MyProposalsView.as_view(), name='helper_my_activities'),
+    path('helper/activities/delta/', views.MyProposalsDeltaView.as_view(), name='helper_my_activities_delta'),
     path('helper/stats/', views.my_stats, name='helper_my_stats'),
     path('mypage/stats/', views.my_stats, name='my_stats'),
+    path('leaderboard/', views.helper_leaderboard, name='helper_leaderboard'),
+
+    # 운영용 내보내기 (staff)
+    path('export/<str:name>/', views.export_view, name='export'),
+    path('events/metrics/', views.status_event_metrics, name='status_event_metrics'),
+    path('analytics/funnel/', views.funnel_dashboard, name='funnel_dashboard'),
 
     # 시니어 티켓 확인 및 확정
     path('senior/requests/<int:requestId>/proposed-ticket/', views.get_proposed_ticket_details, name='get_proposed_ticket_details'),
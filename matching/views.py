@@ -1,24 +1,40 @@
 from rest_framework import generics, permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Q, F, Min, Max, Avg, Count
+from django.db import transaction
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import User, Request, Proposal, Team, Game
+from .models import (
+    User, Request, Proposal, Team, Game, Tombstone, ArchivedRequest, ArchivedProposal,
+    DailyFunnel, GameFunnel, RollupWatermark, GameDemand,
+)
 from .serializers import (
     RegisterSerializer, UserProfileSerializer,
     RequestSerializer, RequestCreateSerializer, ProposalSerializer,
     ProposalCreateSerializer, TeamSerializer, GameSerializer,
     MyPageRequestSerializer, MyPageProposalSerializer, HelpRequestSerializer,
-    ProposedTicketDetailsSerializer
+    ProposedTicketDetailsSerializer, ProposalComparisonSerializer,
+    ArchivedMyPageRequestSerializer, ArchivedMyPageProposalSerializer
 )
 from .permissions import (
     IsSeniorUser, IsHelperUser, IsOwnerOrReadOnly,
-    IsRequestOwnerOrHelper, IsProposalOwnerOrRequestOwner
+    IsRequestOwnerOrHelper, IsProposalOwnerOrRequestOwner,
+    is_request_owner, is_proposal_request_owner
 )
-from matching import serializers
+from .throttling import TokenBucketThrottle, LoginPhoneThrottle
+from .idempotency import idempotent
+from .jwt_utils import issue_tokens
+from .sync import DeltaSyncMixin, tombstones_since
+from .archive import ArchiveUnionListMixin
+from . import batch, exports, recommendations, comparison, bulk, expiry, outbox, events, funnel, leaderboard, demand, schedule, search, login, revocation
+from rest_framework import serializers
 
 class SignupView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -27,6 +43,7 @@ class SignupView(generics.CreateAPIView):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([TokenBucketThrottle, LoginPhoneThrottle])
 def login_view(request):
     try:
         phone = request.data.get('phone')
@@ -35,54 +52,89 @@ def login_view(request):
         if not phone or not password:
             return Response({'detail': '전화번호와 비밀번호를 모두 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        user = get_object_or_404(User, phone=phone)
+        # 정규화한 전화번호로 unique 인덱스 조회
+        user = get_object_or_404(User, phone=User.objects.normalize_phone(phone))
 
-        if not user.check_password(password):
+        try:
+            valid = login.verify_password(user, password)
+        except login.Overloaded as e:
+            return Response(
+                {'detail': '로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(e.retry_after)},
+            )
+        if not valid:
             return Response({'detail': '비밀번호가 올바르지 않습니다.'}, status=status.HTTP_401_UNAUTHORIZED)
 
-        refresh = RefreshToken.for_user(user)
-        access_token = refresh.access_token
-        access_token['role'] = user.role
-        access_token['userId'] = user.id
-        access_token['name'] = user.name
-        access_token['mileagePoints'] = user.mileagePoints
-
-        response = Response({
-            'access': str(access_token),
-            'refresh': str(refresh)  # JSON에도 refresh 토큰 포함
-        }, status=status.HTTP_200_OK)
-
-        response.set_cookie(
-            key='refresh_token',
-            value=str(refresh),
-            httponly=True,
-            secure=True,
-            samesite='None',
-            max_age=60 * 60 * 24 * 7
-        )
-
-        return response
+        refresh, access = issue_tokens(user)
+        return _token_response(refresh, access)
 
     except User.DoesNotExist:
         return Response({'detail': '존재하지 않는 사용자입니다.'}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
         return Response({'detail': f'서버 오류: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _token_response(refresh, access):
+    response = Response({
+        'access': access,
+        'refresh': refresh  # JSON에도 refresh 토큰 포함
+    }, status=status.HTTP_200_OK)
+
+    response.set_cookie(
+        key='refresh_token',
+        value=refresh,
+        httponly=True,
+        secure=True,
+        samesite='None',
+        max_age=60 * 60 * 24 * 7
+    )
+    return response
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def refresh_token_view(request):
+    """
+    refresh 토큰 회전 (쿠키 또는 body 의 refresh)
+    - 새 refresh/access 를 발급하고 이전 refresh 토큰은 폐기 (같은 토큰을 다시 쓰면 401)
+    """
+    refresh_token = request.COOKIES.get('refresh_token') or request.data.get('refresh')
+    if refresh_token is None:
+        return Response({'detail': 'refresh token unavailable'}, status=status.HTTP_401_UNAUTHORIZED)
     try:
-        refresh_token = request.COOKIES.get('refresh_token')
-        if refresh_token is None:
-            return Response({'detail': 'refresh token unavailable'}, status=status.HTTP_401_UNAUTHORIZED)
-
-        refresh = RefreshToken(refresh_token)
-        new_access = refresh.access_token
+        _, refresh, access = revocation.rotate(refresh_token)
+    except TokenError:
+        return Response({'detail': 'refresh token invalid'}, status=status.HTTP_401_UNAUTHORIZED)
+    return _token_response(refresh, access)
 
-        return Response({'access': str(new_access)}, status=status.HTTP_200_OK)
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def logout_view(request):
+    """refresh 토큰 폐기 + 쿠키 삭제 (토큰이 없거나 이미 잘못된 토큰이어도 200)"""
+    refresh_token = request.COOKIES.get('refresh_token') or request.data.get('refresh')
+    if refresh_token:
+        try:
+            revocation.revoke(RefreshToken(refresh_token))
+        except TokenError:
+            pass
+    response = Response({'detail': '로그아웃되었습니다.'}, status=status.HTTP_200_OK)
+    response.delete_cookie('refresh_token', samesite='None')
+    return response
 
-    except Exception:
-        return Response({'detail': 'refresh token invalid'}, status=status.HTTP_401_UNAUTHORIZED)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch_view(request):
+    """
+    여러 GET 요청을 한 번에 처리
+    - body: {"requests": ["/api/auth/user/", "/api/mypage/stats/", ...]}
+    """
+    urls = request.data.get('requests')
+    if not isinstance(urls, list) or not urls or not all(isinstance(url, str) for url in urls):
+        return Response({'detail': 'requests 는 경로 문자열 목록이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(urls) > batch.max_subrequests():
+        return Response({'detail': f'한 번에 최대 {batch.max_subrequests()}개까지 요청할 수 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    results = [batch.dispatch(request._request, request.user, request.auth, url) for url in urls]
+    return Response({'responses': results})
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserProfileSerializer
@@ -115,6 +167,112 @@ class GameListView(generics.ListAPIView):
 
         return queryset
 
+def _search_results(ranked):
+    """(kind, id, score) 목록을 응답 형태로 (kind 마다 in_bulk 1번, 그 사이 지워진 문서는 건너뜀)"""
+    ids = {}
+    for kind, object_id, _ in ranked:
+        ids.setdefault(kind, []).append(object_id)
+    models_by_kind = {kind: model for model, (kind, _) in search.INDEXED.items()}
+    objects = {kind: models_by_kind[kind].objects.in_bulk(pks) for kind, pks in ids.items()}
+    results = []
+    for kind, object_id, score in ranked:
+        obj = objects[kind].get(object_id)
+        if obj is None:
+            continue
+        if kind == search.KIND_TEAM:
+            fields = {'name': obj.name, 'homeStadium': obj.stadium, 'logoUrl': obj.logo}
+        elif kind == search.KIND_REQUEST:
+            fields = {'gameId': obj.game_id, 'status': obj.status, 'additionalInfo': obj.additionalInfo}
+        else:
+            fields = {'requestId': obj.requestId_id, 'helperId': obj.helperId_id, 'status': obj.status, 'message': obj.message}
+        results.append({'type': search.KIND_NAMES[kind], 'id': object_id, 'score': score, **fields})
+    return results
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def search_view(request):
+    """
+    검색 (?q=, ?type=team|request|proposal, ?limit= 최대 50)
+    - 팀(팀명/홈구장)은 누구나, 요청 메모/제안 메시지는 운영자만 검색 가능
+    """
+    kinds = {name: kind for kind, name in search.KIND_NAMES.items()}
+    allowed = set(kinds.values()) if request.user.is_staff else set(search.PUBLIC_KINDS)
+    requested = request.query_params.get('type')
+    if requested:
+        if kinds.get(requested) not in allowed:
+            return Response({'detail': '검색할 수 없는 type 입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        allowed = {kinds[requested]}
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), 50))
+    except ValueError:
+        limit = 20
+    ranked = search.search(request.query_params.get('q', ''), kinds=sorted(allowed), limit=limit)
+    return Response({'results': _search_results(ranked)})
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def game_calendar(request):
+    """
+    월간 경기 일정 (?month=YYYY-MM, 기본값 이번 달)
+    - 경기의 homeTeam/awayTeam 은 teams 의 키(팀 id)
+    - ?counts=1 이면 경기별 대기 요청 수(waitingRequests) 포함
+    """
+    month = request.query_params.get('month') or f'{timezone.localdate():%Y-%m}'
+    try:
+        data = schedule.month_calendar(month, with_counts=request.query_params.get('counts') in ('1', 'true'))
+    except ValueError:
+        return Response({'detail': 'month 는 YYYY-MM 형식이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(data)
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def game_demand(request):
+    """
+    오늘 이후 경기별 수요 히트맵 (GameDemand 카운터만 읽음, 팀 조인 포함 쿼리 1번)
+    - coverage: 제안을 받은 요청 / (대기 + 제안을 받은 요청), 요청이 없으면 None
+    """
+    rows = (
+        GameDemand.objects.filter(game__date__gte=timezone.localdate())
+        .order_by('game__date', 'game__time')
+        .values(
+            'game_id', 'game__date', 'game__time', 'game__stadium', 'game__status',
+            'game__homeTeam__name', 'game__awayTeam__name', *demand.COUNTERS,
+        )
+    )
+    data = []
+    for row in rows:
+        open_requests = row['waitingRequests'] + row['proposedRequests']
+        data.append({
+            'gameId': row['game_id'],
+            'date': row['game__date'],
+            'time': row['game__time'],
+            'stadium': row['game__stadium'],
+            'status': row['game__status'],
+            'homeTeam': row['game__homeTeam__name'],
+            'awayTeam': row['game__awayTeam__name'],
+            **{field: row[field] for field in demand.COUNTERS},
+            'coverage': round(row['proposedRequests'] / open_requests, 3) if open_requests else None,
+        })
+    return Response(data)
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def game_price_stats(request, gameId):
+    """
+    경기별 제안 가격 통계 (장당 가격 기준, 가격이 파싱된 제안만)
+    """
+    game = get_object_or_404(Game.objects.only('gameId'), gameId=gameId)
+    stats = Proposal.objects.filter(requestId__game=game, pricePerTicket__isnull=False).aggregate(
+        proposals=Count('pk'),
+        minPricePerTicket=Min('pricePerTicket'),
+        maxPricePerTicket=Max('pricePerTicket'),
+        avgPricePerTicket=Avg('pricePerTicket'),
+    )
+    if stats['avgPricePerTicket'] is not None:
+        stats['avgPricePerTicket'] = round(stats['avgPricePerTicket'])
+    return Response({'gameId': game.gameId, **stats})
+
+@method_decorator(idempotent, name='post')
 class RequestCreateView(generics.CreateAPIView):
     serializer_class = RequestCreateSerializer
     permission_classes = [IsSeniorUser]
@@ -126,7 +284,8 @@ class RequestCreateView(generics.CreateAPIView):
         try:
             team = get_object_or_404(Team, pk=data['teamId'])
             game_date = data['gameDate']
-            game = Game.objects.filter(Q(homeTeam=team) | Q(awayTeam=team), date=game_date).first()
+            # 취소/연기된 경기에는 요청을 만들지 않음 (같은 날 재편성 경기가 있으면 그 경기)
+            game = Game.objects.filter(Q(homeTeam=team) | Q(awayTeam=team), date=game_date, status='SCHEDULED').first()
             if not game:
                 return Response({"detail": "해당 날짜에 요청하신 팀의 경기가 없습니다."}, status=status.HTTP_404_NOT_FOUND)
             request_obj = Request.objects.create(
@@ -143,10 +302,62 @@ class HelpRequestListView(generics.ListAPIView):
     serializer_class = HelpRequestSerializer
     permission_classes = [IsHelperUser]
     def get_queryset(self):
-        return Request.objects.filter(status='WAITING_FOR_HELPER').order_by('-createdAt')
+        # 만료 명령이 돌기 전이라도 이미 시작한 경기는 피드에서 제외
+        queryset = expiry.attendable(Request.objects.filter(status='WAITING_FOR_HELPER'))
+        # ?minWaiting=N: 대기 요청이 N건 이상 몰린 경기만 (GameDemand 조인, 추가 쿼리 없음)
+        min_waiting = self.request.query_params.get('minWaiting')
+        if min_waiting and min_waiting.isdigit():
+            queryset = queryset.filter(game__demand__waitingRequests__gte=int(min_waiting))
+        if self.request.query_params.get('sort') == 'demand':
+            return queryset.order_by('-game__demand__waitingRequests', '-createdAt')
+        return queryset.order_by('-createdAt')
+
+class RecommendedHelpRequestView(generics.GenericAPIView):
+    """
+    헬퍼 맞춤 추천 요청 목록 (?limit=, 최대 50)
+    """
+    serializer_class = HelpRequestSerializer
+    permission_classes = [IsHelperUser]
+    def get(self, request):
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 50))
+        except ValueError:
+            limit = 20
+        ranked = recommendations.recommend(request.user, limit)
+        requests_by_id = Request.objects.select_related('userId', 'game__homeTeam').in_bulk([rid for rid, _ in ranked])
+        data = []
+        for request_id, score in ranked:
+            request_obj = requests_by_id.get(request_id)
+            # 스냅샷 갱신 직전에 매칭된 요청은 제외
+            if request_obj is None or request_obj.status != 'WAITING_FOR_HELPER':
+                continue
+            row = self.get_serializer(request_obj).data
+            row['score'] = score
+            data.append(row)
+        return Response(data)
+
+class HelpRequestDeltaView(DeltaSyncMixin, generics.GenericAPIView):
+    serializer_class = HelpRequestSerializer
+    permission_classes = [IsHelperUser]
+    def get_changed_queryset(self, since):
+        # 목록 뷰와 같이 이미 시작한 경기는 제외
+        queryset = expiry.attendable(Request.objects.filter(status='WAITING_FOR_HELPER'))
+        if since is not None:
+            queryset = queryset.filter(updatedAt__gt=since)
+        return queryset.order_by('-createdAt')
+    def get_removed_ids(self, since, limit):
+        # 매칭/취소 등으로 피드에서 빠진 요청 (since 이후 생성된 요청은 클라이언트가 받은 적 없으므로 제외)
+        left = Request.objects.filter(updatedAt__gt=since, createdAt__lte=since).exclude(status='WAITING_FOR_HELPER')
+        # 만료 명령 전이라도 since 이후 경기가 시작해 피드에서 빠진 요청
+        started = Request.objects.filter(expiry.started_games_q(), status='WAITING_FOR_HELPER').exclude(
+            expiry.started_games_q(since)
+        )
+        removed = list(left.values_list('requestId', flat=True)[:limit])
+        removed += started.values_list('requestId', flat=True)[:limit]
+        return removed + tombstones_since('request', since, limit=limit)
 
 class RequestDetailView(generics.RetrieveAPIView):
-    queryset = Request.objects.all()
+    queryset = Request.objects.select_related('userId', 'game__homeTeam', 'game__awayTeam')
     serializer_class = RequestSerializer
     permission_classes = [IsAuthenticated, IsRequestOwnerOrHelper]
     lookup_field = 'requestId'
@@ -162,86 +373,276 @@ class RequestDeleteView(generics.DestroyAPIView):
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     lookup_field = 'requestId'
 
+    def perform_destroy(self, instance):
+        # 델타 동기화용 tombstone 을 삭제와 같은 트랜잭션에서 기록 (CASCADE 로 지워지는 제안 포함)
+        with transaction.atomic():
+            tombstones = [Tombstone(kind='request', objectId=instance.requestId, ownerId=instance.userId_id)]
+            tombstones += [
+                Tombstone(kind='proposal', objectId=proposal_id, ownerId=helper_id)
+                for proposal_id, helper_id in instance.proposals.values_list('proposalId', 'helperId')
+            ]
+            Tombstone.objects.bulk_create(tombstones)
+            instance.delete()
+
 class ProposalListView(generics.ListAPIView):
+    """
+    요청에 들어온 제안 목록
+    - ?ordering=price|-price|price_per_ticket|-price_per_ticket|createdAt|-createdAt (기본 -createdAt)
+    - ?min_price=&max_price= (총 가격, 원)
+    """
     serializer_class = ProposalSerializer
     permission_classes = [IsAuthenticated]
+    ORDERINGS = {
+        'price': ('priceKrw', 'proposalId'),
+        '-price': ('-priceKrw', '-proposalId'),
+        'price_per_ticket': ('pricePerTicket', 'proposalId'),
+        '-price_per_ticket': ('-pricePerTicket', '-proposalId'),
+        'createdAt': ('createdAt',),
+        '-createdAt': ('-createdAt',),
+    }
     def get_queryset(self):
-        request_obj = get_object_or_404(Request, requestId=self.kwargs['request_id'])
-        if request_obj.userId != self.request.user:
+        request_obj = get_object_or_404(Request.objects.only('requestId', 'userId'), requestId=self.kwargs['request_id'])
+        if not is_request_owner(self.request.user, request_obj):
             return Proposal.objects.none()
-        return Proposal.objects.filter(requestId=request_obj).order_by('-createdAt')
+        queryset = Proposal.objects.filter(requestId=request_obj)
+        params = self.request.query_params
+        try:
+            if params.get('min_price'):
+                queryset = queryset.filter(priceKrw__gte=int(params['min_price']))
+            if params.get('max_price'):
+                queryset = queryset.filter(priceKrw__lte=int(params['max_price']))
+        except ValueError:
+            raise serializers.ValidationError({'detail': 'min_price/max_price 는 정수여야 합니다.'})
+        ordering = self.ORDERINGS.get(params.get('ordering'), self.ORDERINGS['-createdAt'])
+        return queryset.order_by(*ordering)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def compare_proposals(request, request_id):
+    """
+    요청의 대기 중인 제안을 순위와 함께 비교용으로 반환 (요청 소유자만)
+    """
+    request_obj = get_object_or_404(Request.objects.only('requestId', 'userId'), requestId=request_id)
+    if not is_request_owner(request.user, request_obj):
+        return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+    rows = comparison.rank(comparison.pending_proposal_rows(request_obj.requestId))
+    return Response(ProposalComparisonSerializer(rows, many=True).data)
+
+@method_decorator(idempotent, name='post')
 class ProposalCreateView(generics.CreateAPIView):
     serializer_class = ProposalCreateSerializer
     permission_classes = [IsHelperUser]
     def perform_create(self, serializer):
         request_obj = get_object_or_404(Request, requestId=self.kwargs['request_id'])
-        if Proposal.objects.filter(requestId=request_obj, helperId=self.request.user).exists():
+        existing = (
+            Proposal.objects.filter(requestId=request_obj, helperId=self.request.user)
+            .exclude(status='cancelled').first()
+        )
+        if existing is not None and existing.status != 'suggested':
             raise serializers.ValidationError("이미 제안하신 요청입니다.")
-        serializer.save(requestId=request_obj, helperId=self.request.user)
+        # 자동 매칭으로 추천받은 요청이면 추천 행을 그대로 이 헬퍼의 제안으로 바꿈
+        serializer.instance = existing
+        _submit_proposal(serializer, request_obj, self.request.user)
+
+def _submit_proposal(serializer, request_obj, helper):
+    with transaction.atomic():
+        serializer.save(requestId=request_obj, helperId=helper, status='pending')
         request_obj.status = 'TICKET_PROPOSED'
         request_obj.save()
 
+def _own_suggestion(request, proposal_id):
+    return get_object_or_404(
+        Proposal.objects.select_related('requestId'),
+        proposalId=proposal_id, helperId=request.user, status='suggested',
+    )
+
+@api_view(['POST'])
+@permission_classes([IsHelperUser])
+@idempotent
+def accept_suggestion(request, proposal_id):
+    """
+    자동 매칭 추천 수락 (추천받은 헬퍼만)
+    - body 는 제안 생성과 같음 (seatType, totalPrice, message)
+    - 추천이 대기 중인 제안(pending)으로 바뀌어 시니어의 제안 목록/비교에 나타남
+    """
+    suggestion = _own_suggestion(request, proposal_id)
+    if suggestion.requestId.status not in ('WAITING_FOR_HELPER', 'TICKET_PROPOSED'):
+        return Response({'detail': '이미 처리된 요청입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    serializer = ProposalCreateSerializer(suggestion, data=request.data)
+    serializer.is_valid(raise_exception=True)
+    _submit_proposal(serializer, suggestion.requestId, request.user)
+    return Response(ProposalSerializer(serializer.instance).data)
+
+@api_view(['POST'])
+@permission_classes([IsHelperUser])
+@idempotent
+def decline_suggestion(request, proposal_id):
+    """자동 매칭 추천 거절 (다음 자동 매칭에서 같은 헬퍼에게 다시 추천하지 않음)"""
+    suggestion = _own_suggestion(request, proposal_id)
+    suggestion.status = 'cancelled'
+    suggestion.save(update_fields=['status', 'updatedAt'])
+    return Response({'message': '추천을 거절했습니다.'})
+
 class ProposalDetailView(generics.RetrieveAPIView):
-    queryset = Proposal.objects.all()
+    # IsProposalOwnerOrRequestOwner 가 requestId.userId_id 를 보므로 같은 쿼리에서 함께 로드
+    queryset = Proposal.objects.select_related(
+        'helperId', 'requestId__userId', 'requestId__game__homeTeam', 'requestId__game__awayTeam'
+    )
     serializer_class = ProposalSerializer
     permission_classes = [IsAuthenticated, IsProposalOwnerOrRequestOwner]
     lookup_field = 'proposalId'
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def accept_proposal(request, proposal_id):
-    proposal = get_object_or_404(Proposal, proposalId=proposal_id)
-    if proposal.requestId.userId != request.user:
+    proposal = get_object_or_404(Proposal.objects.select_related('requestId'), proposalId=proposal_id)
+    if not is_proposal_request_owner(request.user, proposal):
         return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
     if proposal.requestId.status != 'TICKET_PROPOSED':
         return Response({'detail': '이미 처리된 요청입니다.'}, status=status.HTTP_400_BAD_REQUEST)
-    proposal.status = 'accepted'
-    proposal.save()
-    proposal.requestId.status = 'HELPER_MATCHED' 
-    proposal.requestId.save()
-    Proposal.objects.filter(requestId=proposal.requestId).exclude(proposalId=proposal.proposalId).update(status='rejected')
+    with transaction.atomic():
+        proposal.status = 'accepted'
+        proposal.save()
+        proposal.requestId.status = 'HELPER_MATCHED' 
+        proposal.requestId.save()
+        events.transition(
+            Proposal.objects.filter(requestId=proposal.requestId, status__in=bulk.OPEN_PROPOSAL_STATUSES)
+            .exclude(proposalId=proposal.proposalId),
+            'rejected', updatedAt=timezone.now(),
+        )
+        # 헬퍼 알림 등은 아웃박스 워커가 처리
+        outbox.publish('proposal.accepted', proposal.helperId_id,
+                       requestId=proposal.requestId_id, proposalId=proposal.proposalId, helperId=proposal.helperId_id)
     return Response({'message': '제안이 수락되었습니다.'})
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def reject_proposal(request, proposal_id):
-    proposal = get_object_or_404(Proposal, proposalId=proposal_id)
-    if proposal.requestId.userId != request.user:
+    proposal = get_object_or_404(Proposal.objects.select_related('requestId'), proposalId=proposal_id)
+    if not is_proposal_request_owner(request.user, proposal):
         return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
     proposal.status = 'rejected'
     proposal.save()
     return Response({'message': '제안이 거절되었습니다.'})
 
+def _bulk_ids(data, key):
+    """일괄 처리용 id 목록 검증 (정수 목록, 최대 bulk.max_ids() 개)"""
+    ids = data.get(key)
+    if not isinstance(ids, list) or not ids or not all(isinstance(pk, int) for pk in ids):
+        raise serializers.ValidationError({key: '정수 id 목록이어야 합니다.'})
+    if len(ids) > bulk.max_ids():
+        raise serializers.ValidationError({key: f'한 번에 최대 {bulk.max_ids()}개까지 처리할 수 있습니다.'})
+    return list(dict.fromkeys(ids))
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@idempotent
+def bulk_reject_proposals(request):
+    """
+    제안 일괄 거절
+    - body: {"proposalIds": [1, 2, ...]}
+    """
+    results = bulk.reject_proposals(request.user, _bulk_ids(request.data, 'proposalIds'))
+    return Response({'results': results})
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@idempotent
+def bulk_accept_proposals(request):
+    """
+    제안 일괄 수락 (요청마다 하나씩)
+    - body: {"proposalIds": [1, 2, ...]}
+    """
+    results = bulk.accept_proposals(request.user, _bulk_ids(request.data, 'proposalIds'))
+    return Response({'results': results})
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
+def bulk_cancel_requests(request):
+    """
+    요청 일괄 취소
+    - body: {"requestIds": [1, 2, ...]} 또는 {"gameId": 3} (해당 경기의 내 요청 전부)
+    - staff 는 {"gameId": 3, "userId": 7} 로 다른 사용자의 요청도 취소 가능
+    """
+    if 'gameId' in request.data:
+        game_id = request.data.get('gameId')
+        owner_id = request.data.get('userId')
+        if not isinstance(game_id, int) or (owner_id is not None and not isinstance(owner_id, int)):
+            raise serializers.ValidationError({'gameId': 'gameId/userId 는 정수여야 합니다.'})
+        results = bulk.cancel_requests(request.user, game_id=game_id, owner_id=owner_id)
+    else:
+        results = bulk.cancel_requests(request.user, request_ids=_bulk_ids(request.data, 'requestIds'))
+    return Response({'results': results})
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@idempotent
 def complete_request(request, request_id):
     request_obj = get_object_or_404(Request, requestId=request_id)
-    if request_obj.userId != request.user:
+    if not is_request_owner(request.user, request_obj):
         return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
     if request_obj.status != 'SEAT_CONFIRMED':
         return Response({'detail': '좌석이 확정된 요청만 완료 처리할 수 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
-    request_obj.status = 'COMPLETED'
-    request_obj.save()
-    accepted_proposal = request_obj.proposals.filter(status='accepted').first()
-    if accepted_proposal:
-        accepted_proposal.helperId.mileagePoints += 20
-        accepted_proposal.helperId.save()
-    request_obj.userId.mileagePoints += 10
-    request_obj.userId.save()
+    with transaction.atomic():
+        request_obj.status = 'COMPLETED'
+        request_obj.save()
+        # 사용자 행을 읽지 않고 F() 로 적립
+        helper_id = request_obj.proposals.filter(status='accepted').values_list('helperId', flat=True).first()
+        if helper_id:
+            User.objects.filter(pk=helper_id).update(mileagePoints=F('mileagePoints') + 20)
+            outbox.publish('request.completed', helper_id, requestId=request_obj.requestId, helperId=helper_id)
+        User.objects.filter(pk=request_obj.userId_id).update(mileagePoints=F('mileagePoints') + 10)
+    if helper_id:
+        leaderboard.invalidate()
     return Response({'message': '요청이 완료되었습니다.'})
 
-class MyRequestsView(generics.ListAPIView):
+class MyRequestsView(ArchiveUnionListMixin, generics.ListAPIView):
     serializer_class = MyPageRequestSerializer
+    archived_serializer_class = ArchivedMyPageRequestSerializer
     permission_classes = [IsSeniorUser]
     def get_queryset(self):
-        return Request.objects.filter(userId=self.request.user).order_by('-createdAt')
+        return Request.objects.filter(userId=self.request.user).select_related('game__homeTeam').order_by('-createdAt')
+    def get_archived_queryset(self):
+        return ArchivedRequest.objects.filter(userId=self.request.user).select_related('game__homeTeam')
 
-class MyProposalsView(generics.ListAPIView):
+class MyRequestsDeltaView(DeltaSyncMixin, generics.GenericAPIView):
+    serializer_class = MyPageRequestSerializer
+    permission_classes = [IsSeniorUser]
+    def get_changed_queryset(self, since):
+        queryset = Request.objects.filter(userId=self.request.user)
+        if since is not None:
+            queryset = queryset.filter(updatedAt__gt=since)
+        return queryset.order_by('-createdAt')
+    def get_removed_ids(self, since, limit):
+        return tombstones_since('request', since, owner_id=self.request.user.pk, limit=limit)
+
+class MyProposalsView(ArchiveUnionListMixin, generics.ListAPIView):
     serializer_class = MyPageProposalSerializer
+    archived_serializer_class = ArchivedMyPageProposalSerializer
     permission_classes = [IsHelperUser]
     def get_queryset(self):
-        return Proposal.objects.filter(helperId=self.request.user).order_by('-createdAt')
+        return Proposal.objects.filter(helperId=self.request.user).select_related(
+            'requestId__userId', 'requestId__game__homeTeam', 'requestId__game__awayTeam'
+        ).order_by('-createdAt')
+    def get_archived_queryset(self):
+        return ArchivedProposal.objects.filter(helperId=self.request.user).select_related(
+            'requestId__userId', 'requestId__game__homeTeam', 'requestId__game__awayTeam'
+        )
+
+class MyProposalsDeltaView(DeltaSyncMixin, generics.GenericAPIView):
+    serializer_class = MyPageProposalSerializer
+    permission_classes = [IsHelperUser]
+    def get_changed_queryset(self, since):
+        queryset = Proposal.objects.filter(helperId=self.request.user)
+        if since is not None:
+            # 제안 응답에 요청 정보가 포함되므로 요청 쪽 변경도 함께 반영
+            queryset = queryset.filter(Q(updatedAt__gt=since) | Q(requestId__updatedAt__gt=since))
+        return queryset.order_by('-createdAt')
+    def get_removed_ids(self, since, limit):
+        return tombstones_since('proposal', since, owner_id=self.request.user.pk, limit=limit)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -249,39 +650,147 @@ def my_stats(request):
     user = request.user
     if user.role == 'senior':
         stats = {
-            'totalRequests': Request.objects.filter(userId=user).count(),
-            'completedRequests': Request.objects.filter(userId=user, status='COMPLETED').count(),
+            'totalRequests': Request.objects.filter(userId=user).count() + ArchivedRequest.objects.filter(userId=user).count(),
+            'completedRequests': (
+                Request.objects.filter(userId=user, status='COMPLETED').count()
+                + ArchivedRequest.objects.filter(userId=user, status='COMPLETED').count()
+            ),
         }
     else:
         stats = {
-            'totalSessionsCompleted': Proposal.objects.filter(helperId=user, status='accepted', requestId__status='COMPLETED').count(),
+            'totalSessionsCompleted': (
+                Proposal.objects.filter(helperId=user, status='accepted', requestId__status='COMPLETED').count()
+                + ArchivedProposal.objects.filter(helperId=user, status='accepted', requestId__status='COMPLETED').count()
+            ),
             'mileagePoints': user.mileagePoints
         }
     return Response(stats)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def helper_leaderboard(request):
+    """
+    헬퍼 리더보드 (마일리지 순, ?limit= 최대 LEADERBOARD['CACHED_TOP_N'])
+    - 헬퍼가 조회하면 본인 순위(me)도 함께 반환
+    """
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), leaderboard.cached_top_n()))
+    except ValueError:
+        limit = 20
+    data = {'top': leaderboard.top(limit)}
+    user = request.user
+    if user.role == 'helper':
+        data['me'] = {
+            'rank': leaderboard.rank_of(user),
+            'mileagePoints': user.mileagePoints,
+            'completedSessions': leaderboard.completed_sessions([user.pk]).get(user.pk, 0),
+        }
+    return Response(data)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_proposed_ticket_details(request, requestId):
-    request_obj = get_object_or_404(Request, requestId=requestId)
-    if request_obj.userId != request.user:
+    request_obj = get_object_or_404(Request.objects.select_related('userId', 'game__homeTeam'), requestId=requestId)
+    if not is_request_owner(request.user, request_obj):
         return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
     serializer = ProposedTicketDetailsSerializer(request_obj)
     return Response(serializer.data)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def confirm_proposed_ticket(request, requestId):
     request_obj = get_object_or_404(Request, requestId=requestId)
-    if request_obj.userId != request.user:
+    if not is_request_owner(request.user, request_obj):
         return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
     if request_obj.status != 'TICKET_PROPOSED':
          return Response({'detail': f'좌석을 확정할 수 있는 상태가 아닙니다. 현재 상태: {request_obj.status}'}, status=status.HTTP_400_BAD_REQUEST)
-    request_obj.status = 'SEAT_CONFIRMED'
-    request_obj.save()
-    
-    proposal_to_accept = request_obj.proposals.order_by('-createdAt').first()
-    if proposal_to_accept:
-        proposal_to_accept.status = 'accepted'
-        proposal_to_accept.save()
+    with transaction.atomic():
+        request_obj.status = 'SEAT_CONFIRMED'
+        request_obj.save()
+        
+        proposal_to_accept = request_obj.proposals.order_by('-createdAt').first()
+        if proposal_to_accept:
+            proposal_to_accept.status = 'accepted'
+            proposal_to_accept.save()
+            outbox.publish('request.seat_confirmed', proposal_to_accept.helperId_id,
+                           requestId=request_obj.requestId, proposalId=proposal_to_accept.proposalId,
+                           helperId=proposal_to_accept.helperId_id)
 
     return Response({'message': '좌석이 확정되었습니다.'}, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def status_event_metrics(request):
+    """
+    운영용: 요청 생성 후 첫 제안 / 매칭까지 걸린 시간 통계 (초)
+    - ?from=YYYY-MM-DD&to=YYYY-MM-DD (요청 생성일 기준)
+    - 원본 이력은 export/status-events/?output=ndjson 으로 내려받기
+    """
+    try:
+        date_from, date_to = exports.date_range(request.query_params)
+    except ValueError:
+        return Response({'detail': 'from/to 는 YYYY-MM-DD 형식이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    summary = events.timing_summary(date_from, date_to)
+    summary['statusCodes'] = {'request': events.STATUS_CODES[events.KIND_REQUEST], 'proposal': events.STATUS_CODES[events.KIND_PROPOSAL]}
+    return Response(summary)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def funnel_dashboard(request):
+    """
+    운영용 퍼널 집계 (update_funnel_rollups 가 갱신한 집계 테이블만 읽음)
+    - ?by=day|game&from=YYYY-MM-DD&to=YYYY-MM-DD (game 이면 경기일 기준)
+    """
+    by = request.query_params.get('by', 'day')
+    if by not in ('day', 'game'):
+        return Response({'detail': 'by 는 day 또는 game 이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        date_from, date_to = exports.date_range(request.query_params)
+    except ValueError:
+        return Response({'detail': 'from/to 는 YYYY-MM-DD 형식이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    counters = list(funnel.COUNTERS) + ['medianTimeToMatch']
+    if by == 'day':
+        queryset = DailyFunnel.objects.order_by('day')
+        date_field, columns = 'day', ['day'] + counters
+    else:
+        queryset = GameFunnel.objects.order_by('game__date', 'game_id')
+        date_field = 'game__date'
+        columns = ['game_id', 'game__date', 'game__homeTeam__name', 'game__awayTeam__name'] + counters
+    if date_from:
+        queryset = queryset.filter(**{f'{date_field}__gte': date_from})
+    if date_to:
+        queryset = queryset.filter(**{f'{date_field}__lte': date_to})
+    watermark = RollupWatermark.objects.filter(name=funnel.WATERMARK).first()
+    return Response({
+        'rows': list(queryset.values(*columns)),
+        'updatedAt': watermark.updatedAt if watermark else None,
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_view(request, name):
+    """
+    운영용 데이터 내보내기 (스트리밍)
+    - ?output=csv|ndjson&from=YYYY-MM-DD&to=YYYY-MM-DD&status=...&gzip=1
+    """
+    fmt = request.query_params.get('output', 'csv')
+    if name not in exports.EXPORTS or fmt not in exports.FORMATS:
+        return Response({'detail': '지원하지 않는 내보내기 형식입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    compress = request.query_params.get('gzip') in ('1', 'true')
+    try:
+        date_from, date_to = exports.date_range(request.query_params)
+    except ValueError:
+        return Response({'detail': 'from/to 는 YYYY-MM-DD 형식이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    body = exports.stream(
+        name, fmt, compress,
+        date_from=date_from,
+        date_to=date_to,
+        status=request.query_params.get('status'),
+    )
+    content_type = 'text/csv; charset=utf-8' if fmt == 'csv' else 'application/x-ndjson'
+    filename = f'{name}.{fmt}' + ('.gz' if compress else '')
+    response = StreamingHttpResponse(body, content_type='application/gzip' if compress else content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response